@@ -0,0 +1,213 @@
+"""enum symbols as smallint
+
+Revision ID: 2c6a9e1f4b87
+Revises: 3f1c9a2e7b10
+Create Date: 2026-10-19 09:47:05.318842
+
+Stores g_nodes.base_class, g_nodes.status and connectivity_edges.status
+as their Sema symbols (smallint) instead of native enum types, and
+indexes g_nodes on base_class, g_node_class and status. g_node_class
+stays text: GNodeClass is free-form in Sema (Logical GNodes name their
+own classes, e.g. "AtnCloud").
+
+On Postgres this runs online, as in 8b2d4e6f0a31: shadow columns kept in
+sync by triggers, a batched backfill, the indexes built CONCURRENTLY and
+NOT NULL proven by validated CHECKs, then a short swap. Other dialects
+(a local SQLite) are converted in place.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6a9e1f4b87'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a2e7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+# Symbols as of base.g.node.class/000 and g.node.status/000 (frozen here
+# on purpose)
+BASE_G_NODE_CLASS_SYMBOLS = {
+    'TerminalAsset': 0,
+    'LeafTransactiveNode': 1,
+    'ConnectivityNode': 2,
+    'MarketMaker': 3,
+    'Logical': 4,
+}
+STATUS_SYMBOLS = {
+    'Pending': 0,
+    'Active': 1,
+    'Suspended': 2,
+    'PermanentlyDeactivated': 3,
+}
+
+# table -> (column, enum type, symbols)
+ENUM_COLUMNS = {
+    'g_nodes': (
+        ('base_class', 'base_g_node_class', BASE_G_NODE_CLASS_SYMBOLS),
+        ('status', 'g_node_status', STATUS_SYMBOLS),
+    ),
+    'connectivity_edges': (
+        ('status', 'connectivity_edge_status', STATUS_SYMBOLS),
+    ),
+}
+
+# (name, column) on g_nodes; converted columns are indexed by their
+# shadow column until the swap
+INDEXES = (
+    ('ix_g_nodes_base_class', 'base_class'),
+    ('ix_g_nodes_g_node_class', 'g_node_class'),
+    ('ix_g_nodes_status', 'status'),
+)
+CONVERTED = {col for col, _type, _symbols in ENUM_COLUMNS['g_nodes']}
+
+
+def _to_code(col: str, symbols: dict[str, int]) -> str:
+    whens = ' '.join(f"WHEN '{name}' THEN {code}" for name, code in symbols.items())
+    return f'CASE {col} {whens} END'
+
+
+def _to_name(col: str, symbols: dict[str, int]) -> str:
+    whens = ' '.join(f"WHEN {code} THEN '{name}'" for name, code in symbols.items())
+    return f'CASE {col} {whens} END'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, columns in ENUM_COLUMNS.items():
+        for col, _type, symbols in columns:
+            names = ', '.join(f"'{name}'" for name in symbols)
+            _refuse_unmapped(table, col, f'{col} NOT IN ({names})')
+
+    if op.get_bind().dialect.name != 'postgresql':
+        _convert_in_place()
+        return
+
+    # 1. Shadow columns + sync triggers
+    for table, columns in ENUM_COLUMNS.items():
+        for col, _type, _symbols in columns:
+            op.add_column(table, sa.Column(f'{col}_code', sa.SmallInteger(), nullable=True))
+        assignments = ' '.join(
+            f'NEW.{col}_code := {_to_code(f"NEW.{col}::text", symbols)};'
+            for col, _type, symbols in columns
+        )
+        op.execute(
+            f"""
+            CREATE FUNCTION gnr_{table}_symbol_sync() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN {assignments} RETURN NEW; END $$
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER gnr_{table}_symbol_sync
+            BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION gnr_{table}_symbol_sync()
+            """
+        )
+
+    with op.get_context().autocommit_block():
+        # 2. Backfill in batches; each UPDATE commits on its own
+        for table, columns in ENUM_COLUMNS.items():
+            _backfill(table, columns)
+
+        # 3. Indexes and NOT NULL proofs
+        for name, col in INDEXES:
+            target = f'{col}_code' if col in CONVERTED else col
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON g_nodes ({target})'
+            )
+        for table, columns in ENUM_COLUMNS.items():
+            for col, _type, _symbols in columns:
+                op.execute(
+                    f'ALTER TABLE {table} ADD CONSTRAINT {table}_{col}_code_nn '
+                    f'CHECK ({col}_code IS NOT NULL) NOT VALID'
+                )
+                op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{col}_code_nn')
+
+    # 4. Swap, then drop the enum types
+    for table, columns in ENUM_COLUMNS.items():
+        op.execute(f'DROP TRIGGER gnr_{table}_symbol_sync ON {table}')
+        op.execute(f'DROP FUNCTION gnr_{table}_symbol_sync()')
+        for col, enum_type, _symbols in columns:
+            op.drop_column(table, col)
+            op.alter_column(table, f'{col}_code', new_column_name=col)
+            # Instant: the validated CHECK already proves it
+            op.alter_column(table, col, nullable=False)
+            op.drop_constraint(f'{table}_{col}_code_nn', table, type_='check')
+            op.execute(f'DROP TYPE {enum_type}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in ENUM_COLUMNS.items():
+        for col, _type, symbols in columns:
+            codes = ', '.join(str(code) for code in symbols.values())
+            _refuse_unmapped(table, col, f'{col} NOT IN ({codes})')
+    for name, _col in INDEXES:
+        op.drop_index(name, table_name='g_nodes')
+
+    if op.get_bind().dialect.name != 'postgresql':
+        _convert_in_place(to_code=False)
+        return
+
+    # Offline: rewrites each table under an ACCESS EXCLUSIVE lock
+    bind = op.get_bind()
+    for table, columns in ENUM_COLUMNS.items():
+        for col, enum_type, symbols in columns:
+            sa.Enum(*symbols, name=enum_type).create(bind, checkfirst=True)
+            op.execute(
+                f'ALTER TABLE {table} ALTER COLUMN {col} TYPE {enum_type} '
+                f'USING ({_to_name(col, symbols)})::{enum_type}'
+            )
+
+
+def _backfill(table: str, columns: Sequence[tuple[str, str, dict[str, int]]]) -> None:
+    assignments = ', '.join(
+        f'{col}_code = {_to_code(f"{col}::text", symbols)}'
+        for col, _type, symbols in columns
+    )
+    stmt = sa.text(
+        f"""
+        UPDATE {table} SET {assignments}
+        WHERE id IN (
+            SELECT id FROM {table} WHERE {columns[0][0]}_code IS NULL
+            LIMIT :batch_size
+        )
+        """
+    )
+    bind = op.get_bind()
+    while bind.execute(stmt, {'batch_size': BACKFILL_BATCH_SIZE}).rowcount:
+        pass
+
+
+def _convert_in_place(to_code: bool = True) -> None:
+    # SQLite keeps non-numeric text in an integer column (and numbers in a
+    # varchar one), so the values survive the batch copy either way
+    for table, columns in ENUM_COLUMNS.items():
+        for col, _type, symbols in columns:
+            convert = _to_code if to_code else _to_name
+            op.execute(f'UPDATE {table} SET {col} = {convert(col, symbols)}')
+        with op.batch_alter_table(table) as batch:
+            for col, enum_type, symbols in columns:
+                batch.alter_column(
+                    col,
+                    type_=sa.SmallInteger() if to_code else sa.Enum(*symbols, name=enum_type),
+                    existing_nullable=False,
+                )
+    if to_code:
+        for name, col in INDEXES:
+            op.create_index(name, 'g_nodes', [col])
+
+
+def _refuse_unmapped(table: str, col: str, condition: str) -> None:
+    """Fail before touching anything rather than write NULLs."""
+    rows = op.get_bind().execute(
+        sa.text(f'SELECT DISTINCT {col} FROM {table} WHERE {condition} LIMIT 10')
+    ).scalars().all()
+    if rows:
+        raise RuntimeError(f'{table}.{col} has values without a symbol: {rows}')
@@ -0,0 +1,108 @@
+"""initial schema
+
+Revision ID: 3f1c9a2e7b10
+Revises: 
+Create Date: 2026-10-19 09:12:41.220315
+
+The schema as the models first declared it: base_class and status as
+native enum types holding the member names, g_node_class as text.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2e7b10'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum types as first declared (frozen here on purpose)
+BASE_G_NODE_CLASS = sa.Enum(
+    'TerminalAsset', 'LeafTransactiveNode', 'ConnectivityNode', 'MarketMaker',
+    'Logical',
+    name='base_g_node_class',
+)
+STATUSES = ('Pending', 'Active', 'Suspended', 'PermanentlyDeactivated')
+G_NODE_STATUS = sa.Enum(*STATUSES, name='g_node_status')
+CONNECTIVITY_EDGE_STATUS = sa.Enum(*STATUSES, name='connectivity_edge_status')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'position_points',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('latitude_micro_deg', sa.Integer(), nullable=False),
+        sa.Column('longitude_micro_deg', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id', name='position_points_pkey'),
+    )
+    op.create_table(
+        'g_nodes',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('alias', sa.String(), nullable=False),
+        sa.Column('prev_alias', sa.String(), nullable=True),
+        sa.Column('base_class', BASE_G_NODE_CLASS, nullable=False),
+        sa.Column('g_node_class', sa.String(), nullable=False),
+        sa.Column('status', G_NODE_STATUS, nullable=False),
+        sa.Column('position_point_id', sa.String(), nullable=True),
+        sa.Column('display_name', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['position_point_id'], ['position_points.id'],
+            name='g_nodes_position_point_id_fkey',
+        ),
+        sa.PrimaryKeyConstraint('id', name='g_nodes_pkey'),
+    )
+    op.create_index('ix_g_nodes_alias', 'g_nodes', ['alias'], unique=True)
+    op.create_table(
+        'connectivity_edges',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('from_g_node_id', sa.String(), nullable=False),
+        sa.Column('to_g_node_id', sa.String(), nullable=False),
+        sa.Column('from_g_node_alias', sa.String(), nullable=False),
+        sa.Column('to_g_node_alias', sa.String(), nullable=False),
+        sa.Column('status', CONNECTIVITY_EDGE_STATUS, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['from_g_node_id'], ['g_nodes.id'],
+            name='connectivity_edges_from_g_node_id_fkey',
+        ),
+        sa.ForeignKeyConstraint(
+            ['to_g_node_id'], ['g_nodes.id'],
+            name='connectivity_edges_to_g_node_id_fkey',
+        ),
+        sa.PrimaryKeyConstraint('id', name='connectivity_edges_pkey'),
+        sa.UniqueConstraint(
+            'from_g_node_id', 'to_g_node_id', name='uq_connectivity_edges_from_to'
+        ),
+    )
+    op.create_index(
+        'ix_connectivity_edges_from_g_node_alias',
+        'connectivity_edges', ['from_g_node_alias'],
+    )
+    op.create_index(
+        'ix_connectivity_edges_from_g_node_id',
+        'connectivity_edges', ['from_g_node_id'],
+    )
+    op.create_index(
+        'ix_connectivity_edges_to_g_node_alias',
+        'connectivity_edges', ['to_g_node_alias'],
+    )
+    op.create_index(
+        'ix_connectivity_edges_to_g_node_id',
+        'connectivity_edges', ['to_g_node_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('connectivity_edges')
+    op.drop_table('g_nodes')
+    op.drop_table('position_points')
+    bind = op.get_bind()
+    for enum_type in (CONNECTIVITY_EDGE_STATUS, G_NODE_STATUS, BASE_G_NODE_CLASS):
+        enum_type.drop(bind, checkfirst=True)
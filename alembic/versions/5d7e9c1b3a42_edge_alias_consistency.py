@@ -0,0 +1,103 @@
+"""edge alias consistency
+
+Revision ID: 5d7e9c1b3a42
+Revises: 8b2d4e6f0a31
+Create Date: 2026-10-19 14:22:41.086310
+
+Makes the database keep ConnectivityEdge aliases consistent with their
+GNodes. Each edge endpoint gets a composite foreign key
+
+    (from_g_node_id, from_g_node_alias) -> g_nodes (id, alias)
+    ON UPDATE CASCADE DEFERRABLE INITIALLY DEFERRED
+
+so renaming a GNode rewrites the aliases on its edges, and mismatches
+are checked once at commit (a batch of nodes and edges may arrive in
+any order within a transaction).
+
+On Postgres this runs online: the (id, alias) unique index is built
+CONCURRENTLY, existing edges are brought up to date with one set-based
+UPDATE per endpoint, and the foreign keys are added NOT VALID and then
+validated in a single pass without blocking writes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e9c1b3a42'
+down_revision: Union[str, Sequence[str], None] = '8b2d4e6f0a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ID_ALIAS_UNIQUE = 'uq_g_nodes_id_alias'
+
+# (constraint, id column, alias column)
+ALIAS_FOREIGN_KEYS = (
+    ('connectivity_edges_from_g_node_alias_fkey', 'from_g_node_id', 'from_g_node_alias'),
+    ('connectivity_edges_to_g_node_alias_fkey', 'to_g_node_id', 'to_g_node_alias'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        _repair_edge_aliases()
+        with op.batch_alter_table('g_nodes') as batch:
+            batch.create_unique_constraint(ID_ALIAS_UNIQUE, ['id', 'alias'])
+        with op.batch_alter_table('connectivity_edges') as batch:
+            for name, id_col, alias_col in ALIAS_FOREIGN_KEYS:
+                batch.create_foreign_key(
+                    name, 'g_nodes', [id_col, alias_col], ['id', 'alias'],
+                    onupdate='CASCADE', deferrable=True, initially='DEFERRED',
+                )
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS '
+            f'{ID_ALIAS_UNIQUE} ON g_nodes (id, alias)'
+        )
+    op.execute(
+        f'ALTER TABLE g_nodes ADD CONSTRAINT {ID_ALIAS_UNIQUE} '
+        f'UNIQUE USING INDEX {ID_ALIAS_UNIQUE}'
+    )
+    _repair_edge_aliases()
+    for name, id_col, alias_col in ALIAS_FOREIGN_KEYS:
+        op.execute(
+            f'ALTER TABLE connectivity_edges ADD CONSTRAINT {name} '
+            f'FOREIGN KEY ({id_col}, {alias_col}) REFERENCES g_nodes (id, alias) '
+            f'ON UPDATE CASCADE DEFERRABLE INITIALLY DEFERRED NOT VALID'
+        )
+
+    # Set-based validation (SHARE UPDATE EXCLUSIVE: writes continue)
+    with op.get_context().autocommit_block():
+        for name, _id_col, _alias_col in ALIAS_FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE connectivity_edges VALIDATE CONSTRAINT {name}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('connectivity_edges') as batch:
+        for name, _id_col, _alias_col in ALIAS_FOREIGN_KEYS:
+            batch.drop_constraint(name, type_='foreignkey')
+    with op.batch_alter_table('g_nodes') as batch:
+        batch.drop_constraint(ID_ALIAS_UNIQUE, type_='unique')
+
+
+def _repair_edge_aliases() -> None:
+    """Edges take their GNodes' current aliases (the GNode is authoritative)."""
+    for _name, id_col, alias_col in ALIAS_FOREIGN_KEYS:
+        op.execute(
+            f"""
+            UPDATE connectivity_edges
+            SET {alias_col} = (
+                SELECT g.alias FROM g_nodes g WHERE g.id = connectivity_edges.{id_col}
+            )
+            WHERE EXISTS (
+                SELECT 1 FROM g_nodes g
+                WHERE g.id = connectivity_edges.{id_col}
+                  AND g.alias <> connectivity_edges.{alias_col}
+            )
+            """
+        )
@@ -0,0 +1,213 @@
+"""native uuid ids
+
+Revision ID: 8b2d4e6f0a31
+Revises: 2c6a9e1f4b87
+Create Date: 2026-10-19 10:03:17.554102
+
+Moves every id and foreign-key column from varchar to uuid.
+
+On Postgres this runs online, without holding an ACCESS EXCLUSIVE lock
+for a table rewrite:
+
+  1. add shadow `<col>_uuid` columns, kept in sync by a trigger
+  2. backfill existing rows in small, separately committed batches
+  3. build the replacement indexes CONCURRENTLY and prove NOT NULL with
+     validated CHECK constraints
+  4. swap the columns in one short transaction (catalog changes only)
+  5. re-add foreign keys NOT VALID, then validate them without
+     blocking writes
+
+Other dialects (a local SQLite) are converted in place.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4e6f0a31'
+down_revision: Union[str, Sequence[str], None] = '2c6a9e1f4b87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+# table -> uuid columns (parents before children)
+UUID_COLUMNS = {
+    'position_points': ('id',),
+    'g_nodes': ('id', 'position_point_id'),
+    'connectivity_edges': ('id', 'from_g_node_id', 'to_g_node_id'),
+}
+
+NOT_NULL_COLUMNS = {
+    'position_points': ('id',),
+    'g_nodes': ('id',),
+    'connectivity_edges': ('id', 'from_g_node_id', 'to_g_node_id'),
+}
+
+# (constraint, table, column, referenced table)
+FOREIGN_KEYS = (
+    ('g_nodes_position_point_id_fkey', 'g_nodes', 'position_point_id', 'position_points'),
+    ('connectivity_edges_from_g_node_id_fkey', 'connectivity_edges', 'from_g_node_id', 'g_nodes'),
+    ('connectivity_edges_to_g_node_id_fkey', 'connectivity_edges', 'to_g_node_id', 'g_nodes'),
+)
+
+# (final name, table, columns, kind) with kind in {'pk', 'unique', 'index'}
+INDEXES = (
+    ('position_points_pkey', 'position_points', ('id',), 'pk'),
+    ('g_nodes_pkey', 'g_nodes', ('id',), 'pk'),
+    ('connectivity_edges_pkey', 'connectivity_edges', ('id',), 'pk'),
+    ('uq_connectivity_edges_from_to', 'connectivity_edges',
+     ('from_g_node_id', 'to_g_node_id'), 'unique'),
+    ('ix_connectivity_edges_from_g_node_id', 'connectivity_edges',
+     ('from_g_node_id',), 'index'),
+    ('ix_connectivity_edges_to_g_node_id', 'connectivity_edges',
+     ('to_g_node_id',), 'index'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        _convert_in_place()
+        return
+
+    # 1. Shadow columns + sync triggers
+    for table, columns in UUID_COLUMNS.items():
+        for col in columns:
+            op.add_column(table, sa.Column(f'{col}_uuid', sa.Uuid(), nullable=True))
+        assignments = ' '.join(
+            f'NEW.{col}_uuid := NEW.{col}::uuid;' for col in columns
+        )
+        op.execute(
+            f"""
+            CREATE FUNCTION gnr_{table}_uuid_sync() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN {assignments} RETURN NEW; END $$
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER gnr_{table}_uuid_sync
+            BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION gnr_{table}_uuid_sync()
+            """
+        )
+
+    with op.get_context().autocommit_block():
+        # 2. Backfill in batches; each UPDATE commits on its own
+        for table, columns in UUID_COLUMNS.items():
+            _backfill(table, columns)
+
+        # 3. Replacement indexes and NOT NULL proofs
+        for name, table, columns, kind in INDEXES:
+            unique = 'UNIQUE ' if kind in ('pk', 'unique') else ''
+            cols = ', '.join(f'{c}_uuid' for c in columns)
+            op.execute(
+                f'CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS '
+                f'{name}_uuid ON {table} ({cols})'
+            )
+        for table, columns in NOT_NULL_COLUMNS.items():
+            for col in columns:
+                op.execute(
+                    f'ALTER TABLE {table} ADD CONSTRAINT {table}_{col}_uuid_nn '
+                    f'CHECK ({col}_uuid IS NOT NULL) NOT VALID'
+                )
+                op.execute(
+                    f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{col}_uuid_nn'
+                )
+
+    # 4. Swap (children first so foreign keys can be dropped)
+    for name, table, _col, _ref in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+    for table, columns in reversed(UUID_COLUMNS.items()):
+        op.execute(f'DROP TRIGGER gnr_{table}_uuid_sync ON {table}')
+        op.execute(f'DROP FUNCTION gnr_{table}_uuid_sync()')
+        for col in columns:
+            # Drops the old primary key, unique constraint and indexes too
+            op.drop_column(table, col)
+            op.alter_column(table, f'{col}_uuid', new_column_name=col)
+        for col in NOT_NULL_COLUMNS[table]:
+            # Instant: the validated CHECK already proves it
+            op.alter_column(table, col, nullable=False)
+            op.drop_constraint(f'{table}_{col}_uuid_nn', table, type_='check')
+    for name, table, _columns, kind in INDEXES:
+        if kind == 'pk':
+            op.execute(
+                f'ALTER TABLE {table} ADD CONSTRAINT {name} '
+                f'PRIMARY KEY USING INDEX {name}_uuid'
+            )
+        elif kind == 'unique':
+            op.execute(
+                f'ALTER TABLE {table} ADD CONSTRAINT {name} '
+                f'UNIQUE USING INDEX {name}_uuid'
+            )
+        else:
+            op.execute(f'ALTER INDEX {name}_uuid RENAME TO {name}')
+    for name, table, col, ref in FOREIGN_KEYS:
+        op.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {name} '
+            f'FOREIGN KEY ({col}) REFERENCES {ref} (id) NOT VALID'
+        )
+
+    # 5. Validate foreign keys (SHARE UPDATE EXCLUSIVE: writes continue)
+    with op.get_context().autocommit_block():
+        for name, table, _col, _ref in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        _convert_in_place(to_uuid=False)
+        return
+
+    # Offline: rewrites each table under an ACCESS EXCLUSIVE lock
+    for name, table, _col, _ref in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+    for table, columns in UUID_COLUMNS.items():
+        for col in columns:
+            op.alter_column(
+                table, col,
+                type_=sa.String(),
+                postgresql_using=f'{col}::text',
+            )
+    for name, table, col, ref in FOREIGN_KEYS:
+        op.create_foreign_key(name, table, ref, [col], ['id'])
+
+
+def _backfill(table: str, columns: Sequence[str]) -> None:
+    assignments = ', '.join(f'{col}_uuid = {col}::uuid' for col in columns)
+    stmt = sa.text(
+        f"""
+        UPDATE {table} SET {assignments}
+        WHERE id IN (
+            SELECT id FROM {table} WHERE id_uuid IS NULL LIMIT :batch_size
+        )
+        """
+    )
+    bind = op.get_bind()
+    while bind.execute(stmt, {'batch_size': BACKFILL_BATCH_SIZE}).rowcount:
+        pass
+
+
+def _convert_in_place(to_uuid: bool = True) -> None:
+    # sa.Uuid is CHAR(32) hex on dialects without a native uuid type
+    for table, columns in UUID_COLUMNS.items():
+        for col in columns:
+            if to_uuid:
+                op.execute(f"UPDATE {table} SET {col} = replace({col}, '-', '')")
+        with op.batch_alter_table(table) as batch:
+            for col in columns:
+                batch.alter_column(
+                    col, type_=sa.Uuid() if to_uuid else sa.String()
+                )
+        if not to_uuid:
+            for col in columns:
+                op.execute(
+                    f"UPDATE {table} SET {col} = "
+                    f"substr({col}, 1, 8) || '-' || substr({col}, 9, 4) || '-' || "
+                    f"substr({col}, 13, 4) || '-' || substr({col}, 17, 4) || '-' || "
+                    f"substr({col}, 21)"
+                )
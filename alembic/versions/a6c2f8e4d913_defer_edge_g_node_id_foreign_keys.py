@@ -0,0 +1,55 @@
+"""defer edge g_node id foreign keys
+
+Revision ID: a6c2f8e4d913
+Revises: c4e8a2f61d57
+Create Date: 2026-10-19 21:12:37.509114
+
+Makes connectivity_edges' plain (from|to)_g_node_id -> g_nodes.id
+foreign keys DEFERRABLE INITIALLY DEFERRED, like the (id, alias) keys
+added in 5d7e9c1b3a42. While they were immediate, an edge could not be
+written before its GNodes in the same transaction.
+
+On Postgres this is ALTER CONSTRAINT: catalog only, no revalidation.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c2f8e4d913'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a2f61d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (constraint, id column)
+ID_FOREIGN_KEYS = (
+    ('connectivity_edges_from_g_node_id_fkey', 'from_g_node_id'),
+    ('connectivity_edges_to_g_node_id_fkey', 'to_g_node_id'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _set_deferrable(True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_deferrable(False)
+
+
+def _set_deferrable(deferred: bool) -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        with op.batch_alter_table('connectivity_edges') as batch:
+            for name, column in ID_FOREIGN_KEYS:
+                batch.drop_constraint(name, type_='foreignkey')
+                batch.create_foreign_key(
+                    name, 'g_nodes', [column], ['id'],
+                    deferrable=deferred or None,
+                    initially='DEFERRED' if deferred else None,
+                )
+        return
+    timing = 'DEFERRABLE INITIALLY DEFERRED' if deferred else 'NOT DEFERRABLE'
+    for name, _column in ID_FOREIGN_KEYS:
+        op.execute(f'ALTER TABLE connectivity_edges ALTER CONSTRAINT {name} {timing}')
@@ -0,0 +1,43 @@
+"""index g_nodes position_point_id
+
+Revision ID: c4e8a2f61d57
+Revises: 5d7e9c1b3a42
+Create Date: 2026-10-19 16:40:05.271958
+
+Indexes g_nodes.position_point_id. Without it, every PositionPoint
+delete (e.g. when duplicate points are merged) checks the foreign key
+with a scan of g_nodes. Built CONCURRENTLY on Postgres.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2f61d57'
+down_revision: Union[str, Sequence[str], None] = '5d7e9c1b3a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_g_nodes_position_point_id'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        op.create_index(INDEX, 'g_nodes', ['position_point_id'])
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX, 'g_nodes', ['position_point_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index(INDEX, table_name='g_nodes')
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX, table_name='g_nodes', postgresql_concurrently=True)
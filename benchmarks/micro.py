@@ -0,0 +1,428 @@
+"""
+Microbenchmarks for the Sema, codec and model conversion hot paths.
+
+Covers, per current Sema type, SemaCodec.from_bytes/to_bytes (JSON, and
+MessagePack when installed); every old-version translation path plus
+the current and lenient decode paths; recursively_pascal; every
+property-format validator (and the vectorized bulk checks when NumPy is
+installed); GNodeSql.from_gt/to_gt at 1k/100k/1M rows; and cold import
+time of the main entry modules.
+
+For each case it reports throughput (best of --repeat runs) and the
+bytes retained per operation, measured with tracemalloc on a separate
+run that keeps every result alive. Nothing beyond a local checkout is
+needed: no database, no network.
+
+    uv run python benchmarks/micro.py                  # run, compare to baseline
+    uv run python benchmarks/micro.py --save           # record a new baseline
+    uv run python benchmarks/micro.py --quick -k codec # fewer rows, codec cases
+
+Baselines are machine specific; record one before changing code and
+compare on the same machine. The run exits 1 if any case's throughput
+drops, or its bytes per op grow, by more than --threshold.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Any
+
+from gnr.db.models import GNodeSql
+from gnr.sema import property_format
+from gnr.sema.base import SemaType, recursively_pascal
+from gnr.sema.codec import SemaCodec, WireFormat
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+from gnr.sema.types import ConnectivityEdgeGt, GNodeGt, PositionPointGt
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+SCALES = (1_000, 100_000, 1_000_000)
+QUICK_SCALES = (1_000,)
+# Distinct inputs per case (model cases build one per row); runs cycle through them
+POOL_SIZE = 1_000
+# Results kept alive while measuring bytes per op
+ALLOC_OPS = 1_000
+IMPORTS = ("gnr.sema", "gnr.sema.codec", "gnr.db.models", "gnr.cli")
+
+
+@dataclass
+class Case:
+    name: str
+    op: Callable[[Any], Any]
+    items: Sequence[Any]
+    ops: int = 10_000
+    # Builds `items` when the case runs, for inputs too large to keep around
+    build: Callable[[], Sequence[Any]] | None = None
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_s: float
+    bytes_per_op: float | None
+
+
+# ============================================================================
+# SAMPLE DATA
+# ============================================================================
+
+def position_points(n: int) -> list[PositionPointGt]:
+    return [
+        PositionPointGt(
+            id=str(uuid.uuid4()),
+            latitude_micro_deg=44_000_000 + i,
+            longitude_micro_deg=-69_000_000 - i,
+        )
+        for i in range(n)
+    ]
+
+
+def g_nodes(n: int) -> list[GNodeGt]:
+    nodes = []
+    for i in range(n):
+        physical = i % 2 == 0
+        nodes.append(
+            GNodeGt(
+                g_node_id=str(uuid.uuid4()),
+                alias=f"hw1.isone.me.versant.keene.n{i}",
+                base_class=BaseGNodeClass.ConnectivityNode if physical else BaseGNodeClass.Logical,
+                g_node_class="ConnectivityNode" if physical else "Scada",
+                status=GNodeStatus.Active,
+                position_point_id=str(uuid.uuid4()) if physical else None,
+                prev_alias=f"hw1.isone.me.keene.n{i}" if i % 5 == 0 else None,
+                display_name=f"Node {i}",
+            )
+        )
+    return nodes
+
+
+def connectivity_edges(n: int) -> list[ConnectivityEdgeGt]:
+    return [
+        ConnectivityEdgeGt(
+            id=str(uuid.uuid4()),
+            from_g_node_id=str(uuid.uuid4()),
+            to_g_node_id=str(uuid.uuid4()),
+            from_g_node_alias=f"hw1.isone.me.n{i}",
+            to_g_node_alias=f"hw1.isone.me.n{i}.child",
+            status=GNodeStatus.Active,
+        )
+        for i in range(n)
+    ]
+
+
+SAMPLES: dict[type[SemaType], Callable[[int], list[SemaType]]] = {
+    PositionPointGt: position_points,
+    GNodeGt: g_nodes,
+    ConnectivityEdgeGt: connectivity_edges,
+}
+
+
+# ============================================================================
+# CASES
+# ============================================================================
+
+def codec_cases() -> list[Case]:
+    codec = SemaCodec(encode_cache_size=0)
+    formats = [WireFormat.Json]
+    try:
+        import msgpack  # noqa: F401, PLC0415
+
+        formats.append(WireFormat.MsgPack)
+    except ImportError:
+        pass
+    cases = []
+    for cls, make in SAMPLES.items():
+        msgs = make(POOL_SIZE)
+        for fmt in formats:
+            label = f"{cls.__name__}.{fmt.name.lower()}"
+            encoded = [codec.to_bytes(m, fmt) for m in msgs]
+            cases.append(Case(
+                f"codec.from_bytes.{label}",
+                lambda b, fmt=fmt: codec.from_bytes(b, fmt),
+                encoded,
+            ))
+            # Each pass needs unmemoized instances; built per op, so this
+            # measures construct + encode against the construct-only case
+            cases.append(Case(
+                f"codec.to_bytes.{label}",
+                lambda m, fmt=fmt: codec.to_bytes(
+                    type(m).model_construct(**dict(m)), fmt
+                ),
+                msgs,
+            ))
+        cases.append(Case(
+            f"codec.model_construct.{cls.__name__}",
+            lambda m: type(m).model_construct(**dict(m)),
+            msgs,
+        ))
+    return cases
+
+
+def decode_path_cases() -> list[Case]:
+    codec = SemaCodec()
+    cases = []
+    for cls, make in SAMPLES.items():
+        current = [m.to_dict() for m in make(POOL_SIZE)]
+        cases.append(Case(f"decode.current.{cls.__name__}", codec.decode, current))
+        # A future version with a field this code does not know
+        newer = [{**d, "Version": "999", "AddedLater": 1} for d in current]
+        cases.append(Case(f"decode.lenient.{cls.__name__}", codec.decode, newer))
+        for version, old_cls in sorted(
+            codec.old_versions.get(cls.type_name_value(), {}).items(),
+            key=lambda kv: str(kv[0]),
+        ):
+            old = _old_payloads(old_cls, version, current)
+            if old is None:
+                print(f"  skipping decode.translated.{cls.__name__}.v{version}: "
+                      "no sample payload", file=sys.stderr)
+                continue
+            cases.append(Case(
+                f"decode.translated.{cls.__name__}.v{version}", codec.decode, old
+            ))
+    return cases
+
+
+def _old_payloads(
+    old_cls: type[SemaType], version: str | None, current: list[dict]
+) -> list[dict] | None:
+    """Current payloads cut down to an old version's fields, if they validate."""
+    fields = {f.alias or f_name for f_name, f in old_cls.model_fields.items()}
+    payloads = []
+    for d in current:
+        old = {k: v for k, v in d.items() if k in fields}
+        if version is None:
+            old.pop("Version", None)
+        else:
+            old["Version"] = version
+        payloads.append(old)
+    try:
+        old_cls.from_dict(payloads[0])
+    except (ValueError, TypeError):
+        return None
+    return payloads
+
+
+def pascal_cases() -> list[Case]:
+    payloads = [m.to_dict() for m in g_nodes(POOL_SIZE)]
+    nested = [{"Outer": d, "Items": [d, d]} for d in payloads]
+    return [
+        Case("recursively_pascal.flat", recursively_pascal, payloads),
+        Case("recursively_pascal.nested", recursively_pascal, nested),
+    ]
+
+
+def property_format_cases() -> list[Case]:
+    aliases = [f"hw1.isone.me.versant.keene.n{i}" for i in range(POOL_SIZE)]
+    samples = {
+        "is_left_right_dot": aliases,
+        "is_handle_name": [f"h{i}.pump-relay.ctl-{i}" for i in range(POOL_SIZE)],
+        "is_spaceheat_name": [f"pump-relay-{i}" for i in range(POOL_SIZE)],
+        "is_uuid4_str": [str(uuid.uuid4()) for _ in range(POOL_SIZE)],
+        "is_utc_seconds": [1_700_000_000 + i for i in range(POOL_SIZE)],
+        "is_utc_milliseconds": [1_700_000_000_000 + i for i in range(POOL_SIZE)],
+    }
+    validators = sorted(
+        name for name in vars(property_format)
+        if name.startswith("is_") and callable(getattr(property_format, name))
+    )
+    cases = []
+    for name in validators:
+        if name not in samples:
+            print(f"  skipping property_format.{name}: no sample values", file=sys.stderr)
+            continue
+        cases.append(Case(
+            f"property_format.{name}", getattr(property_format, name), samples[name],
+            ops=100_000,
+        ))
+    cases.extend(_bulk_format_cases(samples))
+    return cases
+
+
+def _bulk_format_cases(samples: dict[str, list]) -> list[Case]:
+    try:
+        from gnr.ingest import bulk_format  # noqa: PLC0415
+    except ImportError:
+        return []
+    column = 100_000
+    columns = {
+        name.replace("is_", "invalid_"): list(islice(cycle(values), column))
+        for name, values in samples.items()
+    }
+    cases = []
+    for name, values in columns.items():
+        check = getattr(bulk_format, name, None)
+        if check is None:
+            continue
+        # One op = one whole column; throughput is columns per second
+        cases.append(Case(f"bulk_format.{name}.{column}", check, [values], ops=5))
+    return cases
+
+
+def model_cases(scales: Sequence[int]) -> list[Case]:
+    """n distinct GNodes per scale, so the larger runs leave the CPU caches."""
+    cases = []
+    for n in scales:
+        cases.append(Case(
+            f"GNodeSql.from_gt.{n}", GNodeSql.from_gt, (), ops=n,
+            build=lambda n=n: g_nodes(n),
+        ))
+        cases.append(Case(
+            f"GNodeSql.to_gt.{n}", GNodeSql.to_gt, (), ops=n,
+            build=lambda n=n: [GNodeSql.from_gt(gt) for gt in g_nodes(n)],
+        ))
+    return cases
+
+
+# ============================================================================
+# RUNNING
+# ============================================================================
+
+def run_case(case: Case, repeat: int) -> Result:
+    op = case.op
+    items = case.build() if case.build is not None else case.items
+    for x in islice(cycle(items), min(case.ops, 100)):  # warm up
+        op(x)
+    best = float("inf")
+    for _ in range(repeat):
+        stream = list(islice(cycle(items), case.ops))
+        gc.collect()
+        start = time.perf_counter()
+        for x in stream:
+            op(x)
+        best = min(best, time.perf_counter() - start)
+    return Result(case.name, case.ops / best, _bytes_per_op(op, items))
+
+
+def _bytes_per_op(op: Callable[[Any], Any], items: Sequence[Any]) -> float:
+    stream = list(islice(cycle(items), min(ALLOC_OPS, max(len(items), 1))))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [op(x) for x in stream]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return (after - before) / len(stream)
+
+
+def import_results(repeat: int) -> list[Result]:
+    """Cold import time of the entry modules, each in a fresh interpreter."""
+    results = []
+    for module in IMPORTS:
+        code = (
+            "import time; t = time.perf_counter(); "
+            f"import {module}; print(time.perf_counter() - t)"
+        )
+        best = min(
+            float(subprocess.run(
+                [sys.executable, "-c", code], check=True, capture_output=True, text=True
+            ).stdout)
+            for _ in range(repeat)
+        )
+        results.append(Result(f"import.{module}", 1 / best, None))
+    return results
+
+
+def compare(
+    results: list[Result], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    regressions = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            continue
+        if r.ops_per_s < base["ops_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{r.name}: {r.ops_per_s:,.0f} ops/s vs baseline {base['ops_per_s']:,.0f}"
+            )
+        base_bytes = base.get("bytes_per_op")
+        # 64 bytes of slack: small cases wobble by an object header
+        if (
+            r.bytes_per_op is not None
+            and base_bytes is not None
+            and r.bytes_per_op > base_bytes * (1 + threshold) + 64
+        ):
+            regressions.append(
+                f"{r.name}: {r.bytes_per_op:,.0f} B/op vs baseline {base_bytes:,.0f}"
+            )
+    return regressions
+
+
+def report(results: list[Result], baseline: dict[str, dict]) -> str:
+    rows = [f"{'case':<52} {'ops/s':>14} {'vs base':>8} {'B/op':>10}"]
+    for r in results:
+        base = baseline.get(r.name)
+        delta = f"{r.ops_per_s / base['ops_per_s'] - 1:+.0%}" if base else ""
+        per_op = f"{r.bytes_per_op:,.0f}" if r.bytes_per_op is not None else "-"
+        rows.append(f"{r.name:<52} {r.ops_per_s:>14,.0f} {delta:>8} {per_op:>10}")
+    return "\n".join(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="pattern", default=None,
+                        help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true",
+                        help=f"model conversion at {QUICK_SCALES[0]:,} rows only")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true",
+                        help="write this run's results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown / allocation growth (default 0.2)")
+    args = parser.parse_args()
+
+    cases = [
+        *codec_cases(),
+        *decode_path_cases(),
+        *pascal_cases(),
+        *property_format_cases(),
+        *model_cases(QUICK_SCALES if args.quick else SCALES),
+    ]
+    if args.pattern:
+        cases = [c for c in cases if args.pattern in c.name]
+
+    results = []
+    for case in cases:
+        results.append(run_case(case, args.repeat))
+        print(f"  {case.name}", file=sys.stderr)
+    if not args.pattern or "import" in args.pattern:
+        results.extend(import_results(args.repeat))
+
+    baseline = {}
+    if args.baseline.exists() and not args.save:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    print(report(results, baseline))
+
+    if args.save:
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": {
+                r.name: {"ops_per_s": r.ops_per_s, "bytes_per_op": r.bytes_per_op}
+                for r in results
+            },
+        }, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        print("\n".join(f"  {line}" for line in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Index size and join benchmark: varchar ids vs native uuid ids.
+
+Builds two copies of a g_nodes/connectivity_edges shaped schema in a
+scratch Postgres schema, one keyed by varchar and one by uuid, then
+reports index sizes and the time of an edge -> node join on each.
+
+    uv run python benchmarks/uuid_storage.py --nodes 1000000
+
+Uses GNR_DB_URL (see template.env). The scratch schema is dropped at
+the end.
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+from gnr.config import Settings
+
+SCHEMA = "gnr_bench_uuid"
+
+JOIN = """
+    SELECT count(*)
+    FROM {schema}.edges_{kind} e
+    JOIN {schema}.nodes_{kind} f ON f.id = e.from_g_node_id
+    JOIN {schema}.nodes_{kind} t ON t.id = e.to_g_node_id
+"""
+
+
+def build(conn, kind: str, id_type: str) -> None:
+    conn.execute(text(f"""
+        CREATE TABLE {SCHEMA}.nodes_{kind} (
+            id {id_type} PRIMARY KEY,
+            alias varchar NOT NULL
+        )
+    """))
+    conn.execute(text(f"""
+        CREATE TABLE {SCHEMA}.edges_{kind} (
+            id {id_type} PRIMARY KEY,
+            from_g_node_id {id_type} NOT NULL REFERENCES {SCHEMA}.nodes_{kind} (id),
+            to_g_node_id {id_type} NOT NULL REFERENCES {SCHEMA}.nodes_{kind} (id)
+        )
+    """))
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.nodes_{kind}
+        SELECT u::{id_type}, 'd1.n' || n FROM {SCHEMA}.ids
+    """))
+    # Each node (but the first) hangs off its predecessor
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.edges_{kind}
+        SELECT gen_random_uuid()::{id_type}, p.u::{id_type}, c.u::{id_type}
+        FROM {SCHEMA}.ids c JOIN {SCHEMA}.ids p ON p.n = c.n - 1
+    """))
+    conn.execute(text(
+        f"CREATE INDEX ON {SCHEMA}.edges_{kind} (from_g_node_id)"
+    ))
+    conn.execute(text(f"CREATE INDEX ON {SCHEMA}.edges_{kind} (to_g_node_id)"))
+    conn.execute(text(f"ANALYZE {SCHEMA}.nodes_{kind}"))
+    conn.execute(text(f"ANALYZE {SCHEMA}.edges_{kind}"))
+
+
+def index_bytes(conn, kind: str) -> int:
+    return conn.execute(text(f"""
+        SELECT sum(pg_relation_size(indexrelid))
+        FROM pg_index
+        WHERE indrelid IN (
+            '{SCHEMA}.nodes_{kind}'::regclass, '{SCHEMA}.edges_{kind}'::regclass
+        )
+    """)).scalar_one()
+
+
+def time_join(conn, kind: str, repeat: int) -> float:
+    stmt = text(JOIN.format(schema=SCHEMA, kind=kind))
+    conn.execute(stmt)  # warm the cache
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(stmt)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(Settings().db_url.get_secret_value())
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"""
+            CREATE TABLE {SCHEMA}.ids AS
+            SELECT g AS n, gen_random_uuid()::text AS u
+            FROM generate_series(1, :n) g
+        """), {"n": args.nodes})
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.ids (n)"))
+        try:
+            print(f"{'ids':<8} {'index MiB':>10} {'join ms':>10}")
+            for kind, id_type in (("varchar", "varchar"), ("uuid", "uuid")):
+                build(conn, kind, id_type)
+                size = index_bytes(conn, kind) / 2**20
+                ms = time_join(conn, kind, args.repeat) * 1000
+                print(f"{kind:<8} {size:>10.1f} {ms:>10.1f}")
+        finally:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,4 @@
 def main() -> None:
-    print("Hello from gnr!")
+    from gnr.cli import main as cli_main  # noqa PLC0415
+
+    cli_main()
@@ -0,0 +1,11 @@
+"""
+HTTP API for the Grid Node Registry.
+
+    uv run uvicorn --factory gnr.api:create_app
+"""
+
+from gnr.api.app import create_app
+
+__all__ = [
+    "create_app",
+]
@@ -0,0 +1,141 @@
+"""
+Admission control sized from the database pool.
+
+Every request needs a pooled connection sooner or later, so letting more
+requests run than the pool can serve only moves the queue from the API
+into SQLAlchemy, where nothing can be shed. Requests are instead admitted
+through one of two lanes whose slots add up to what the pool has left for
+requests: `db_pool_size + db_max_overflow`, less the connections held by
+background workers (the WriteBatcher's flushes). The resolver's LISTEN
+connection is opened outside the pool and not counted.
+
+  - bulk:        bulk ingest and streaming exports, a bounded share
+                 (`admission_bulk_share`) of the pool
+  - interactive: everything else
+
+A request that cannot get a slot within `admission_wait_budget_ms` is
+rejected with 429 and a Retry-After header, so a long import fills only
+the bulk lane and lookups keep their latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import TYPE_CHECKING
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from gnr.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from gnr.config import Settings
+
+BULK_PATH_PREFIXES = ("/bulk/", "/export/")
+EXEMPT_PATHS = ("/metrics",)
+
+ADMISSION_WAIT_SECONDS = REGISTRY.histogram(
+    "gnr_admission_wait_seconds",
+    "Time admitted requests waited for a slot, by lane",
+    ("lane",),
+)
+ADMISSION_SHED = REGISTRY.counter(
+    "gnr_admission_shed_total",
+    "Requests rejected with 429 because the lane's wait budget ran out",
+    ("lane",),
+)
+
+
+class Overloaded(Exception):
+    def __init__(self, lane: str, retry_after_s: int) -> None:
+        super().__init__(f"{lane} lane is saturated")
+        self.lane = lane
+        self.retry_after_s = retry_after_s
+
+
+class Lane:
+    def __init__(self, name: str, slots: int, wait_budget_s: float) -> None:
+        self.name = name
+        self.slots = slots
+        self.wait_budget_s = wait_budget_s
+        self._semaphore = asyncio.Semaphore(slots)
+
+    async def acquire(self) -> None:
+        """Take a slot, or raise Overloaded once the wait budget is spent."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.wait_budget_s)
+        except TimeoutError:
+            ADMISSION_SHED.inc(self.name)
+            raise Overloaded(self.name, max(1, math.ceil(self.wait_budget_s))) from None
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start, self.name)
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+class AdmissionController:
+    def __init__(self, capacity: int, bulk_share: float, wait_budget_ms: float) -> None:
+        if capacity < 2:
+            raise ValueError(
+                f"Admission needs at least 2 pool connections for requests, got {capacity}"
+            )
+        wait_budget_s = wait_budget_ms / 1000
+        # Each lane gets at least one slot; together they never exceed capacity
+        bulk_slots = min(max(1, math.floor(capacity * bulk_share)), capacity - 1)
+        self.bulk = Lane("bulk", bulk_slots, wait_budget_s)
+        self.interactive = Lane("interactive", capacity - bulk_slots, wait_budget_s)
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, background_connections: int = 0
+    ) -> AdmissionController:
+        """Lanes for the pool connections `background_connections` leave free."""
+        return cls(
+            capacity=settings.db_pool_size + settings.db_max_overflow - background_connections,
+            bulk_share=settings.admission_bulk_share,
+            wait_budget_ms=settings.admission_wait_budget_ms,
+        )
+
+    def lane_for(self, path: str) -> Lane | None:
+        if path in EXEMPT_PATHS:
+            return None
+        if path.startswith(BULK_PATH_PREFIXES):
+            return self.bulk
+        return self.interactive
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware holding a lane slot for the whole response, including
+    the body of streamed exports.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        lane = self.controller.lane_for(scope["path"])
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await lane.acquire()
+        except Overloaded as e:
+            response = JSONResponse(
+                {"detail": str(e)},
+                status_code=429,
+                headers={"Retry-After": str(e.retry_after_s)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
@@ -0,0 +1,218 @@
+import asyncio
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, RedirectResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from gnr.api.admission import AdmissionController, AdmissionMiddleware
+from gnr.config import Settings
+from gnr.db.batcher import BatcherStopped, WriteBatcher
+from gnr.db.integrity import check_constraints_immediately
+from gnr.db.models import SQL_CLASS_BY_TYPE_NAME
+from gnr.db.resolver import AliasResolver
+from gnr.db.session import current_endpoint, make_engine, make_sessionmaker
+from gnr.log import configure_logging
+from gnr.metrics import CONTENT_TYPE, REGISTRY
+from gnr.sema.base import SemaError
+from gnr.sema.codec import WireFormat, default_codec
+from gnr.tracing import configure_tracing_from_settings, span
+
+# URL collection -> Sema TypeName stored there
+COLLECTIONS = {
+    "position-points": "position.point.gt",
+    "g-nodes": "g.node.gt",
+    "connectivity-edges": "connectivity.edge.gt",
+}
+BULK_CHUNK_SIZE = 1_000
+
+
+async def label_endpoint(request: Request) -> None:
+    """Attribute SQL issued while serving this request to its route."""
+    route = request.scope.get("route")
+    current_endpoint.set(getattr(route, "path", request.url.path))
+
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    settings = settings or Settings()
+    configure_logging(settings)
+    configure_tracing_from_settings(settings)
+    # Long-lived server: pay type discovery at startup, not first request
+    default_codec.load()
+    engine = make_engine(settings)
+    factory = make_sessionmaker(engine)
+    resolver = AliasResolver.from_settings(factory, settings)
+    resolver.watch(factory)
+    batcher = WriteBatcher.from_settings(factory, settings, resolver)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):  # noqa: ANN202, ARG001
+        resolver.start(engine)
+        batcher.start()
+        yield
+        batcher.stop()
+        resolver.stop()
+
+    app = FastAPI(
+        title="Grid Node Registry",
+        dependencies=[Depends(label_endpoint)],
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+    app.state.engine = engine
+    app.state.sessionmaker = factory
+    app.state.batcher = batcher
+    app.state.resolver = resolver
+    app.state.admission = AdmissionController.from_settings(
+        settings, background_connections=batcher.pooled_connections
+    )
+
+    @app.middleware("http")
+    async def trace_request(request: Request, call_next):  # noqa: ANN001, ANN202
+        with span("http.request", method=request.method, path=request.url.path):
+            return await call_next(request)
+
+    # Outermost, so shed requests cost no further work
+    app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> PlainTextResponse:
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/g-nodes/{alias}", response_model=None)
+    def get_g_node(alias: str) -> dict[str, Any] | RedirectResponse:
+        resolved = resolver.by_alias(alias)
+        if resolved is None:
+            renamed = resolver.by_prev_alias(alias)
+            if renamed is None:
+                raise HTTPException(404, f"No GNode {alias}")
+            return RedirectResponse(f"/g-nodes/{renamed.alias}", status_code=308)
+        return resolved.to_gt().to_dict()
+
+    # Creates are group-committed by the WriteBatcher
+
+    @app.post("/position-points", status_code=201)
+    async def create_position_point(request: Request) -> dict[str, Any]:
+        return await _create(batcher, request, "position.point.gt")
+
+    @app.post("/g-nodes", status_code=201)
+    async def create_g_node(request: Request) -> dict[str, Any]:
+        return await _create(batcher, request, "g.node.gt")
+
+    @app.post("/connectivity-edges", status_code=201)
+    async def create_connectivity_edge(request: Request) -> dict[str, Any]:
+        return await _create(batcher, request, "connectivity.edge.gt")
+
+    # Bulk ingest and exports run in the bounded bulk admission lane. Both
+    # speak JSON lines, or a msgpack stream when negotiated (Content-Type
+    # for ingest, Accept for exports).
+
+    @app.post("/bulk/{collection}")
+    async def bulk_create(collection: str, request: Request) -> dict[str, Any]:
+        type_name = _type_name(collection)
+        wire_format = WireFormat.from_content_type(request.headers.get("content-type"))
+        body = await request.body()
+        return await run_in_threadpool(_bulk_insert, factory, body, type_name, wire_format)
+
+    @app.get("/export/{collection}")
+    def export(collection: str, request: Request) -> StreamingResponse:
+        sql_class = SQL_CLASS_BY_TYPE_NAME[_type_name(collection)]
+        wire_format = WireFormat.negotiate(request.headers.get("accept"))
+        return StreamingResponse(
+            _export_frames(factory, sql_class, wire_format),
+            media_type=(
+                wire_format if wire_format == WireFormat.MsgPack else "application/x-ndjson"
+            ),
+            headers={"Vary": "Accept"},
+        )
+
+    return app
+
+
+def _type_name(collection: str) -> str:
+    try:
+        return COLLECTIONS[collection]
+    except KeyError:
+        raise HTTPException(404, f"No collection {collection}") from None
+
+
+async def _create(batcher: WriteBatcher, request: Request, type_name: str) -> dict[str, Any]:
+    """Decode a Sema message of `type_name` and wait for its batch to commit."""
+    try:
+        gt = default_codec.decode(await request.json()).value
+    except (SemaError, ValueError) as e:
+        raise HTTPException(422, str(e)) from e
+    if gt.type_name != type_name:
+        raise HTTPException(422, f"Expected a {type_name}, got {gt.type_name}")
+    try:
+        stored = await asyncio.wrap_future(batcher.submit(gt))
+    except BatcherStopped as e:
+        raise HTTPException(503, "Server is shutting down", {"Retry-After": "1"}) from e
+    except (ValueError, SQLAlchemyError) as e:
+        raise HTTPException(409, str(getattr(e, "orig", e))) from e
+    return stored.to_dict()
+
+
+def _bulk_insert(
+    factory: sessionmaker[Session],
+    body: bytes,
+    type_name: str,
+    wire_format: WireFormat = WireFormat.Json,
+) -> dict[str, Any]:
+    """
+    Insert a body of Sema messages (JSON lines, or a msgpack stream),
+    committing per chunk. A chunk the database refuses is retried row by
+    row, so one conflicting row costs only itself. `Line` in rejections
+    is the line number, or the message's 1-based index for msgpack.
+    """
+    rejected: list[dict[str, Any]] = []
+    rows = []
+    try:
+        frames = list(default_codec.iter_frames(body, wire_format))
+    except (SemaError, ValueError) as e:
+        raise HTTPException(422, str(e)) from e
+    for line_no, frame in frames:
+        try:
+            gt = default_codec.from_frame(frame, wire_format)
+            if gt.type_name != type_name:
+                raise ValueError(f"Expected a {type_name}, got {gt.type_name}")
+        except (SemaError, ValueError) as e:
+            rejected.append({"Line": line_no, "Error": str(e)})
+            continue
+        rows.append((line_no, SQL_CLASS_BY_TYPE_NAME[type_name].from_gt(gt)))
+
+    created = 0
+    with factory() as session:
+        for i in range(0, len(rows), BULK_CHUNK_SIZE):
+            chunk = rows[i:i + BULK_CHUNK_SIZE]
+            try:
+                session.add_all(row for _, row in chunk)
+                session.commit()
+                created += len(chunk)
+                continue
+            except SQLAlchemyError:
+                session.rollback()
+            check_constraints_immediately(session)
+            for line_no, row in chunk:
+                try:
+                    with session.begin_nested():
+                        session.add(row)
+                    created += 1
+                except SQLAlchemyError as e:
+                    rejected.append({"Line": line_no, "Error": str(getattr(e, "orig", e))})
+            session.commit()
+    return {"Created": created, "Rejected": rejected}
+
+
+def _export_frames(
+    factory: sessionmaker[Session], sql_class: type, wire_format: WireFormat
+) -> Iterator[bytes]:
+    with factory() as session:
+        rows = session.scalars(select(sql_class).execution_options(yield_per=BULK_CHUNK_SIZE))
+        for row in rows:
+            yield default_codec.frame(row.to_gt(), wire_format)
@@ -0,0 +1,312 @@
+"""
+Command line interface: `gnr <command> ...`
+
+Command handlers import what they need when they run, so `gnr --help`
+and argument errors return without loading pydantic or SQLAlchemy.
+"""
+
+import argparse
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="gnr", description="Grid Node Registry")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser(
+        "migrate-archive",
+        help="Rewrite a JSONL archive of Sema messages to current versions",
+    )
+    migrate.add_argument("path", nargs="+", help="archive file(s)")
+    migrate.add_argument("--batch-size", type=int, default=1_000)
+    migrate.add_argument(
+        "--max-rows-per-sec",
+        type=float,
+        default=None,
+        help="throttle (default: unthrottled)",
+    )
+    migrate.set_defaults(handler=_migrate_archive)
+
+    profile = commands.add_parser(
+        "profile",
+        help="Replay a captured JSONL payload file under the tracer",
+    )
+    profile.add_argument("path", help="JSONL file of Sema messages")
+    profile.add_argument(
+        "--write",
+        action="store_true",
+        help="also write each message to the database (GNR_DB_URL)",
+    )
+    profile.add_argument("--repeat", type=int, default=1)
+    profile.add_argument(
+        "--otlp-file",
+        default=None,
+        help="also export every trace as OTLP/JSON lines to this file",
+    )
+    profile.set_defaults(handler=_profile)
+
+    synth = commands.add_parser(
+        "synth",
+        help="Generate a seeded synthetic registry (JSONL or database)",
+    )
+    synth.add_argument("--nodes", type=int, default=10_000, help="GNodes to generate")
+    synth.add_argument("--seed", type=int, default=0)
+    target = synth.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="write Sema JSONL to this file")
+    target.add_argument(
+        "--db",
+        action="store_true",
+        help="insert into the database (GNR_DB_URL; schema from alembic)",
+    )
+    synth.set_defaults(handler=_synth)
+
+    load = commands.add_parser(
+        "load",
+        help="Drive mixed read/write/export traffic at a running API",
+    )
+    load.add_argument("--url", default="http://127.0.0.1:8000")
+    aliases = load.add_mutually_exclusive_group(required=True)
+    aliases.add_argument("--registry", help="JSONL from `gnr synth` to read aliases from")
+    aliases.add_argument(
+        "--seed", type=int, help="regenerate the aliases of `gnr synth --seed N`"
+    )
+    load.add_argument(
+        "--nodes", type=int, default=10_000, help="with --seed: the registry size"
+    )
+    load.add_argument("--duration", type=float, default=30.0, help="seconds")
+    load.add_argument("--threads", type=int, default=8)
+    load.add_argument(
+        "--mix",
+        default="read=90,write=9,export=1",
+        help="operation weights (default: read=90,write=9,export=1)",
+    )
+    load.add_argument("--export-collection", default="position-points")
+    load.set_defaults(handler=_load)
+
+    check_edges = commands.add_parser(
+        "check-edges",
+        help="List edges whose aliases disagree with their GNodes (GNR_DB_URL)",
+    )
+    check_edges.add_argument("--limit", type=int, default=100)
+    check_edges.set_defaults(handler=_check_edges)
+
+    ingest = commands.add_parser(
+        "ingest",
+        help="Load a Sema JSONL file into the database, deduplicating PositionPoints",
+    )
+    ingest.add_argument("path", help="JSONL in dependency order (e.g. from `gnr synth`)")
+    ingest.add_argument(
+        "--dedup",
+        choices=["reuse", "flag", "off"],
+        default=None,
+        help="duplicate PositionPoint policy (default: GNR_DEDUP_POLICY)",
+    )
+    ingest.add_argument(
+        "--tolerance",
+        type=int,
+        default=None,
+        help="micro-degrees (default: GNR_DEDUP_TOLERANCE_MICRO_DEG)",
+    )
+    ingest.add_argument("--report", help="write (new point id, existing id) pairs here")
+    ingest.set_defaults(handler=_ingest)
+
+    compact = commands.add_parser(
+        "compact-points",
+        help="Merge duplicate PositionPoints already stored and repoint g_nodes",
+    )
+    compact.add_argument("--tolerance", type=int, default=None)
+    compact.add_argument("--dry-run", action="store_true")
+    compact.set_defaults(handler=_compact_points)
+
+    args = parser.parse_args(argv)
+
+    from gnr.config import Settings  # noqa PLC0415
+    from gnr.log import configure_logging  # noqa PLC0415
+
+    configure_logging(Settings())
+    args.handler(args)
+
+
+def _migrate_archive(args: argparse.Namespace) -> None:
+    from gnr.migrator import ArchiveMigrator  # noqa PLC0415
+    from gnr.sema.codec import default_codec  # noqa PLC0415
+
+    for path in args.path:
+        cp = ArchiveMigrator(
+            default_codec,
+            path,
+            batch_size=args.batch_size,
+            max_rows_per_sec=args.max_rows_per_sec,
+        ).run()
+        print(f"{path}: {cp.rows} rows, {cp.upgraded} upgraded, {cp.failed} failed")
+
+
+def _profile(args: argparse.Namespace) -> None:
+    import json  # noqa PLC0415
+
+    from gnr import tracing  # noqa PLC0415
+    from gnr.sema.base import SemaError  # noqa PLC0415
+    from gnr.sema.codec import default_codec  # noqa PLC0415
+
+    forward = None
+    if args.otlp_file:
+        forward = tracing.OtlpJsonExporter(open(args.otlp_file, "a", encoding="utf-8"))  # noqa: SIM115
+    summary = tracing.SummaryExporter(forward)
+    tracing.configure_tracing(True, summary)
+
+    sessionmaker = None
+    if args.write:
+        from gnr.config import Settings  # noqa PLC0415
+        from gnr.db.session import make_engine, make_sessionmaker  # noqa PLC0415
+
+        sessionmaker = make_sessionmaker(make_engine(Settings()))
+
+    with open(args.path, "rb") as f:
+        payloads = [line for line in f if line.strip()]
+
+    failed = 0
+    for _ in range(args.repeat):
+        for payload in payloads:
+            with tracing.span("profile.message"):
+                try:
+                    msg = default_codec.decode(json.loads(payload)).value
+                except (SemaError, ValueError):
+                    failed += 1
+                    continue
+                if sessionmaker is not None:
+                    _write(sessionmaker, msg)
+
+    tracing.configure_tracing(False)
+    print(summary.report())
+    print(f"{len(payloads) * args.repeat} messages replayed, {failed} rejected")
+
+
+def _write(sessionmaker, msg) -> None:  # noqa: ANN001
+    from gnr.db.models import sql_class_for  # noqa PLC0415
+
+    with sessionmaker() as session:
+        session.merge(sql_class_for(msg).from_gt(msg))
+        session.commit()
+
+
+def _synth(args: argparse.Namespace) -> None:
+    import time  # noqa PLC0415
+
+    from gnr.synth import RegistryGenerator  # noqa PLC0415
+
+    gts = RegistryGenerator(args.nodes, seed=args.seed)
+    start = time.perf_counter()
+    if args.out:
+        from gnr.synth.output import write_jsonl  # noqa PLC0415
+
+        count = write_jsonl(gts, args.out)
+    else:
+        from gnr.config import Settings  # noqa PLC0415
+        from gnr.db.session import make_engine, make_sessionmaker  # noqa PLC0415
+        from gnr.synth.output import write_db  # noqa PLC0415
+
+        count = write_db(gts, make_sessionmaker(make_engine(Settings())))
+    elapsed = time.perf_counter() - start
+    print(f"{count} messages for {args.nodes} GNodes in {elapsed:.1f}s")
+
+
+def _load(args: argparse.Namespace) -> None:
+    from itertools import islice  # noqa PLC0415
+
+    from gnr.synth.load import LoadDriver, aliases_from_jsonl, parse_mix  # noqa PLC0415
+
+    if args.registry:
+        aliases = aliases_from_jsonl(args.registry)
+    else:
+        from gnr.synth import RegistryGenerator  # noqa PLC0415
+
+        generator = RegistryGenerator(args.nodes, seed=args.seed)
+        aliases = list(islice(generator.g_node_aliases(), 100_000))
+    report = LoadDriver(
+        args.url,
+        aliases,
+        mix=parse_mix(args.mix),
+        threads=args.threads,
+        duration_s=args.duration,
+        export_collection=args.export_collection,
+    ).run()
+    print(report.format())
+
+
+def _check_edges(args: argparse.Namespace) -> None:
+    import sys  # noqa PLC0415
+
+    from gnr.config import Settings  # noqa PLC0415
+    from gnr.db.integrity import inconsistent_edges  # noqa PLC0415
+    from gnr.db.session import make_engine, make_sessionmaker  # noqa PLC0415
+
+    with make_sessionmaker(make_engine(Settings()))() as session:
+        rows = inconsistent_edges(session, limit=args.limit)
+    for row in rows:
+        print(
+            f"{row.id}: from {row.from_g_node_alias} (GNode: {row.from_current_alias}), "
+            f"to {row.to_g_node_alias} (GNode: {row.to_current_alias})"
+        )
+    print(f"{len(rows)} inconsistent edge(s){' (limit reached)' if len(rows) == args.limit else ''}")
+    if rows:
+        sys.exit(1)
+
+
+def _ingest(args: argparse.Namespace) -> None:
+    import json  # noqa PLC0415
+
+    from gnr.config import Settings  # noqa PLC0415
+    from gnr.db.session import make_engine, make_sessionmaker  # noqa PLC0415
+    from gnr.ingest.dedup import DedupPolicy, PointDeduplicator  # noqa PLC0415
+    from gnr.sema.codec import default_codec  # noqa PLC0415
+    from gnr.synth.output import write_db  # noqa PLC0415
+
+    settings = Settings()
+    sessionmaker = make_sessionmaker(make_engine(settings))
+    policy = args.dedup or settings.dedup_policy
+
+    def messages():  # noqa: ANN202
+        with open(args.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield default_codec.from_dict(json.loads(line))
+
+    gts = messages()
+    deduper = None
+    if policy != "off":
+        deduper = PointDeduplicator(
+            args.tolerance if args.tolerance is not None else settings.dedup_tolerance_micro_deg,
+            DedupPolicy(policy),
+        )
+        with sessionmaker() as session:
+            deduper.load(session)
+        gts = deduper.filter(gts)
+    count = write_db(gts, sessionmaker)
+    print(f"{count} rows written")
+    if deduper is not None:
+        stats = deduper.stats
+        print(
+            f"{stats.points} position points: {stats.reused} reused, "
+            f"{stats.flagged} flagged; {stats.rewritten_g_nodes} GNodes repointed"
+        )
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                for new_id, existing_id in stats.duplicates:
+                    f.write(f"{new_id},{existing_id}\n")
+
+
+def _compact_points(args: argparse.Namespace) -> None:
+    from gnr.config import Settings  # noqa PLC0415
+    from gnr.db.session import make_engine  # noqa PLC0415
+    from gnr.ingest.dedup import compact_position_points  # noqa PLC0415
+
+    settings = Settings()
+    stats = compact_position_points(
+        make_engine(settings),
+        args.tolerance if args.tolerance is not None else settings.dedup_tolerance_micro_deg,
+        dry_run=args.dry_run,
+    )
+    verb = "would merge" if args.dry_run else "merged"
+    print(
+        f"{stats.points} position points, {verb} {stats.merged}; "
+        f"{stats.rewritten_g_nodes} GNodes repointed"
+    )
@@ -11,6 +11,25 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     log_dir: str = "~/.local/state/gridworks/gnr/log"
     db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # Group commit for API creates: rows per batch, max wait per row
+    write_batch_max_size: int = 256
+    write_batch_max_latency_ms: float = 5.0
+    # Admission control: bulk lane share of the pool, max queue wait
+    admission_bulk_share: float = 0.25
+    admission_wait_budget_ms: float = 250.0
+    # Alias/id resolution cache
+    resolver_max_entries: int = 100_000
+    resolver_ttl_s: float = 300.0
+    # PositionPoint dedup: max lat/lon difference, and reuse or flag
+    dedup_tolerance_micro_deg: int = 10
+    dedup_policy: str = "reuse"
+    trace_enabled: bool = False
+    trace_sample_rate: float = 1.0
+    # OTLP/JSON lines are appended here; stderr if unset
+    trace_file: Optional[str] = None
 
     model_config = ConfigDict(
         env_prefix="gnr_",
@@ -0,0 +1,298 @@
+"""
+Write coalescing (group commit) for high-rate creates.
+
+Onboarding scripts create GNodes, PositionPoints and ConnectivityEdges
+many at a time. Committing each one separately costs a transaction and
+an fsync per row. WriteBatcher gathers concurrent submissions for up to
+`max_latency_ms` (or until `max_batch_size` are waiting) and writes them
+in one transaction:
+
+  - the registry invariants are checked once per batch: one query loads
+    every GNode and PositionPoint the batch refers to
+  - each row is inserted under its own SAVEPOINT, so a bad row fails only
+    its own caller
+  - a single COMMIT covers the whole batch; if a constraint deferred to
+    commit fails, the batch is retried with per-row checks
+
+`submit` returns a Future that resolves to the stored GT, or to the
+error for that row, once its batch has committed.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from gnr.db.integrity import check_constraints_immediately
+from gnr.db.models import GNodeSql, PositionPointSql, sql_class_for
+from gnr.db.session import current_endpoint
+from gnr.metrics import REGISTRY
+from gnr.tracing import span
+
+if TYPE_CHECKING:
+    from gnr.config import Settings
+    from gnr.db.resolver import AliasResolver
+    from gnr.sema.types import ConnectivityEdgeGt, GNodeGt, PositionPointGt
+
+    Gt = GNodeGt | PositionPointGt | ConnectivityEdgeGt
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = REGISTRY.histogram(
+    "gnr_db_write_batch_size",
+    "Rows per group-committed write batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+WRITE_SECONDS = REGISTRY.histogram(
+    "gnr_db_write_seconds",
+    "Time from submit to commit for a batched write",
+)
+
+
+class WriteRejected(ValueError):
+    """A row breaks a registry invariant that only the database can check."""
+
+
+class BatcherStopped(RuntimeError):
+    """The WriteBatcher is not running (e.g. the server is shutting down)."""
+
+
+@dataclass(slots=True)
+class _Write:
+    gt: Gt
+    future: Future = field(default_factory=Future)
+    submitted: float = field(default_factory=time.perf_counter)
+    # The submitting request's endpoint, for SQL statement metrics
+    endpoint: str = field(default_factory=current_endpoint.get)
+
+
+_STOP = object()
+
+
+class WriteBatcher:
+    # One worker thread, holding one pooled connection per batch
+    pooled_connections = 1
+
+    def __init__(
+        self,
+        sessionmaker: sessionmaker[Session],
+        max_batch_size: int = 256,
+        max_latency_ms: float = 5.0,
+        resolver: AliasResolver | None = None,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.resolver = resolver
+        self.max_batch_size = max_batch_size
+        self.max_latency_s = max_latency_ms / 1000
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._accepting = False
+
+    @classmethod
+    def from_settings(
+        cls,
+        sessionmaker: sessionmaker[Session],
+        settings: Settings,
+        resolver: AliasResolver | None = None,
+    ) -> WriteBatcher:
+        return cls(
+            sessionmaker,
+            max_batch_size=settings.write_batch_max_size,
+            max_latency_ms=settings.write_batch_max_latency_ms,
+            resolver=resolver,
+        )
+
+    # -------------------
+    #  Background control
+    # -------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="write-batcher", daemon=True)
+        self._thread.start()
+        self._accepting = True
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Write everything already submitted, then stop. Writes that race
+        with stopping and land behind it are failed with BatcherStopped
+        rather than left waiting.
+        """
+        if self._thread is None:
+            return
+        self._accepting = False
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and not item.future.done():
+                item.future.set_exception(BatcherStopped("WriteBatcher stopped"))
+
+    # -------------------
+    #  Submitting
+    # -------------------
+
+    def submit(self, gt: Gt) -> Future:
+        """
+        Queue a create; the Future resolves to `gt` once committed.
+        Raises BatcherStopped if the batcher is not running.
+        """
+        if not self._accepting:
+            raise BatcherStopped("WriteBatcher is not running")
+        write = _Write(gt)
+        self._queue.put(write)
+        return write.future
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = first.submitted + self.max_latency_s
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write_batch(batch)
+
+    # -------------------
+    #  Writing
+    # -------------------
+
+    def _write_batch(self, batch: list[_Write]) -> None:
+        BATCH_SIZE.observe(len(batch))
+        try:
+            try:
+                written = self._write(batch)
+            except IntegrityError:
+                # A constraint deferred to commit (edge aliases) failed.
+                # Retry with per-row checks so only offending rows fail.
+                pending = [w for w in batch if not w.future.done()]
+                written = self._write(pending, immediate=True)
+        except Exception as e:  # noqa: BLE001
+            logger.exception("Write batch of %d rows failed", len(batch))
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_exception(e)
+            return
+        now = time.perf_counter()
+        for write in written:
+            WRITE_SECONDS.observe(now - write.submitted)
+            write.future.set_result(write.gt)
+
+    def _write(self, batch: list[_Write], immediate: bool = False) -> list[_Write]:
+        """
+        Insert each row under its own savepoint and commit once. Rows
+        that fail get their Future's exception; the rest are returned.
+
+        Each row's statements count against its own request's endpoint;
+        the ones the batch shares (reference loads, COMMIT) against the
+        endpoint whose write opened the batch.
+        """
+        written: list[_Write] = []
+        batch_token = current_endpoint.set(batch[0].endpoint)
+        try:
+            with span("db.write_batch", rows=len(batch)), self.sessionmaker() as session:
+                if immediate:
+                    check_constraints_immediately(session)
+                nodes, points = self._load_references(session, batch)
+                for write in batch:
+                    row_token = current_endpoint.set(write.endpoint)
+                    try:
+                        self._check(write.gt, nodes, points)
+                        with session.begin_nested():
+                            session.add(sql_class_for(write.gt).from_gt(write.gt))
+                    except (ValueError, SQLAlchemyError) as e:
+                        write.future.set_exception(e)
+                        continue
+                    finally:
+                        current_endpoint.reset(row_token)
+                    self._remember(write.gt, nodes, points)
+                    written.append(write)
+                session.commit()
+        finally:
+            current_endpoint.reset(batch_token)
+        return written
+
+    def _load_references(
+        self, session: Session, batch: list[_Write]
+    ) -> tuple[dict[str, str], set[str]]:
+        """
+        GNode id -> alias and the PositionPoint ids the batch refers to
+        that already exist, each fetched with a single query (GNodes
+        through the resolver cache when there is one).
+        """
+        node_ids: set[str] = set()
+        point_ids: set[str] = set()
+        for write in batch:
+            gt = write.gt
+            if gt.type_name == "connectivity.edge.gt":
+                node_ids.update((gt.from_g_node_id, gt.to_g_node_id))
+            elif gt.type_name == "g.node.gt" and gt.position_point_id is not None:
+                point_ids.add(gt.position_point_id)
+        nodes: dict[str, str] = {}
+        if node_ids and self.resolver is not None:
+            resolved = self.resolver.by_ids(node_ids, session)
+            nodes = {g_node_id: r.alias for g_node_id, r in resolved.items()}
+        elif node_ids:
+            rows = session.execute(
+                select(GNodeSql.id, GNodeSql.alias).where(GNodeSql.id.in_(node_ids))
+            )
+            nodes = {row.id: row.alias for row in rows}
+        points: set[str] = set()
+        if point_ids:
+            points = set(
+                session.scalars(
+                    select(PositionPointSql.id).where(PositionPointSql.id.in_(point_ids))
+                )
+            )
+        return nodes, points
+
+    @staticmethod
+    def _check(gt: Gt, nodes: dict[str, str], points: set[str]) -> None:
+        if gt.type_name == "g.node.gt":
+            if gt.position_point_id is not None and gt.position_point_id not in points:
+                raise WriteRejected(
+                    f"GNode {gt.alias}: PositionPoint {gt.position_point_id} does not exist"
+                )
+        elif gt.type_name == "connectivity.edge.gt":
+            for end, g_node_id, alias in (
+                ("from", gt.from_g_node_id, gt.from_g_node_alias),
+                ("to", gt.to_g_node_id, gt.to_g_node_alias),
+            ):
+                if g_node_id not in nodes:
+                    raise WriteRejected(f"Edge {gt.id}: {end} GNode {g_node_id} does not exist")
+                if nodes[g_node_id] != alias:
+                    raise WriteRejected(
+                        f"Edge {gt.id}: {end} alias {alias} does not match GNode "
+                        f"{g_node_id} (alias {nodes[g_node_id]})"
+                    )
+
+    @staticmethod
+    def _remember(gt: Gt, nodes: dict[str, str], points: set[str]) -> None:
+        """Make rows written earlier in the batch visible to later checks."""
+        if gt.type_name == "g.node.gt":
+            nodes[gt.g_node_id] = gt.alias
+        elif gt.type_name == "position.point.gt":
+            points.add(gt.id)
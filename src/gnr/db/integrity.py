@@ -0,0 +1,57 @@
+"""
+Registry invariants that span tables.
+
+On Postgres, ConnectivityEdge aliases are kept consistent with their
+GNodes by composite foreign keys on (id, alias) that are checked at
+commit (DEFERRABLE INITIALLY DEFERRED) and follow renames (ON UPDATE
+CASCADE). The helpers here cover the rest: finding inconsistent edges
+in one set-based query (after a bulk load, or on SQLite where foreign
+keys are usually not enforced), and switching a transaction to
+per-statement checks when the offending rows of a failed batch have
+to be found.
+"""
+
+from sqlalchemy import Row, or_, select, text
+from sqlalchemy.orm import Session, aliased
+
+from gnr.db.models import ConnectivityEdgeSql, GNodeSql
+
+
+def inconsistent_edges(session: Session, limit: int | None = None) -> list[Row]:
+    """
+    Edges whose endpoint is missing or whose stored alias differs from
+    the GNode's current alias: (id, from/to ids, stored and current
+    aliases), one query.
+    """
+    edge = ConnectivityEdgeSql
+    from_node = aliased(GNodeSql)
+    to_node = aliased(GNodeSql)
+    query = (
+        select(
+            edge.id,
+            edge.from_g_node_id,
+            edge.from_g_node_alias,
+            from_node.alias.label("from_current_alias"),
+            edge.to_g_node_id,
+            edge.to_g_node_alias,
+            to_node.alias.label("to_current_alias"),
+        )
+        .outerjoin(from_node, from_node.id == edge.from_g_node_id)
+        .outerjoin(to_node, to_node.id == edge.to_g_node_id)
+        .where(
+            or_(
+                from_node.alias.is_(None),
+                to_node.alias.is_(None),
+                from_node.alias != edge.from_g_node_alias,
+                to_node.alias != edge.to_g_node_alias,
+            )
+        )
+        .limit(limit)
+    )
+    return list(session.execute(query))
+
+
+def check_constraints_immediately(session: Session) -> None:
+    """Check deferred constraints per statement for the rest of this transaction."""
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("SET CONSTRAINTS ALL IMMEDIATE"))
@@ -3,19 +3,24 @@ SQLAlchemy models for the GridNodeRegistry.
 
 Each SQL row corresponds to a serialized Sema GT snapshot.
 Sema types are used for validation (via the codec) before any insert/update.
+
+Ids are stored as native UUIDs but mapped as canonical strings
+(`Uuid(as_uuid=False)`), so rows convert to and from `UUID4Str` fields
+without changing the Sema wire format.
 """
 
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import (
     String,
-    Enum,
     DateTime,
     ForeignKey,
+    ForeignKeyConstraint,
     UniqueConstraint,
+    Uuid,
 )
 from sqlalchemy.orm import (
     Mapped,
@@ -24,12 +29,16 @@ from sqlalchemy.orm import (
     declarative_base,
 )
 
+from gnr.db.types import SymbolEnum
 from gnr.sema.enums import GNodeStatus, BaseGNodeClass
-from gnr.sema.types import (
-    GNodeGt,
-    ConnectivityEdgeGt,
-    PositionPointGt,
-)
+
+if TYPE_CHECKING:
+    # Imported where used, so loading the models does not load pydantic
+    from gnr.sema.types import (
+        GNodeGt,
+        ConnectivityEdgeGt,
+        PositionPointGt,
+    )
 
 Base = declarative_base()
 
@@ -41,7 +50,7 @@ Base = declarative_base()
 class PositionPointSql(Base):
     __tablename__ = "position_points"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
+    id: Mapped[str] = mapped_column(Uuid(as_uuid=False), primary_key=True)
     latitude_micro_deg: Mapped[int] = mapped_column()
     longitude_micro_deg: Mapped[int] = mapped_column()
 
@@ -51,6 +60,8 @@ class PositionPointSql(Base):
 
     def to_gt(self) -> PositionPointGt:
         """Serialize database row → Sema GT."""
+        from gnr.sema.types import PositionPointGt  # noqa PLC0415
+
         return PositionPointGt(
             id=self.id,
             latitude_micro_deg=self.latitude_micro_deg,
@@ -74,22 +85,23 @@ class PositionPointSql(Base):
 class GNodeSql(Base):
     __tablename__ = "g_nodes"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
+    id: Mapped[str] = mapped_column(Uuid(as_uuid=False), primary_key=True)
     alias: Mapped[str] = mapped_column(String, index=True, unique=True)
     prev_alias: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
+    # Enums are stored as their Sema symbols (smallint)
     base_class: Mapped[BaseGNodeClass] = mapped_column(
-        Enum(BaseGNodeClass, name="base_g_node_class")
+        SymbolEnum(BaseGNodeClass), index=True
     )
 
-    g_node_class: Mapped[str] = mapped_column(String)
+    # Free-form in Sema (Logical GNodes name their own classes), so text
+    g_node_class: Mapped[str] = mapped_column(String, index=True)
 
-    status: Mapped[GNodeStatus] = mapped_column(
-        Enum(GNodeStatus, name="g_node_status")
-    )
+    status: Mapped[GNodeStatus] = mapped_column(SymbolEnum(GNodeStatus), index=True)
 
+    # Indexed so repointing or deleting position points never scans g_nodes
     position_point_id: Mapped[Optional[str]] = mapped_column(
-        ForeignKey("position_points.id"), nullable=True
+        Uuid(as_uuid=False), ForeignKey("position_points.id"), nullable=True, index=True
     )
     position_point: Mapped[Optional[PositionPointSql]] = relationship()
 
@@ -99,12 +111,19 @@ class GNodeSql(Base):
         DateTime(timezone=True), default=datetime.utcnow
     )
 
+    __table_args__ = (
+        # Target of the edges' (id, alias) foreign keys
+        UniqueConstraint("id", "alias", name="uq_g_nodes_id_alias"),
+    )
+
     # -------------------
     #  Sema ↔ SQL Helpers
     # -------------------
 
     def to_gt(self) -> GNodeGt:
         """Serialize SQL row → Sema GT."""
+        from gnr.sema.types import GNodeGt  # noqa PLC0415
+
         return GNodeGt(
             g_node_id=self.id,
             alias=self.alias,
@@ -138,21 +157,24 @@ class GNodeSql(Base):
 class ConnectivityEdgeSql(Base):
     __tablename__ = "connectivity_edges"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
+    id: Mapped[str] = mapped_column(Uuid(as_uuid=False), primary_key=True)
 
+    # Deferred like the alias keys below, so edges may precede their GNodes
     from_g_node_id: Mapped[str] = mapped_column(
-        ForeignKey("g_nodes.id"), index=True
+        Uuid(as_uuid=False),
+        ForeignKey("g_nodes.id", deferrable=True, initially="DEFERRED"),
+        index=True,
     )
     to_g_node_id: Mapped[str] = mapped_column(
-        ForeignKey("g_nodes.id"), index=True
+        Uuid(as_uuid=False),
+        ForeignKey("g_nodes.id", deferrable=True, initially="DEFERRED"),
+        index=True,
     )
 
     from_g_node_alias: Mapped[str] = mapped_column(String, index=True)
     to_g_node_alias: Mapped[str] = mapped_column(String, index=True)
 
-    status: Mapped[GNodeStatus] = mapped_column(
-        Enum(GNodeStatus, name="connectivity_edge_status")
-    )
+    status: Mapped[GNodeStatus] = mapped_column(SymbolEnum(GNodeStatus))
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow
@@ -163,6 +185,24 @@ class ConnectivityEdgeSql(Base):
             "from_g_node_id", "to_g_node_id",
             name="uq_connectivity_edges_from_to"
         ),
+        # Aliases must match the GNodes' and follow renames; checked at
+        # commit so a batch can insert nodes and edges in any order
+        ForeignKeyConstraint(
+            ["from_g_node_id", "from_g_node_alias"],
+            ["g_nodes.id", "g_nodes.alias"],
+            name="connectivity_edges_from_g_node_alias_fkey",
+            onupdate="CASCADE",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+        ForeignKeyConstraint(
+            ["to_g_node_id", "to_g_node_alias"],
+            ["g_nodes.id", "g_nodes.alias"],
+            name="connectivity_edges_to_g_node_alias_fkey",
+            onupdate="CASCADE",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
     )
 
     # -------------------
@@ -170,6 +210,8 @@ class ConnectivityEdgeSql(Base):
     # -------------------
 
     def to_gt(self) -> ConnectivityEdgeGt:
+        from gnr.sema.types import ConnectivityEdgeGt  # noqa PLC0415
+
         return ConnectivityEdgeGt(
             id=self.id,
             from_g_node_id=self.from_g_node_id,
@@ -189,3 +231,15 @@ class ConnectivityEdgeSql(Base):
             to_g_node_alias=gt.to_g_node_alias,
             status=gt.status,
         )
+
+
+def sql_class_for(gt: GNodeGt | PositionPointGt | ConnectivityEdgeGt) -> type[Base]:
+    """The SQL model that stores a given Sema GT."""
+    return SQL_CLASS_BY_TYPE_NAME[gt.type_name]
+
+
+SQL_CLASS_BY_TYPE_NAME: dict[str, type[Base]] = {
+    "g.node.gt": GNodeSql,
+    "position.point.gt": PositionPointSql,
+    "connectivity.edge.gt": ConnectivityEdgeSql,
+}
@@ -0,0 +1,359 @@
+"""
+Read-through cache for GNode alias <-> id resolution.
+
+Most requests name GNodes by alias, edges carry both ids and aliases, and
+clients may still hold an alias that has since become some GNode's
+`prev_alias`. AliasResolver answers those lookups from a bounded LRU
+with a TTL, falling back to one `g_nodes` query per miss (or per batch
+of misses). Entries hold the whole row, so a cached GNode is served
+without touching the database.
+
+Entries are invalidated precisely when a GNode is created, changed or
+deleted:
+
+  - `watch(sessionmaker)` records those changes at flush time and drops
+    the affected entries after the transaction commits
+  - on Postgres, the same changes are published with NOTIFY inside the
+    writing transaction (`notify_changes`, which bulk rewrites outside
+    the ORM call too), and `start()` runs a LISTEN thread that drops
+    them in every other worker
+
+A lookup racing a write (row read before the commit, cached after the
+invalidation) would put the old row back, so invalidated keys remember
+the generation they were dropped at and rows loaded before it are
+returned but not cached.
+
+The TTL bounds staleness if a notification is ever missed; the cache is
+cleared whenever the LISTEN connection has to reconnect.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Connection, Engine, event, inspect, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from gnr.db.models import GNodeSql
+from gnr.metrics import REGISTRY
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+
+if TYPE_CHECKING:
+    from gnr.config import Settings
+    from gnr.sema.types import GNodeGt
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "gnr_g_node_changes"
+_CHANGES_KEY = "gnr_g_node_changes"
+# Every column ResolvedGNode caches
+_WATCHED_ATTRIBUTES = (
+    "alias",
+    "prev_alias",
+    "status",
+    "base_class",
+    "g_node_class",
+    "position_point_id",
+    "display_name",
+)
+
+RESOLVER_LOOKUPS = REGISTRY.counter(
+    "gnr_resolver_lookups_total",
+    "Alias/id resolutions, by kind and result (hit or miss)",
+    ("kind", "result"),
+)
+RESOLVER_EVICTIONS = REGISTRY.counter(
+    "gnr_resolver_evictions_total",
+    "Resolution cache entries removed, by reason (capacity, expired, invalidated)",
+    ("reason",),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedGNode:
+    g_node_id: str
+    alias: str
+    prev_alias: str | None
+    status: GNodeStatus
+    base_class: BaseGNodeClass
+    g_node_class: str
+    position_point_id: str | None
+    display_name: str | None
+
+    def to_gt(self) -> GNodeGt:
+        from gnr.sema.types import GNodeGt  # noqa PLC0415
+
+        return GNodeGt(
+            g_node_id=self.g_node_id,
+            alias=self.alias,
+            base_class=self.base_class,
+            g_node_class=self.g_node_class,
+            status=self.status,
+            prev_alias=self.prev_alias,
+            position_point_id=self.position_point_id,
+            display_name=self.display_name,
+        )
+
+
+class AliasResolver:
+    def __init__(
+        self,
+        sessionmaker: sessionmaker[Session],
+        max_entries: int = 100_000,
+        ttl_s: float = 300.0,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        # ("alias" | "id" | "prev", key) -> (ResolvedGNode, expires at)
+        self._entries: OrderedDict[tuple[str, str], tuple[ResolvedGNode, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; key -> generation it was dropped at.
+        # Rows loaded before `_floor` are never cached (the map was pruned).
+        self._generation = 0
+        self._invalidated: dict[tuple[str, str], int] = {}
+        self._floor = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_settings(
+        cls, sessionmaker: sessionmaker[Session], settings: Settings
+    ) -> AliasResolver:
+        return cls(
+            sessionmaker,
+            max_entries=settings.resolver_max_entries,
+            ttl_s=settings.resolver_ttl_s,
+        )
+
+    # -------------------
+    #  Lookups
+    # -------------------
+
+    def by_alias(self, alias: str) -> ResolvedGNode | None:
+        """The GNode currently called `alias`."""
+        return self._resolve("alias", alias, GNodeSql.alias == alias)
+
+    def by_id(self, g_node_id: str) -> ResolvedGNode | None:
+        return self._resolve("id", g_node_id, GNodeSql.id == g_node_id)
+
+    def by_prev_alias(self, prev_alias: str) -> ResolvedGNode | None:
+        """The GNode that was renamed away from `prev_alias`, for redirects."""
+        return self._resolve("prev", prev_alias, GNodeSql.prev_alias == prev_alias)
+
+    def by_ids(
+        self, g_node_ids: Iterable[str], session: Session | None = None
+    ) -> dict[str, ResolvedGNode]:
+        """Resolve many ids, loading all misses with a single query."""
+        found: dict[str, ResolvedGNode] = {}
+        missing = []
+        for g_node_id in set(g_node_ids):
+            cached = self._get(("id", g_node_id))
+            if cached is None:
+                missing.append(g_node_id)
+            else:
+                found[g_node_id] = cached
+        if missing:
+            for resolved in self._load(GNodeSql.id.in_(missing), session):
+                found[resolved.g_node_id] = resolved
+        return found
+
+    def _resolve(self, kind: str, key: str, where: Any) -> ResolvedGNode | None:
+        cached = self._get((kind, key))
+        if cached is not None:
+            return cached
+        loaded = self._load(where)
+        return loaded[0] if loaded else None
+
+    def _load(self, where: Any, session: Session | None = None) -> list[ResolvedGNode]:
+        query = select(
+            GNodeSql.id,
+            GNodeSql.alias,
+            GNodeSql.prev_alias,
+            GNodeSql.status,
+            GNodeSql.base_class,
+            GNodeSql.g_node_class,
+            GNodeSql.position_point_id,
+            GNodeSql.display_name,
+        ).where(where)
+        with self._lock:
+            generation = self._generation
+        if session is None:
+            with self.sessionmaker() as own_session:
+                rows = own_session.execute(query).all()
+        else:
+            rows = session.execute(query).all()
+        resolved = [ResolvedGNode(*row) for row in rows]
+        for r in resolved:
+            self._put(r, generation)
+        return resolved
+
+    # -------------------
+    #  LRU / TTL
+    # -------------------
+
+    def _get(self, key: tuple[str, str]) -> ResolvedGNode | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                del self._entries[key]
+                RESOLVER_EVICTIONS.inc("expired")
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        RESOLVER_LOOKUPS.inc(key[0], "miss" if entry is None else "hit")
+        return entry[0] if entry else None
+
+    def _put(self, resolved: ResolvedGNode, generation: int) -> None:
+        """Cache a row loaded at `generation`, unless invalidated since."""
+        expires = time.monotonic() + self.ttl_s
+        keys = [("alias", resolved.alias), ("id", resolved.g_node_id)]
+        if resolved.prev_alias is not None:
+            keys.append(("prev", resolved.prev_alias))
+        with self._lock:
+            if generation < self._floor or any(
+                self._invalidated.get(key, -1) >= generation for key in keys
+            ):
+                return
+            for key in keys:
+                self._entries[key] = (resolved, expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                RESOLVER_EVICTIONS.inc("capacity")
+
+    def invalidate(self, g_node_id: str, aliases: Iterable[str] = ()) -> None:
+        """Drop every entry for this GNode, and for any of `aliases`."""
+        with self._lock:
+            keys = [("id", g_node_id)]
+            cached = self._entries.get(("id", g_node_id))
+            names = set(aliases)
+            if cached is not None:
+                names.update(a for a in (cached[0].alias, cached[0].prev_alias) if a)
+            for name in names:
+                keys.extend((("alias", name), ("prev", name)))
+            if len(self._invalidated) + len(keys) > self.max_entries:
+                self._invalidated.clear()
+                self._floor = self._generation + 1
+            for key in keys:
+                self._invalidated[key] = self._generation
+                if self._entries.pop(key, None) is not None:
+                    RESOLVER_EVICTIONS.inc("invalidated")
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+            self._generation += 1
+            self._floor = self._generation
+
+    # -------------------
+    #  Invalidation on writes
+    # -------------------
+
+    def watch(self, sessionmaker: sessionmaker[Session]) -> None:
+        """Invalidate on commits made through sessions from `sessionmaker`."""
+        event.listen(sessionmaker, "after_flush", self._record_changes)
+        event.listen(sessionmaker, "after_commit", self._apply_changes)
+        event.listen(sessionmaker, "after_rollback", self._discard_changes)
+
+    def _record_changes(self, session: Session, flush_context: Any) -> None:  # noqa: ARG002
+        changes: dict[str, set[str]] = {}
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if not isinstance(obj, GNodeSql):
+                continue
+            state = inspect(obj)
+            if obj in session.dirty and not any(
+                state.attrs[name].history.has_changes() for name in _WATCHED_ATTRIBUTES
+            ):
+                continue
+            aliases = changes.setdefault(obj.id, set())
+            for name in ("alias", "prev_alias"):
+                history = state.attrs[name].history
+                aliases.update(
+                    a for a in (*history.added, *history.unchanged, *history.deleted) if a
+                )
+        if not changes:
+            return
+        session.info.setdefault(_CHANGES_KEY, {}).update(changes)
+        notify_changes(session.connection(), changes)
+
+    def _apply_changes(self, session: Session) -> None:
+        for g_node_id, aliases in session.info.pop(_CHANGES_KEY, {}).items():
+            self.invalidate(g_node_id, aliases)
+
+    def _discard_changes(self, session: Session) -> None:
+        session.info.pop(_CHANGES_KEY, None)
+
+    # -------------------
+    #  Cross-worker invalidation (Postgres LISTEN)
+    # -------------------
+
+    def start(self, engine: Engine) -> None:
+        """Listen for other workers' changes; a no-op off Postgres."""
+        if engine.dialect.name != "postgresql":
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        conninfo = engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen, args=(conninfo,), name="resolver-listen", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _listen(self, conninfo: str) -> None:
+        import psycopg  # noqa PLC0415
+
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    # Anything changed while we were not listening
+                    self.clear()
+                    backoff = 1.0
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            change = json.loads(notify.payload)
+                            self.invalidate(change["id"], change["aliases"])
+            except (psycopg.Error, ValueError, KeyError) as e:
+                logger.warning("Resolver LISTEN connection lost (%s); retrying", e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+def notify_changes(conn: Connection, changes: dict[str, set[str]]) -> None:
+    """
+    Publish changed GNodes (id -> aliases) to every worker's resolver; a
+    no-op off Postgres. Delivered only if `conn`'s transaction commits.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    for g_node_id, aliases in changes.items():
+        conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": _payload(g_node_id, aliases)},
+        )
+
+
+def _payload(g_node_id: str, aliases: Iterable[str]) -> str:
+    return json.dumps({"id": g_node_id, "aliases": sorted(aliases)}, separators=(",", ":"))
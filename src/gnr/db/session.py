@@ -0,0 +1,116 @@
+"""
+Engine and session construction for the GridNodeRegistry.
+
+Engines built here are instrumented: every SQL statement is counted
+against the API endpoint that issued it, and time spent waiting for a
+pooled connection is recorded. Sessions open tracing spans around
+flushes and commits.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from gnr.config import Settings
+from gnr.metrics import REGISTRY
+from gnr.tracing import Span, span
+
+# Set per request by the API; "none" for work outside a request
+current_endpoint: ContextVar[str] = ContextVar("gnr_endpoint", default="none")
+
+SQL_STATEMENTS = REGISTRY.counter(
+    "gnr_db_statements_total",
+    "SQL statements executed, by API endpoint",
+    ("endpoint",),
+)
+POOL_WAIT_SECONDS = REGISTRY.histogram(
+    "gnr_db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits."""
+
+    def _do_get(self):  # noqa: ANN202
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+
+def make_engine(settings: Settings) -> Engine:
+    url = make_url(settings.db_url.get_secret_value())
+    kwargs = {}
+    if url.get_backend_name() == "postgresql":
+        kwargs = dict(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    engine = create_engine(url, echo=settings.db_echo, **kwargs)
+    event.listen(engine, "before_cursor_execute", _count_statement)
+    return engine
+
+
+def make_sessionmaker(engine: Engine) -> sessionmaker[Session]:
+    factory = sessionmaker(engine, expire_on_commit=False)
+    event.listen(factory, "before_flush", _open_span("db.flush"))
+    event.listen(factory, "after_flush_postexec", _close_span("db.flush"))
+    event.listen(factory, "before_commit", _open_commit_span)
+    event.listen(factory, "after_commit", _close_span("db.commit"))
+    # A flush or commit that fails never reaches its closing event above
+    event.listen(factory, "after_rollback", _close_failed_spans)
+    event.listen(factory, "after_transaction_end", _close_failed_spans)
+    return factory
+
+
+def _open_span(name: str):  # noqa: ANN202
+    def listener(session: Session, *args) -> None:  # noqa: ANN002
+        s = span(name)
+        s.__enter__()
+        session.info[name] = s
+
+    return listener
+
+
+def _open_commit_span(session: Session) -> None:
+    # before_commit also fires when a SAVEPOINT is released
+    if not session.in_nested_transaction():
+        _open_span("db.commit")(session)
+
+
+def _close_span(name: str, error: str | None = None):  # noqa: ANN202
+    def listener(session: Session, *args) -> None:  # noqa: ANN002
+        s = session.info.pop(name, None)
+        if s is not None:
+            # No-op spans (tracing off, or unsampled) carry no error
+            if error is not None and isinstance(s, Span):
+                s.error = error
+            s.__exit__(None, None, None)
+
+    return listener
+
+
+def _close_failed_spans(session: Session, transaction: SessionTransaction | None = None) -> None:
+    """
+    Close spans left open by a failure, marked as errors. A flush runs
+    in its own subtransaction, so it is closed when that ends; the commit
+    span only when the outermost transaction does (or on rollback).
+    """
+    # Innermost first: spans restore the current-span context on close
+    _close_span("db.flush", "rolled back")(session)
+    if transaction is None or transaction.parent is None:
+        _close_span("db.commit", "rolled back")(session)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ARG001
+    SQL_STATEMENTS.inc(current_endpoint.get())
@@ -0,0 +1,58 @@
+"""
+Custom SQLAlchemy column types for the GridNodeRegistry.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+from gnr.sema.enums.gw_str_enum import SymbolizedEnum
+
+
+class SymbolEnum(TypeDecorator):
+    """
+    Stores a SymbolizedEnum as its symbol in a smallint column.
+
+    Both directions are strict: values outside the enum raise rather than
+    falling back to the enum default, and so do stored codes the enum
+    does not know (e.g. written by a newer release), so nothing is
+    silently rewritten. Rows load back as enum members (which are also
+    `str`).
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls: type[SymbolizedEnum]) -> None:
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._codes = {m.value: int(m.symbol) for m in enum_cls}
+        self._members = {code: enum_cls(value) for value, code in self._codes.items()}
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> int | None:
+        if value is None:
+            return None
+        code = self._codes.get(value)
+        if code is None:
+            raise ValueError(
+                f"'{value}' is not a valid {self.enum_cls.__name__} "
+                f"(expected one of {self.enum_cls.values()})"
+            )
+        return code
+
+    def process_result_value(
+        self, value: int | None, dialect: Dialect
+    ) -> SymbolizedEnum | None:
+        if value is None:
+            return None
+        member = self._members.get(value)
+        if member is None:
+            raise ValueError(
+                f"Stored code {value} is not a valid {self.enum_cls.__name__} "
+                f"(known codes: {sorted(self._members)})"
+            )
+        return member
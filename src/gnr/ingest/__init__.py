@@ -0,0 +1,3 @@
+"""
+Bulk ingest helpers for the Grid Node Registry.
+"""
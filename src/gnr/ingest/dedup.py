@@ -0,0 +1,242 @@
+"""
+Spatial deduplication of PositionPoints.
+
+Physical GNodes at one site tend to arrive with their own PositionPoint
+at identical or nearly identical coordinates. Points are matched on a
+grid hash over the integer micro-degree coordinates: the grid cell is
+the tolerance, so any point within tolerance of a new one lies in the
+3 x 3 cells around it. Each lookup costs a handful of dict probes,
+never a scan over all points.
+
+Two points are duplicates when both their latitudes and their
+longitudes differ by at most `tolerance_micro_deg` (10 micro-degrees
+is about 1 m north-south).
+
+  - At ingest, PointDeduplicator either reuses the existing point's id
+    (the new point is dropped, and GNodes that referenced it are
+    rewritten) or only flags the duplicate.
+  - Offline, compact_position_points merges the duplicates already
+    stored: the oldest point of each cluster is kept, g_nodes are
+    repointed in bulk, and the rest are deleted.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from sqlalchemy import Column, Engine, MetaData, Table, Uuid, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from gnr.db.models import GNodeSql, PositionPointSql
+from gnr.db.resolver import notify_changes
+from gnr.sema.base import SemaType
+
+logger = logging.getLogger(__name__)
+
+COMPACTION_BATCH_SIZE = 10_000
+
+
+class DedupPolicy(StrEnum):
+    Reuse = "reuse"
+    Flag = "flag"
+
+
+class SpatialIndex:
+    """Point ids on a uniform grid over micro-degree coordinates."""
+
+    def __init__(self, tolerance_micro_deg: int) -> None:
+        if tolerance_micro_deg < 0:
+            raise ValueError("tolerance_micro_deg must be >= 0")
+        self.tolerance = tolerance_micro_deg
+        self._cell = max(tolerance_micro_deg, 1)
+        self._cells: dict[tuple[int, int], list[tuple[str, int, int]]] = defaultdict(list)
+        self.size = 0
+
+    def add(self, point_id: str, latitude: int, longitude: int) -> None:
+        self._cells[self._key(latitude, longitude)].append((point_id, latitude, longitude))
+        self.size += 1
+
+    def nearest(self, latitude: int, longitude: int) -> str | None:
+        """Id of the closest indexed point within tolerance, if any."""
+        lat_cell, lon_cell = self._key(latitude, longitude)
+        best, best_distance = None, self.tolerance + 1
+        for d_lat in (-1, 0, 1):
+            for d_lon in (-1, 0, 1):
+                for point_id, lat, lon in self._cells.get((lat_cell + d_lat, lon_cell + d_lon), ()):
+                    distance = max(abs(lat - latitude), abs(lon - longitude))
+                    if distance < best_distance:
+                        best, best_distance = point_id, distance
+        return best
+
+    def _key(self, latitude: int, longitude: int) -> tuple[int, int]:
+        return latitude // self._cell, longitude // self._cell
+
+
+@dataclass
+class DedupStats:
+    points: int = 0
+    reused: int = 0
+    flagged: int = 0
+    rewritten_g_nodes: int = 0
+    # (new point id, existing point id) for every duplicate found
+    duplicates: list[tuple[str, str]] = field(default_factory=list)
+
+
+class PointDeduplicator:
+    """
+    Ingest-time dedup for a stream of Sema messages in dependency order
+    (each PositionPoint before the GNodes that reference it).
+    """
+
+    def __init__(
+        self,
+        tolerance_micro_deg: int,
+        policy: DedupPolicy = DedupPolicy.Reuse,
+    ) -> None:
+        self.index = SpatialIndex(tolerance_micro_deg)
+        self.policy = policy
+        self.stats = DedupStats()
+        # Dropped point id -> the existing id that replaces it
+        self._replaced: dict[str, str] = {}
+
+    def load(self, session: Session, batch_size: int = COMPACTION_BATCH_SIZE) -> None:
+        """Index the points already in the database."""
+        rows = session.execute(
+            select(
+                PositionPointSql.id,
+                PositionPointSql.latitude_micro_deg,
+                PositionPointSql.longitude_micro_deg,
+            ).execution_options(yield_per=batch_size)
+        )
+        for point_id, lat, lon in rows:
+            self.index.add(point_id, lat, lon)
+
+    def filter(self, gts: Iterable[SemaType]) -> Iterator[SemaType]:
+        """The stream with duplicates dropped (Reuse) or only counted (Flag)."""
+        for gt in gts:
+            if gt.type_name == "position.point.gt":
+                self.stats.points += 1
+                existing = self.index.nearest(gt.latitude_micro_deg, gt.longitude_micro_deg)
+                if existing is None:
+                    self.index.add(gt.id, gt.latitude_micro_deg, gt.longitude_micro_deg)
+                    yield gt
+                    continue
+                self.stats.duplicates.append((gt.id, existing))
+                if self.policy is DedupPolicy.Reuse:
+                    self.stats.reused += 1
+                    self._replaced[gt.id] = existing
+                    continue
+                self.stats.flagged += 1
+                yield gt
+            elif gt.type_name == "g.node.gt" and gt.position_point_id in self._replaced:
+                self.stats.rewritten_g_nodes += 1
+                yield gt.model_copy(
+                    update={"position_point_id": self._replaced[gt.position_point_id]}
+                )
+            else:
+                yield gt
+
+
+# ============================================================================
+# OFFLINE COMPACTION
+# ============================================================================
+
+@dataclass
+class CompactionStats:
+    points: int = 0
+    merged: int = 0
+    rewritten_g_nodes: int = 0
+
+
+def compact_position_points(
+    engine: Engine,
+    tolerance_micro_deg: int,
+    batch_size: int = COMPACTION_BATCH_SIZE,
+    dry_run: bool = False,
+) -> CompactionStats:
+    """
+    Merge stored duplicates into the oldest point of each cluster.
+
+    One streaming pass over position_points finds the merges. They are
+    then applied in batches, each its own transaction: the batch goes
+    into a temporary table, g_nodes are repointed with one set-based
+    UPDATE, and the merged points are deleted. Every committed batch
+    leaves the registry consistent, so an interrupted run can simply be
+    started again.
+
+    Memory is bounded by the table, not the batch size: any later point
+    may match any kept one, so the whole index stays in memory (about
+    0.5 KB per kept point), plus about 150 bytes per duplicate found.
+    Merges are only applied after the pass, so that deletes never race
+    the read cursor. A million distinct points take about 0.5 GB.
+    """
+    stats = CompactionStats()
+    index = SpatialIndex(tolerance_micro_deg)
+    # (dup_id, keep_id)
+    merges: list[tuple[str, str]] = []
+    with engine.connect() as conn:
+        rows = conn.execution_options(yield_per=batch_size).execute(
+            select(
+                PositionPointSql.id,
+                PositionPointSql.latitude_micro_deg,
+                PositionPointSql.longitude_micro_deg,
+            ).order_by(PositionPointSql.created_at, PositionPointSql.id)
+        )
+        for point_id, lat, lon in rows:
+            stats.points += 1
+            keep = index.nearest(lat, lon)
+            if keep is None:
+                index.add(point_id, lat, lon)
+            else:
+                merges.append((point_id, keep))
+    stats.merged = len(merges)
+    logger.info(
+        "Compaction: %d of %d position points are duplicates", stats.merged, stats.points
+    )
+    if dry_run or not merges:
+        return stats
+
+    merge_table = Table(
+        "gnr_position_point_merges",
+        MetaData(),
+        Column("dup_id", Uuid(as_uuid=False), primary_key=True),
+        Column("keep_id", Uuid(as_uuid=False), nullable=False),
+        prefixes=["TEMPORARY"],
+    )
+    # One connection throughout: the temporary table belongs to it
+    with engine.connect() as conn:
+        merge_table.create(conn)
+        conn.commit()
+        for start in range(0, len(merges), batch_size):
+            batch = [
+                {"dup_id": dup_id, "keep_id": keep_id}
+                for dup_id, keep_id in merges[start:start + batch_size]
+            ]
+            with conn.begin():
+                conn.execute(insert(merge_table), batch)
+                g_nodes = GNodeSql.__table__
+                rewritten = conn.execute(
+                    update(g_nodes)
+                    .where(g_nodes.c.position_point_id.in_(select(merge_table.c.dup_id)))
+                    .values(position_point_id=(
+                        select(merge_table.c.keep_id)
+                        .where(merge_table.c.dup_id == g_nodes.c.position_point_id)
+                        .scalar_subquery()
+                    ))
+                    .returning(g_nodes.c.id, g_nodes.c.alias)
+                ).all()
+                stats.rewritten_g_nodes += len(rewritten)
+                # Running API workers drop their cached copies of these GNodes
+                notify_changes(conn, {g_node_id: {alias} for g_node_id, alias in rewritten})
+                conn.execute(
+                    delete(PositionPointSql.__table__)
+                    .where(PositionPointSql.__table__.c.id.in_(select(merge_table.c.dup_id)))
+                )
+                conn.execute(delete(merge_table))
+        merge_table.drop(conn)
+        conn.commit()
+    return stats
@@ -0,0 +1,186 @@
+"""
+Logging setup for the Grid Node Registry.
+
+`configure_logging` routes the `gnr` logger through a queue: callers only
+enqueue records, and a background listener thread does the formatting
+and the file/console I/O. Logs go to `Settings.log_dir` (the GridWorks
+convention is ~/.local/state/gridworks/gnr/log/) at `Settings.log_level`.
+
+`ThrottledLogger` deduplicates hot call sites: the first record for a
+key is logged, repeats within the window are only counted, and the count
+is logged as a summary when the window closes.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from gnr.config import Settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+LOG_FILE_NAME = "gnr.log"
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def configure_logging(settings: "Settings", console: bool = True) -> None:
+    """Install the queue-based handlers on the `gnr` logger (idempotent)."""
+    global _listener  # noqa: PLW0603
+    if _listener is not None:
+        _listener.stop()
+
+    log_dir = os.path.expanduser(settings.log_dir)
+    os.makedirs(log_dir, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: list[logging.Handler] = [
+        logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, LOG_FILE_NAME),
+            maxBytes=50 * 2**20,
+            backupCount=5,
+            encoding="utf-8",
+        )
+    ]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        records, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+    gnr_logger = logging.getLogger("gnr")
+    for handler in list(gnr_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            gnr_logger.removeHandler(handler)
+    gnr_logger.addHandler(logging.handlers.QueueHandler(records))
+    gnr_logger.setLevel(settings.log_level.upper())
+    gnr_logger.propagate = False
+
+
+@atexit.register
+def _stop_listener() -> None:
+    for throttled in list(_throttled_loggers):
+        throttled.flush()
+    if _listener is not None:
+        _listener.stop()
+
+
+@dataclass(slots=True)
+class _Window:
+    started: float
+    suppressed: int = 0
+    # The latest suppressed record, repeated in the summary
+    level: int = logging.NOTSET
+    msg: str = ""
+    args: tuple = ()
+    last: float = 0.0
+
+
+class ThrottledLogger:
+    """
+    Per-key rate limiting for a logger.
+
+        translating = ThrottledLogger(logger)
+        translating.warning((type_name, version), "Translating %s v%s", ...)
+
+    emits at most one record per key per `window_s`. When a window with
+    repeats closes, a summary of the latest one follows, e.g.
+    "Translating g.node.gt v003 to v004 (x48213 more over 59.8s)", with
+    the time from the first record to the last repeat. Summaries are
+    written by a timer, so a burst that just stops is still reported.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        window_s: float = 60.0,
+        max_keys: int = 1024,
+    ) -> None:
+        self.logger = logger
+        self.window_s = window_s
+        self.max_keys = max_keys
+        self._windows: OrderedDict[Hashable, _Window] = OrderedDict()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        _throttled_loggers.add(self)
+
+    def warning(self, key: Hashable, msg: str, *args: Any) -> None:
+        self.log(logging.WARNING, key, msg, *args)
+
+    def info(self, key: Hashable, msg: str, *args: Any) -> None:
+        self.log(logging.INFO, key, msg, *args)
+
+    def log(self, level: int, key: Hashable, msg: str, *args: Any) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is not None and now - window.started < self.window_s:
+                window.suppressed += 1
+                window.level, window.msg, window.args, window.last = level, msg, args, now
+                if self._timer is None:
+                    self._schedule(window.started + self.window_s - now)
+                return
+            closed = [window] if window is not None and window.suppressed else []
+            self._windows[key] = _Window(now)
+            self._windows.move_to_end(key)
+            if len(self._windows) > self.max_keys:
+                _, evicted = self._windows.popitem(last=False)
+                if evicted.suppressed:
+                    closed.append(evicted)
+        self._summarize(closed)
+        self.logger.log(level, msg, *args, stacklevel=3)
+
+    def flush(self, expired_only: bool = False) -> None:
+        """Log summaries for windows with repeats (all, or just the closed ones)."""
+        now = time.monotonic()
+        with self._lock:
+            if self._timer is not None and not expired_only:
+                self._timer.cancel()
+            self._timer = None
+            closed = []
+            next_close = None
+            for key, window in list(self._windows.items()):
+                if not window.suppressed:
+                    continue
+                closes = window.started + self.window_s
+                if expired_only and closes > now:
+                    next_close = min(next_close or closes, closes)
+                    continue
+                closed.append(window)
+                del self._windows[key]
+            if next_close is not None:
+                self._schedule(next_close - now)
+        self._summarize(closed)
+
+    def _schedule(self, delay_s: float) -> None:
+        self._timer = threading.Timer(max(delay_s, 0), self.flush, kwargs={"expired_only": True})
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _summarize(self, windows: list[_Window]) -> None:
+        for w in windows:
+            self.logger.log(
+                w.level,
+                w.msg + " (x%d more over %.1fs)",
+                *w.args,
+                w.suppressed,
+                w.last - w.started,
+            )
+
+
+_throttled_loggers: weakref.WeakSet[ThrottledLogger] = weakref.WeakSet()
@@ -0,0 +1,178 @@
+"""
+Background migration of stored Sema payloads to current versions.
+
+Archives of Sema messages (one JSON object per line) keep whatever
+version they were written in, so every read of a legacy line pays the
+translation cost again. ArchiveMigrator rewrites an archive once:
+
+  - old versions are decoded, translated and re-encoded
+  - everything else (current versions, and newer versions the codec only
+    reads leniently) is copied byte for byte
+  - lines that fail to decode are kept unchanged and counted
+
+Work proceeds in batches with an optional rows-per-second ceiling. After
+each batch the input/output offsets are checkpointed next to the archive,
+so an interrupted run resumes where it stopped. The rewritten archive
+replaces the original atomically once the whole file is done.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from gnr.sema.base import SemaError
+from gnr.sema.codec import DecodePath, SemaCodec
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MigrationCheckpoint:
+    input_offset: int = 0
+    output_offset: int = 0
+    rows: int = 0
+    upgraded: int = 0
+    failed: int = 0
+
+
+class ArchiveMigrator:
+    def __init__(
+        self,
+        codec: SemaCodec,
+        path: str | os.PathLike,
+        batch_size: int = 1_000,
+        max_rows_per_sec: float | None = None,
+    ) -> None:
+        self.codec = codec
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.max_rows_per_sec = max_rows_per_sec
+        self.work_path = self.path.with_name(self.path.name + ".migrating")
+        self.checkpoint_path = self.path.with_name(self.path.name + ".checkpoint")
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Outcome of the background run, for join()
+        self._result: MigrationCheckpoint | None = None
+        self._error: BaseException | None = None
+
+    # -------------------
+    #  Background control
+    # -------------------
+
+    def start(self) -> None:
+        """Run the migration in a daemon thread; `join()` for the outcome."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._result = self._error = None
+        self._thread = threading.Thread(
+            target=self._run_in_background, name=f"migrate:{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> MigrationCheckpoint | None:
+        """Stop after the current batch; progress stays checkpointed."""
+        self._stop.set()
+        return self.join(timeout)
+
+    def join(self, timeout: float | None = None) -> MigrationCheckpoint | None:
+        """
+        Wait for the background run and return its checkpoint (None if
+        still running), re-raising whatever made it fail.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return None
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _run_in_background(self) -> None:
+        try:
+            self._result = self.run()
+        except BaseException as e:  # noqa: BLE001
+            logger.exception("Migration of %s failed", self.path)
+            self._error = e
+
+    # -------------------
+    #  Migration
+    # -------------------
+
+    def run(self) -> MigrationCheckpoint:
+        """
+        Migrate the archive, resuming from any checkpoint.
+
+        Returns the final checkpoint. If stopped early, the archive is
+        left untouched and the next run picks up from the checkpoint.
+        """
+        cp = self._load_checkpoint()
+        with open(self.path, "rb") as src, open(self.work_path, "ab+") as out:
+            src.seek(cp.input_offset)
+            out.truncate(cp.output_offset)
+            out.seek(cp.output_offset)
+            while not self._stop.is_set():
+                started = time.monotonic()
+                lines = []
+                for _ in range(self.batch_size):
+                    line = src.readline()
+                    if not line:
+                        break
+                    lines.append(line)
+                if not lines:
+                    break
+                for line in lines:
+                    out.write(self._migrate_line(line, cp))
+                out.flush()
+                os.fsync(out.fileno())
+                cp.rows += len(lines)
+                cp.input_offset = src.tell()
+                cp.output_offset = out.tell()
+                self._save_checkpoint(cp)
+                self._throttle(len(lines), time.monotonic() - started)
+            finished = not self._stop.is_set()
+
+        if finished:
+            os.replace(self.work_path, self.path)
+            self.checkpoint_path.unlink(missing_ok=True)
+            logger.info(
+                "Migrated %s: %d rows, %d upgraded, %d failed",
+                self.path, cp.rows, cp.upgraded, cp.failed,
+            )
+        return cp
+
+    def _migrate_line(self, line: bytes, cp: MigrationCheckpoint) -> bytes:
+        if not line.strip():
+            return line
+        try:
+            result = self.codec.decode(json.loads(line))
+        except (SemaError, ValueError, AttributeError) as e:
+            cp.failed += 1
+            logger.warning("Keeping undecodable line at row %d: %s", cp.rows, e)
+            return line
+        if result.path is not DecodePath.Translated:
+            return line
+        cp.upgraded += 1
+        return self.codec.to_bytes(result.value) + b"\n"
+
+    def _throttle(self, rows: int, elapsed: float) -> None:
+        if not self.max_rows_per_sec:
+            return
+        delay = rows / self.max_rows_per_sec - elapsed
+        if delay > 0:
+            self._stop.wait(delay)
+
+    def _load_checkpoint(self) -> MigrationCheckpoint:
+        if not self.checkpoint_path.exists():
+            self.work_path.unlink(missing_ok=True)
+            return MigrationCheckpoint()
+        return MigrationCheckpoint(**json.loads(self.checkpoint_path.read_text()))
+
+    def _save_checkpoint(self, cp: MigrationCheckpoint) -> None:
+        tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(cp)))
+        os.replace(tmp, self.checkpoint_path)
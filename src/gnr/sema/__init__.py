@@ -1,6 +1,25 @@
-from gnr.sema.base import SemaType, SemaError, snake_to_pascal
+"""
+Sema types, enums and codec for the Grid Node Registry.
 
-from gnr.sema.codec import SemaCodec, get_current_types
+Submodules are imported on first attribute access, so importing
+`gnr.sema.enums` (for example from the DB layer) does not pull in
+pydantic, the type registry or the codec.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from gnr.sema.base import SemaError, SemaType, snake_to_pascal
+    from gnr.sema.codec import SemaCodec, get_current_types
+
+_LAZY_ATTRIBUTES = {
+    "SemaType": "gnr.sema.base",
+    "SemaError": "gnr.sema.base",
+    "snake_to_pascal": "gnr.sema.base",
+    "SemaCodec": "gnr.sema.codec",
+    "get_current_types": "gnr.sema.codec",
+}
 
 __all__ = [
     "SemaType",
@@ -8,4 +27,13 @@ __all__ = [
     "SemaError",
     "get_current_types",
     "snake_to_pascal",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
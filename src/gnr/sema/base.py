@@ -1,15 +1,23 @@
+import hashlib
 import json
 import re
 from typing import Any, Self, TypeVar
 
 from pydantic import BaseModel, ConfigDict, ValidationError
 
+from gnr.tracing import span
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
 snake_add_underscore_to_camel_pattern = re.compile(r"(?<!^)(?=[A-Z])")
 
+# Instance-level memo keys. These live in the instance __dict__ (not as
+# pydantic private attributes) so that they take no part in equality.
+_ENCODED_BYTES_KEY = "_sema_encoded_bytes"
+_CONTENT_HASH_KEY = "_sema_content_hash"
+
 
 def is_pascal_case(s: str) -> bool:
     return re.match(r"^[A-Z][a-zA-Z0-9]*$", s) is not None
@@ -65,6 +73,8 @@ class SemaType(BaseModel):
       - No additional properties
       - Boundary validation before deserialization
 
+    Because instances are frozen, the canonical JSON encoding and its
+    content hash are computed once and memoized on the instance.
     """
 
     type_name: str
@@ -78,7 +88,29 @@ class SemaType(BaseModel):
     )
 
     def to_bytes(self) -> bytes:
-        return self.model_dump_json(exclude_none=True, by_alias=True).encode()
+        encoded = self.__dict__.get(_ENCODED_BYTES_KEY)
+        if encoded is None:
+            encoded = self.model_dump_json(exclude_none=True, by_alias=True).encode()
+            object.__setattr__(self, _ENCODED_BYTES_KEY, encoded)
+        return encoded
+
+    def content_hash(self) -> str:
+        """Hex SHA-256 of the canonical encoding (see `to_bytes`)."""
+        digest = self.__dict__.get(_CONTENT_HASH_KEY)
+        if digest is None:
+            digest = hashlib.sha256(self.to_bytes()).hexdigest()
+            object.__setattr__(self, _CONTENT_HASH_KEY, digest)
+        return digest
+
+    def model_copy(
+        self, *, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            # Field values changed, so the memoized encoding no longer applies
+            copied.__dict__.pop(_ENCODED_BYTES_KEY, None)
+            copied.__dict__.pop(_CONTENT_HASH_KEY, None)
+        return copied
 
     def to_dict(self) -> dict[str, Any]:
         return self.model_dump(exclude_none=True, by_alias=True)
@@ -92,17 +124,22 @@ class SemaType(BaseModel):
         return cls.from_dict(d)
 
     @classmethod
-    def from_dict(cls, d: dict) -> Self:
-        if not recursively_pascal(d):
-            raise SemaError(
-                f"Dictionary keys must be recursively PascalCase. "
-                f"Found: {d}. Consider checking nested structures."
-            )
-        try:
-            t = cls.model_validate(d)
-        except ValidationError as e:
-            raise SemaError(f"Validation failed for {cls.__name__}: {e}") from e
-        return t
+    def from_dict(cls, d: dict, check_keys: bool = True) -> Self:
+        """
+        Validate a Sema dict. `check_keys=False` skips the PascalCase key
+        check, for dicts whose keys the caller built from field aliases.
+        """
+        with span("sema.from_dict", type=cls.__name__):
+            if check_keys and not recursively_pascal(d):
+                raise SemaError(
+                    f"Dictionary keys must be recursively PascalCase. "
+                    f"Found: {d}. Consider checking nested structures."
+                )
+            try:
+                t = cls.model_validate(d)
+            except ValidationError as e:
+                raise SemaError(f"Validation failed for {cls.__name__}: {e}") from e
+            return t
 
     @classmethod
     def get_schema_info(cls) -> dict[str, Any]:
@@ -137,3 +174,19 @@ class SemaType(BaseModel):
             f"{self.__class__.__name__} does not implement to_latest(). "
             "This method should only be called on old version types."
         )
+
+    def to_next(self) -> "SemaType":
+        """
+        Convert to the next known version of this type.
+
+        Override this in old version classes as an alternative to
+        `to_latest()`: the codec chains `to_next()` hops until it
+        reaches the current version.
+
+        Raises:
+            NotImplementedError: This is not an old version class
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not implement to_next(). "
+            "This method should only be called on old version types."
+        )
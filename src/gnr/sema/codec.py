@@ -1,13 +1,201 @@
+import functools
 import json
 import logging
-from collections import defaultdict
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from gnr.log import ThrottledLogger
+from gnr.metrics import REGISTRY
+from gnr.sema.base import (
+    _ENCODED_BYTES_KEY,
+    SemaError,
+    SemaType,
+    recursively_pascal,
+)
+from gnr.sema.descriptor import (
+    FieldKind,
+    TypeDescriptor,
+    enum_from_code,
+)
+from gnr.sema.migration import MigrationPlan, compile_plan
 
-from pydantic import ValidationError
+logger = logging.getLogger(__name__)
+# Translation and lenient-decode notices repeat per message; log each
+# (type, version) once a minute with a count instead
+throttled_logger = ThrottledLogger(logger)
+
+DECODE_SECONDS = REGISTRY.histogram(
+    "gnr_sema_decode_seconds",
+    "SemaCodec.decode latency by type, incoming version and path taken",
+    ("type_name", "version", "path"),
+)
+DECODE_FAILURES = REGISTRY.counter(
+    "gnr_sema_decode_failures_total",
+    "Messages SemaCodec.decode rejected",
+    ("type_name", "version"),
+)
+AXIOM_FAILURES = REGISTRY.counter(
+    "gnr_sema_axiom_failures_total",
+    "Validation failures by violated axiom ('schema' for non-axiom errors)",
+    ("type_name", "axiom"),
+)
+ENCODE_SECONDS = REGISTRY.histogram(
+    "gnr_sema_encode_seconds",
+    "SemaCodec.to_bytes latency by type and wire format",
+    ("type_name", "format"),
+)
+
+_AXIOM_PATTERN = re.compile(r"Axiom (\d+) violated")
+_VERSION_LABEL_PATTERN = re.compile(r"^\d{3}$")
 
-from gnr.sema.base import SemaError, SemaType, pascal_to_snake, snake_to_pascal
 
-logger = logging.getLogger(__name__)
 
+# ============================================================================
+# WIRE FORMATS
+# ============================================================================
+
+class WireFormat(StrEnum):
+    """
+    Encodings spoken by SemaCodec, named by their content type.
+
+    Json is the canonical Sema form. MsgPack is a compact form for bulk
+    transfers between services: a msgpack array of
+    [TypeName, Version, *field values] in declaration order, with UUIDs
+    as 16 raw bytes, enum members as integer codes, and trailing nulls
+    dropped. Messages come out at roughly half their JSON size (mostly
+    the field names and textual UUIDs), and decode faster since the keys
+    need no checking. Streams are plain concatenations of messages. It
+    requires the optional `msgpack` dependency (`gnr[binary]`).
+    """
+
+    Json = "application/json"
+    MsgPack = "application/vnd.gridworks.sema+msgpack"
+
+    @classmethod
+    def from_content_type(cls, content_type: str | None) -> "WireFormat":
+        """The format of a request body; anything but MsgPack is JSON."""
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        return cls.MsgPack if media_type == cls.MsgPack else cls.Json
+
+    @classmethod
+    def negotiate(cls, accept: str | None) -> "WireFormat":
+        """
+        The format to answer an Accept header with: MsgPack if the client
+        prefers it (by q-value, then order) and msgpack is installed,
+        otherwise JSON.
+        """
+        if not accept or cls.MsgPack not in accept or not _msgpack_installed():
+            return cls.Json
+        best, best_q = cls.Json, 0.0
+        for entry in accept.split(","):
+            media_type, *params = (part.strip() for part in entry.split(";"))
+            q = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            if media_type.lower() == cls.MsgPack and q > best_q:
+                best, best_q = cls.MsgPack, q
+            elif media_type.lower() in (cls.Json, "application/x-ndjson", "*/*") and q > best_q:
+                best, best_q = cls.Json, q
+        return best
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack  # noqa PLC0415
+    except ImportError as e:
+        raise SemaError(
+            "The msgpack wire format requires msgpack. Install gnr[binary]."
+        ) from e
+    return msgpack
+
+
+@functools.cache
+def _msgpack_installed() -> bool:
+    try:
+        _msgpack()
+    except SemaError:
+        return False
+    return True
+
+
+def _uuid_str(value: Any) -> str:
+    """Canonical text form of a 16-byte UUID (as str(uuid.UUID(bytes=...)))."""
+    if not isinstance(value, bytes) or len(value) != 16:
+        raise ValueError(f"Expected a 16-byte UUID, got {value!r}")
+    h = value.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# ============================================================================
+# DECODE RESULTS
+# ============================================================================
+
+class DecodePath(StrEnum):
+    """Which route SemaCodec.decode took for a message."""
+
+    Current = "Current"
+    Translated = "Translated"
+    Lenient = "Lenient"
+
+
+@dataclass(frozen=True, slots=True)
+class DecodeResult:
+    value: SemaType
+    path: DecodePath
+    # Keys dropped by a lenient decode (unknown to the current version)
+    dropped_fields: tuple[str, ...] = ()
+
+
+# ============================================================================
+# ENCODING CACHE
+# ============================================================================
+
+class EncodingCache:
+    """
+    Bounded LRU of canonical encodings, keyed by SemaType value.
+
+    SemaType instances memoize their own encoding, but the same logical
+    value is often rebuilt per request (e.g. `GNodeSql.to_gt()`). Frozen
+    instances hash and compare by field values, so equal instances share
+    one entry here.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[SemaType, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, msg: SemaType) -> bytes | None:
+        with self._lock:
+            encoded = self._entries.get(msg)
+            if encoded is not None:
+                self._entries.move_to_end(msg)
+            return encoded
+
+    def put(self, msg: SemaType, encoded: bytes) -> None:
+        with self._lock:
+            self._entries[msg] = encoded
+            self._entries.move_to_end(msg)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 # ============================================================================
@@ -18,25 +206,92 @@ class SemaCodec:
     """
     Codec for this repository's Sema types.
     Handles version flexibility and naming convention conversion.
+
+    Types are discovered on first use rather than at construction, so
+    creating a codec (and importing this module) stays cheap.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, encode_cache_size: int = 4096) -> None:
         """
-        Initialize the codec with auto-discovered types
+        Args:
+            encode_cache_size: Maximum number of encodings held in the
+                shared LRU. 0 disables it.
         """
-        self.registry = get_current_types()
-        self.old_versions = get_old_versions()
-
+        self.encode_cache = EncodingCache(encode_cache_size)
+        self._plans: dict[tuple[str, str | None], MigrationPlan] = {}
+        self._plans_lock = threading.Lock()
+        # msgpack Packers keep state between calls, so one per thread
+        self._local = threading.local()
+
+    @functools.cached_property
+    def registry(self) -> dict[str, type[SemaType]]:
+        return get_current_types()
+
+    @functools.cached_property
+    def old_versions(self) -> dict[str, dict[str | None, type[SemaType]]]:
+        old_versions = get_old_versions()
         # Validate that all old versions have a current target
-        for type_name in self.old_versions:
+        for type_name in old_versions:
             if type_name not in self.registry:
                 raise ValueError(
                     f"Old versions found for '{type_name}' but no current version exists. "
-                    f"Old versions: {list(self.old_versions[type_name].keys())}"
+                    f"Old versions: {list(old_versions[type_name].keys())}"
                 )
+        return old_versions
+
+    @functools.cached_property
+    def descriptors(self) -> dict[tuple[str, str | None], TypeDescriptor]:
+        """Positional layouts for every (TypeName, Version) we can decode."""
+        descriptors = {}
+        for cls in self.registry.values():
+            descriptors[(cls.type_name_value(), cls.version_value())] = (
+                TypeDescriptor.of(cls)
+            )
+        for versions in self.old_versions.values():
+            for version, cls in versions.items():
+                descriptors[(cls.type_name_value(), version)] = TypeDescriptor.of(cls)
+        return descriptors
+
+    def load(self) -> None:
+        """Discover and compile all types now (e.g. at server startup)."""
+        self.descriptors  # noqa: B018
 
     def from_dict(self, data: dict) -> SemaType:
         """Decode a dictionary to the appropriate SemaType."""
+        return self.decode(data).value
+
+    def decode(self, data: dict) -> DecodeResult:
+        """
+        Decode a dictionary, reporting the path taken.
+
+        Messages at the current version decode directly and old versions
+        are translated. Unknown versions decode leniently against the
+        current version: keys the current version does not know are
+        dropped up front and listed in `dropped_fields`.
+        """
+        return self._decode_observed(data, check_keys=True)
+
+    def _decode_observed(self, data: dict, check_keys: bool) -> DecodeResult:
+        start = time.perf_counter()
+        try:
+            result = self._decode(data, check_keys)
+        except SemaError as e:
+            type_name, version = _labels(data)
+            DECODE_FAILURES.inc(type_name, version)
+            axioms = _AXIOM_PATTERN.findall(str(e))
+            for axiom in axioms or ("schema",):
+                AXIOM_FAILURES.inc(type_name, axiom)
+            raise
+        DECODE_SECONDS.observe(
+            time.perf_counter() - start, *_labels(data), result.path
+        )
+        return result
+
+    def _decode(self, data: dict, check_keys: bool = True) -> DecodeResult:
+        if not isinstance(data, dict):
+            raise ValueError(
+                f"A Sema message must be an object, got {type(data).__name__}"
+            )
         type_name = data.get("TypeName")
         if not type_name:
             raise ValueError("Missing TypeName field")
@@ -54,65 +309,216 @@ class SemaCodec:
 
         # Fast path: version matches current
         if version == current_version:
-            return current_cls.from_dict(data)
+            return DecodeResult(
+                current_cls.from_dict(data, check_keys), DecodePath.Current
+            )
 
         # Translation path: we have an old version
         if type_name in self.old_versions and version in self.old_versions[type_name]:
-            logger.warning(
+            throttled_logger.warning(
+                ("translate", type_name, version),
                 "Translating %s from v%s to v%s",
                 type_name,
                 version,
                 current_version,
             )
             old_cls = self.old_versions[type_name][version]
-            old_instance = old_cls.from_dict(data)
-            return old_instance.to_latest()
-
-        # Fallback: try to decode with current version anyway
-        logger.warning(
-            "Unknown version %s for %s, attempting decode with current v%s",
+            old_instance = old_cls.from_dict(data, check_keys)
+            plan = self.migration_plan(type_name, version)
+            return DecodeResult(plan.apply(old_instance), DecodePath.Translated)
+
+        # Fallback: decode with the current version, minus unknown fields
+        desc = self.descriptors[(type_name, current_version)]
+        dropped = desc.unknown_keys(data)
+        throttled_logger.warning(
+            ("lenient", type_name, version, dropped),
+            "Unknown version %s for %s, decoding with current v%s%s",
             version,
             type_name,
             current_version,
+            f" (dropping {', '.join(dropped)})" if dropped else "",
         )
 
-        data = dict(data)  # Make a copy
+        data = {k: v for k, v in data.items() if k not in dropped}
         data["Version"] = current_version
-        try:
-            return current_cls.from_dict(data)
-        except (ValidationError, SemaError):
-            logger.warning("Stripping unknown fields and retrying")
-            data = self._strip_unknown_fields(data, current_cls)
-            return current_cls.from_dict(data)
-
-
-    def from_bytes(self, data: bytes) -> SemaType:
-        """Decode JSON bytes to the appropriate SemaType"""
+        missing = desc.missing_keys(data)
+        if missing:
+            raise SemaError(
+                f"Cannot decode {type_name} v{version} as v{current_version}: "
+                f"missing {', '.join(missing)}"
+            )
+        return DecodeResult(current_cls.from_dict(data), DecodePath.Lenient, dropped)
+
+    def migration_plan(self, type_name: str, version: str | None) -> MigrationPlan:
+        """The compiled upgrade path for an old (TypeName, Version)."""
+        key = (type_name, version)
+        plan = self._plans.get(key)
+        if plan is None:
+            with self._plans_lock:
+                plan = self._plans.get(key)
+                if plan is None:
+                    plan = compile_plan(
+                        self.registry[type_name],
+                        self.old_versions[type_name],
+                        version,
+                    )
+                    self._plans[key] = plan
+        return plan
+
+    def from_bytes(
+        self, data: bytes, wire_format: WireFormat = WireFormat.Json
+    ) -> SemaType:
+        """Decode bytes in the given wire format to the appropriate SemaType"""
+        if wire_format == WireFormat.MsgPack:
+            return self._decode_observed(self._unpack(data), check_keys=False).value
         try:
             d = json.loads(data.decode("utf-8"))
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             raise ValueError(f"Invalid JSON data: {e}") from e
         return self.from_dict(d)
 
-    def to_bytes(self, msg: SemaType) -> bytes:
-        """Encode an SemaType to JSON bytes"""
-        return msg.to_bytes()
-
-    def _strip_unknown_fields(self, data: dict, cls: type[SemaType]) -> dict:
-        """Remove fields not recognized by the target class."""
-        valid_fields = set()
-        for field_name, field_info in cls.model_fields.items():
-            valid_fields.add(field_name)
-            valid_fields.add(snake_to_pascal(field_name))
-            if field_info.alias:
-                valid_fields.add(field_info.alias)
+    def iter_frames(
+        self, data: bytes, wire_format: WireFormat = WireFormat.Json
+    ) -> Iterator[tuple[int, Any]]:
+        """
+        Split a stream of messages into (position, frame) pairs for
+        `from_frame`: JSON lines by line number (blank lines skipped), or
+        concatenated msgpack messages by 1-based index. A malformed
+        msgpack stream raises ValueError, since it cannot be resynced.
+        """
+        if wire_format == WireFormat.MsgPack:
+            msgpack = _msgpack()
+            unpacker = msgpack.Unpacker(raw=False)
+            unpacker.feed(data)
+            try:
+                yield from enumerate(unpacker, start=1)
+            except (ValueError, msgpack.UnpackException) as e:
+                raise ValueError(f"Invalid msgpack stream: {e!r}") from e
+            return
+        for line_no, line in enumerate(data.splitlines(), start=1):
+            if line.strip():
+                yield line_no, line
+
+    def from_frame(
+        self, frame: Any, wire_format: WireFormat = WireFormat.Json
+    ) -> SemaType:
+        """Decode one frame from `iter_frames`."""
+        if wire_format == WireFormat.MsgPack:
+            return self._decode_observed(self._expand(frame), check_keys=False).value
+        return self.from_bytes(frame)
+
+    def frame(self, msg: SemaType, wire_format: WireFormat = WireFormat.Json) -> bytes:
+        """
+        Encode one message of a stream: JSON gets a line break, msgpack
+        needs none. Stream values are rarely repeated, so this skips the
+        shared encoding cache.
+        """
+        if wire_format == WireFormat.MsgPack:
+            return self._pack(msg)
+        return msg.to_bytes() + b"\n"
+
+    def to_bytes(
+        self, msg: SemaType, wire_format: WireFormat = WireFormat.Json
+    ) -> bytes:
+        """Encode an SemaType to bytes in the given wire format"""
+        start = time.perf_counter()
+        encoded = self._encode(msg, wire_format)
+        ENCODE_SECONDS.observe(
+            time.perf_counter() - start, msg.type_name, wire_format.name
+        )
+        return encoded
 
-        return {
-            key: value
-            for key, value in data.items()
-            if key in valid_fields or pascal_to_snake(key) in valid_fields
-        }
+    def _encode(self, msg: SemaType, wire_format: WireFormat) -> bytes:
+        if wire_format == WireFormat.MsgPack:
+            return self._pack(msg)
+        if self.encode_cache.maxsize <= 0 or _ENCODED_BYTES_KEY in msg.__dict__:
+            return msg.to_bytes()
+        try:
+            encoded = self.encode_cache.get(msg)
+        except TypeError:  # unhashable field value
+            return msg.to_bytes()
+        if encoded is None:
+            encoded = msg.to_bytes()
+            self.encode_cache.put(msg, encoded)
+        else:
+            object.__setattr__(msg, _ENCODED_BYTES_KEY, encoded)
+        return encoded
+
+    def _pack(self, msg: SemaType) -> bytes:
+        """Encode to the positional msgpack form."""
+        desc = self.descriptors.get((msg.type_name, msg.version))
+        if desc is None or desc.cls is not type(msg):
+            raise SemaError(
+                f"No binary layout for {type(msg).__name__} "
+                f"({msg.type_name} v{msg.version})"
+            )
+        row: list[Any] = [desc.type_name, desc.version, *[
+            value if pack is None or value is None else pack(value)
+            for pack, value in zip(desc.packers, desc.values(msg))
+        ]]
+        while row[-1] is None:
+            row.pop()
+        packer = getattr(self._local, "packer", None)
+        if packer is None:
+            packer = self._local.packer = _msgpack().Packer(use_bin_type=True)
+        return packer.pack(row)
+
+    def _unpack(self, data: bytes) -> dict[str, Any]:
+        """Expand the positional msgpack form into a Sema dict."""
+        msgpack = _msgpack()
+        try:
+            row = msgpack.unpackb(data, raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise ValueError(f"Invalid msgpack data: {e}") from e
+        return self._expand(row)
+
+    def _expand(self, row: Any) -> dict[str, Any]:
+        if not isinstance(row, list) or len(row) < 2:
+            raise ValueError("Binary Sema payload must be [TypeName, Version, ...]")
+
+        type_name, version, *values = row
+        if not isinstance(type_name, str) or not isinstance(version, str | None):
+            raise ValueError("Binary Sema payload must be [TypeName, Version, ...]")
+        desc = self.descriptors.get((type_name, version))
+        if desc is None:
+            raise ValueError(
+                f"No binary layout for {type_name} v{version}. "
+                f"Known: {sorted(self.descriptors, key=str)}"
+            )
+        if len(values) > len(desc.fields):
+            raise ValueError(
+                f"{type_name} v{version} has {len(desc.fields)} fields, "
+                f"got {len(values)} values"
+            )
 
+        d: dict[str, Any] = {"TypeName": type_name}
+        if version is not None:
+            d["Version"] = version
+        for field, value in zip(desc.fields, values):
+            if value is None:
+                continue
+            if field.kind is FieldKind.Uuid:
+                value = _uuid_str(value)
+            elif field.kind is FieldKind.Enum:
+                if not isinstance(value, int):
+                    raise ValueError(f"{field.alias}: expected an enum code, got {value!r}")
+                value = enum_from_code(field.enum_cls, value).value
+            elif isinstance(value, dict | list) and not recursively_pascal(value):
+                # Decoded with check_keys=False, so nested keys are checked here
+                raise SemaError(f"{field.alias}: keys must be recursively PascalCase")
+            d[field.alias] = value
+        return d
+
+
+def _labels(data: dict) -> tuple[str, str]:
+    """Metric labels for an incoming message, with bounded cardinality."""
+    version = data.get("Version") if isinstance(data, dict) else None
+    if version is None:
+        version = "none"
+    elif not (isinstance(version, str) and _VERSION_LABEL_PATTERN.match(version)):
+        version = "invalid"
+    type_name = data.get("TypeName") if isinstance(data, dict) else None
+    return (str(type_name) if type_name else "none"), version
 
 
 # ============================================================================
@@ -162,5 +568,5 @@ def get_old_versions() -> dict[str, dict[str | None, type[SemaType]]]:
 # DEFAULT CODEC INSTANCE FOR THIS REPOSITORY
 # ============================================================================
 
-# Create a default codec instance that can be imported
+# Create a default codec instance that can be imported (types load lazily)
 default_codec = SemaCodec()
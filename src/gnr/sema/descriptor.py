@@ -0,0 +1,177 @@
+"""
+Precompiled per-type descriptors.
+
+A TypeDescriptor captures everything the codec needs to know about a
+SemaType class without touching pydantic internals on the hot path:
+field order, aliases, the wire kind of each field, and which keys a
+dict may carry.
+"""
+
+import types
+import typing
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum, StrEnum
+from operator import attrgetter
+from typing import Annotated, Any
+
+from gnr.sema.base import SemaType, pascal_to_snake, snake_to_pascal
+from gnr.sema.enums.gw_str_enum import SymbolizedEnum
+from gnr.sema.property_format import is_uuid4_str
+
+# Fields that carry type identity rather than content
+IDENTITY_FIELDS = ("type_name", "version")
+
+
+class FieldKind(StrEnum):
+    Plain = "Plain"
+    Uuid = "Uuid"
+    Enum = "Enum"
+
+
+@dataclass(frozen=True, slots=True)
+class FieldDescriptor:
+    name: str
+    alias: str
+    kind: FieldKind
+    enum_cls: type[Enum] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TypeDescriptor:
+    cls: type[SemaType]
+    type_name: str
+    version: str | None
+    fields: tuple[FieldDescriptor, ...]
+    # Field names plus aliases, identity fields included
+    field_keys: frozenset[str]
+    # Aliases of fields without a default
+    required_keys: frozenset[str]
+    # Reads all field values of an instance at once, in `fields` order
+    values: Callable[[SemaType], tuple[Any, ...]] = field(compare=False, repr=False)
+    # Per field, the conversion of a non-None value to its msgpack form
+    # (None where the value packs as is)
+    packers: tuple[Callable[[Any], Any] | None, ...] = field(compare=False, repr=False)
+    # Keys outside field_keys that accepts() matched to a field. Only
+    # matches are kept: they are spellings of a known field, so the memo
+    # stays bounded however many unknown keys arrive.
+    _key_memo: set[str] = field(default_factory=set, compare=False, repr=False)
+
+    @classmethod
+    def of(cls, sema_cls: type[SemaType]) -> "TypeDescriptor":
+        fields = tuple(
+            _describe_field(name, info.alias or name, info.annotation, info.metadata)
+            for name, info in sema_cls.model_fields.items()
+            if name not in IDENTITY_FIELDS
+        )
+        field_keys: set[str] = set()
+        required_keys: set[str] = set()
+        for name, info in sema_cls.model_fields.items():
+            alias = info.alias or snake_to_pascal(name)
+            field_keys.update((name, alias, snake_to_pascal(name)))
+            if info.is_required():
+                required_keys.add(alias)
+        return cls(
+            cls=sema_cls,
+            type_name=sema_cls.type_name_value(),
+            version=sema_cls.version_value(),
+            fields=fields,
+            field_keys=frozenset(field_keys),
+            required_keys=frozenset(required_keys),
+            values=_values_getter(tuple(f.name for f in fields)),
+            packers=tuple(_packer(f) for f in fields),
+        )
+
+    def accepts(self, key: str) -> bool:
+        """Whether `key` names a field of this type (by name or alias)."""
+        if key in self.field_keys or key in self._key_memo:
+            return True
+        if pascal_to_snake(key) in self.field_keys:
+            self._key_memo.add(key)
+            return True
+        return False
+
+    def unknown_keys(self, data: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(key for key in data if not self.accepts(key))
+
+    def missing_keys(self, data: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(sorted(self.required_keys.difference(data)))
+
+
+def _describe_field(
+    name: str, alias: str, annotation: Any, metadata: list[Any]
+) -> FieldDescriptor:
+    # Pydantic moves the Annotated metadata of a required field onto the
+    # FieldInfo, leaving the bare type as its annotation
+    if any(getattr(v, "func", None) is is_uuid4_str for v in metadata):
+        return FieldDescriptor(name, alias, FieldKind.Uuid)
+    for candidate in _union_members(annotation):
+        if typing.get_origin(candidate) is Annotated:
+            validators = typing.get_args(candidate)[1:]
+            if any(getattr(v, "func", None) is is_uuid4_str for v in validators):
+                return FieldDescriptor(name, alias, FieldKind.Uuid)
+        elif isinstance(candidate, type) and issubclass(candidate, Enum):
+            return FieldDescriptor(name, alias, FieldKind.Enum, candidate)
+    return FieldDescriptor(name, alias, FieldKind.Plain)
+
+
+def _values_getter(names: tuple[str, ...]) -> Callable[[SemaType], tuple[Any, ...]]:
+    if len(names) > 1:
+        return attrgetter(*names)
+    return lambda msg: tuple(getattr(msg, name) for name in names)
+
+
+def _packer(f: FieldDescriptor) -> Callable[[Any], Any] | None:
+    if f.kind is FieldKind.Uuid:
+        return _uuid_bytes
+    if f.kind is FieldKind.Enum:
+        return _enum_codes(f.enum_cls)[0].__getitem__
+    return None
+
+
+def _uuid_bytes(value: str) -> bytes:
+    return bytes.fromhex(value.replace("-", ""))
+
+
+def _union_members(annotation: Any) -> tuple[Any, ...]:
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or origin is types.UnionType:
+        return tuple(a for a in typing.get_args(annotation) if a is not type(None))
+    return (annotation,)
+
+
+# ============================================================================
+# ENUM CODES
+# ============================================================================
+
+def enum_code(member: Enum) -> int:
+    """
+    Compact integer code for an enum member: its symbol for
+    SymbolizedEnums, otherwise its declaration ordinal.
+    """
+    return _enum_codes(type(member))[0][member]
+
+
+def enum_from_code(enum_cls: type[Enum], code: int) -> Enum:
+    member = _enum_codes(enum_cls)[1].get(code)
+    if member is None:
+        raise ValueError(f"{code} is not a valid code for {enum_cls.__name__}")
+    return member
+
+
+_ENUM_CODE_TABLES: dict[type[Enum], tuple[dict[Enum, int], dict[int, Enum]]] = {}
+
+
+def _enum_codes(
+    enum_cls: type[Enum],
+) -> tuple[dict[Enum, int], dict[int, Enum]]:
+    tables = _ENUM_CODE_TABLES.get(enum_cls)
+    if tables is None:
+        if issubclass(enum_cls, SymbolizedEnum):
+            codes = {m: int(m.symbol) for m in enum_cls}
+        else:
+            # Sema enums evolve additively, so declaration order is stable
+            codes = {m: i for i, m in enumerate(enum_cls)}
+        tables = (codes, {code: m for m, code in codes.items()})
+        _ENUM_CODE_TABLES[enum_cls] = tables
+    return tables
@@ -1,10 +1,10 @@
 from enum import auto
-from typing import List
+from typing import Dict, List
 
-from gnr.sema.enums.gw_str_enum import GwStrEnum
+from gnr.sema.enums.gw_str_enum import SymbolizedEnum
 
 
-class BaseGNodeClass(GwStrEnum):
+class BaseGNodeClass(SymbolizedEnum):
     """
     Sema:
     [https://schemas.electricity.works/enums/base.g.node.class/000](https://schemas.electricity.works/enums/base.g.node.class/000)
@@ -29,4 +29,14 @@ class BaseGNodeClass(GwStrEnum):
 
     @classmethod
     def enum_version(cls) -> str:
-        return "000"
\ No newline at end of file
+        return "000"
+
+    @classmethod
+    def symbol_map(cls) -> Dict[str, str]:
+        return {
+            "TerminalAsset": "0",
+            "LeafTransactiveNode": "1",
+            "ConnectivityNode": "2",
+            "MarketMaker": "3",
+            "Logical": "4",
+        }
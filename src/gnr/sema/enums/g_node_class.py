@@ -1,10 +1,10 @@
 from enum import auto
-from typing import List
+from typing import Dict, List
 
-from gnr.sema.enums.gw_str_enum import GwStrEnum
+from gnr.sema.enums.gw_str_enum import SymbolizedEnum
 
 
-class GNodeClass(GwStrEnum):
+class GNodeClass(SymbolizedEnum):
     """Sema: https://schemas.electricity.works/enums/g.node.class/000"""
     Unknown = auto()
     TerminalAsset = auto()
@@ -30,4 +30,18 @@ class GNodeClass(GwStrEnum):
 
     @classmethod
     def enum_version(cls) -> str:
-        return "000"
\ No newline at end of file
+        return "000"
+
+    @classmethod
+    def symbol_map(cls) -> Dict[str, str]:
+        return {
+            "Unknown": "0",
+            "TerminalAsset": "1",
+            "ConnectivityNode": "2",
+            "LeafTransactiveNode": "3",
+            "MarketMaker": "4",
+            "Scada": "5",
+            "PriceForecastService": "6",
+            "WeatherForecastService": "7",
+            "TimeCoordinator": "8",
+        }
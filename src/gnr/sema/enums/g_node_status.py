@@ -1,8 +1,8 @@
-from typing import List
-from gnr.sema.enums.gw_str_enum import GwStrEnum
+from typing import Dict, List
+from gnr.sema.enums.gw_str_enum import SymbolizedEnum
 
 
-class GNodeStatus(GwStrEnum):
+class GNodeStatus(SymbolizedEnum):
     """Sema: https://schemas.electricity.works/enums/g.node.status/000"""
 
     Pending = "Pending"
@@ -24,4 +24,13 @@ class GNodeStatus(GwStrEnum):
 
     @classmethod
     def enum_version(cls) -> str:
-        return "000"
\ No newline at end of file
+        return "000"
+
+    @classmethod
+    def symbol_map(cls) -> Dict[str, str]:
+        return {
+            "Pending": "0",
+            "Active": "1",
+            "Suspended": "2",
+            "PermanentlyDeactivated": "3",
+        }
@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import Any, List, Optional, Self
+from typing import Any, List, NamedTuple, Optional, Self
 
 
 class GwStrEnum(StrEnum):
@@ -45,14 +45,91 @@ class GwStrEnum(StrEnum):
 
 
 class SymbolizedEnum(GwStrEnum):
+    """
+    GwStrEnum whose members also carry a compact, stable symbol.
+
+    Subclasses declare their symbols in `symbol_map()` (value -> symbol).
+    Symbols are short decimal strings so they can be stored as smallint;
+    like values, they are never reassigned or reused. Lookup tables in
+    both directions, and the default member, are resolved once per class,
+    so unknown values fall back to the default with a single dict lookup.
+
+    Symbols are a storage/wire encoding only: constructing the enum from
+    a symbol string is not supported (use `from_symbol`), so JSON at the
+    Sema boundary keeps accepting values alone.
+    """
+
     @classmethod
-    def symbol_to_value(cls, symbol: str) -> str:
+    def symbol_map(cls) -> dict[str, str]:
         raise NotImplementedError
 
+    @classmethod
+    def _missing_(cls, value: str) -> Self:
+        default = _symbol_tables(cls).default
+        if default is None:
+            raise ValueError(f"'{value}' is not valid {cls.__name__}")
+        return default
+
+    @classmethod
+    def symbol_to_value(cls, symbol: str) -> str:
+        return cls.from_symbol(symbol).value
+
     @classmethod
     def value_to_symbol(cls, value: str) -> str:
-        raise NotImplementedError
+        tables = _symbol_tables(cls)
+        symbol = tables.value_to_symbol.get(value)
+        if symbol is None:
+            if tables.default is None:
+                raise ValueError(f"'{value}' is not valid {cls.__name__}")
+            return tables.value_to_symbol[tables.default.value]
+        return symbol
 
     @classmethod
     def symbols(cls) -> List[str]:
-        raise NotImplementedError
+        return list(_symbol_tables(cls).symbol_to_member)
+
+    @classmethod
+    def from_symbol(cls, symbol: str, strict: bool = False) -> Self:
+        """
+        The member for `symbol`. Unknown symbols give the default member,
+        or raise ValueError if there is none or `strict` is set (e.g. for
+        stored codes, where a fallback would silently rewrite data).
+        """
+        tables = _symbol_tables(cls)
+        member = tables.symbol_to_member.get(symbol)
+        if member is None:
+            if strict or tables.default is None:
+                raise ValueError(f"'{symbol}' is not a valid {cls.__name__} symbol")
+            return tables.default
+        return member
+
+    @property
+    def symbol(self) -> str:
+        return _symbol_tables(type(self)).value_to_symbol[self.value]
+
+
+class _SymbolTables(NamedTuple):
+    value_to_symbol: dict[str, str]
+    symbol_to_member: dict[str, Any]
+    default: Any
+
+
+_SYMBOL_TABLES: dict[type, _SymbolTables] = {}
+
+
+def _symbol_tables(cls: type[SymbolizedEnum]) -> _SymbolTables:
+    tables = _SYMBOL_TABLES.get(cls)
+    if tables is None:
+        value_to_symbol = dict(cls.symbol_map())
+        members = {m.value: m for m in cls}
+        if set(value_to_symbol) != set(members):
+            raise ValueError(
+                f"{cls.__name__}.symbol_map() must cover exactly "
+                f"{sorted(members)}, got {sorted(value_to_symbol)}"
+            )
+        symbol_to_member = {s: members[v] for v, s in value_to_symbol.items()}
+        if len(symbol_to_member) != len(value_to_symbol):
+            raise ValueError(f"{cls.__name__}.symbol_map() has duplicate symbols")
+        tables = _SymbolTables(value_to_symbol, symbol_to_member, cls.default())
+        _SYMBOL_TABLES[cls] = tables
+    return tables
@@ -0,0 +1,122 @@
+"""
+Version migration plans.
+
+Old version classes upgrade themselves one of two ways:
+
+  - `to_next()`: one hop, to the next known version of the type
+  - `to_latest()`: straight to the current version
+
+A MigrationPlan chains these hops from a given (TypeName, Version) to
+the current version. Plans are compiled once per (TypeName, Version) and
+reused for every message. Each hop must land on the version the plan
+expects: checked when the plan is compiled if the hop's return type is
+annotated with a concrete class, and otherwise on every apply.
+"""
+
+import typing
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from gnr.sema.base import SemaError, SemaType
+
+
+@dataclass(frozen=True, slots=True)
+class MigrationPlan:
+    type_name: str
+    from_version: str | None
+    to_version: str | None
+    # Unbound to_next / to_latest methods, applied in order
+    steps: tuple[Callable[[SemaType], SemaType], ...]
+    # The version each step must produce
+    targets: tuple[str | None, ...] = ()
+
+    def apply(self, instance: SemaType) -> SemaType:
+        for step, target in zip(self.steps, self.targets, strict=True):
+            instance = step(instance)
+            if instance.type_name != self.type_name or instance.version != target:
+                raise SemaError(
+                    f"{step.__qualname__} returned {instance.type_name} "
+                    f"v{instance.version}, expected {self.type_name} v{target}"
+                )
+        return instance
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+def compile_plan(
+    current_cls: type[SemaType],
+    old_versions: dict[str | None, type[SemaType]],
+    from_version: str | None,
+) -> MigrationPlan:
+    """
+    Resolve the hops from `from_version` to `current_cls`.
+
+    Versions are ordered as zero-padded strings, with an unversioned
+    class first. A class that overrides `to_latest()` ends the chain;
+    otherwise its `to_next()` leads to the next known version.
+    """
+    type_name = current_cls.type_name_value()
+    current_version = current_cls.version_value()
+    if from_version not in old_versions:
+        raise SemaError(f"No old version {type_name} v{from_version}")
+
+    ordered = sorted(old_versions, key=_version_key)
+    steps: list[Callable[[SemaType], SemaType]] = []
+    targets: list[str | None] = []
+    version = from_version
+    while version != current_version:
+        cls = old_versions[version]
+        if cls.version_value() != version:
+            raise SemaError(
+                f"{cls.__name__} is registered as {type_name} v{version} "
+                f"but declares v{cls.version_value()}"
+            )
+        if _overrides(cls, "to_latest"):
+            step, version = cls.to_latest, current_version
+        elif _overrides(cls, "to_next"):
+            later = [v for v in ordered if _version_key(v) > _version_key(version)]
+            step, version = cls.to_next, later[0] if later else current_version
+        else:
+            raise SemaError(
+                f"{cls.__name__} implements neither to_next() nor to_latest(); "
+                f"cannot migrate {type_name} v{from_version} to v{current_version}"
+            )
+        returned = _return_class(step)
+        if returned is not None and (
+            returned.type_name_value() != type_name or returned.version_value() != version
+        ):
+            raise SemaError(
+                f"{step.__qualname__} returns {returned.__name__} "
+                f"({returned.type_name_value()} v{returned.version_value()}), "
+                f"but the next version of {type_name} is v{version}"
+            )
+        steps.append(step)
+        targets.append(version)
+
+    return MigrationPlan(
+        type_name, from_version, current_version, tuple(steps), tuple(targets)
+    )
+
+
+def _return_class(step: Callable[[SemaType], SemaType]) -> type[SemaType] | None:
+    """The concrete SemaType a hop is annotated to return, if any."""
+    try:
+        returned = typing.get_type_hints(step).get("return")
+    except (NameError, TypeError):
+        return None
+    if (
+        isinstance(returned, type)
+        and issubclass(returned, SemaType)
+        and returned is not SemaType
+    ):
+        return returned
+    return None
+
+
+def _overrides(cls: type[SemaType], method: str) -> bool:
+    return getattr(cls, method) is not getattr(SemaType, method)
+
+
+def _version_key(version: str | None) -> tuple[int, str]:
+    return (0, "") if version is None else (1, version)
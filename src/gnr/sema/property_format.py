@@ -18,6 +18,12 @@ _HANDLE_PATTERN = re.compile(
     r"^[a-z][a-z0-9]*(?:-[a-z0-9]+)*(?:\.[a-z][a-z0-9]*(?:-[a-z0-9]+)*)*$"
 )
 
+# UTC bounds: Jan 1 2000 and Jan 1 3000
+UTC_START_SECONDS = int(datetime(2000, 1, 1, tzinfo=UTC).timestamp())
+UTC_END_SECONDS = int(datetime(3000, 1, 1, tzinfo=UTC).timestamp())
+UTC_START_MILLISECONDS = UTC_START_SECONDS * 1000
+UTC_END_MILLISECONDS = UTC_END_SECONDS * 1000
+
 
 
 def is_utc_milliseconds(v: int) -> int:
@@ -26,15 +32,9 @@ def is_utc_milliseconds(v: int) -> int:
     """
     if not isinstance(v, int):
         raise TypeError("Not an int!")
-    start_date = datetime(2000, 1, 1, tzinfo=UTC)
-    end_date = datetime(3000, 1, 1, tzinfo=UTC)
-
-    start_timestamp_ms = int(start_date.timestamp() * 1000)
-    end_timestamp_ms = int(end_date.timestamp() * 1000)
-
-    if v < start_timestamp_ms:
+    if v < UTC_START_MILLISECONDS:
         raise ValueError(f"{v} must be after Jan 1 2000")
-    if v > end_timestamp_ms:
+    if v > UTC_END_MILLISECONDS:
         raise ValueError(f"{v} must be before Jan 1 3000")
     return v
 
@@ -45,15 +45,9 @@ def is_utc_seconds(v: int) -> int:
     """
     if not isinstance(v, int):
         raise ValueError("Not an int!")
-    start_date = datetime(2000, 1, 1, tzinfo=UTC)
-    end_date = datetime(3000, 1, 1, tzinfo=UTC)
-
-    start_timestamp = int(start_date.timestamp())
-    end_timestamp = int(end_date.timestamp())
-
-    if v < start_timestamp:
+    if v < UTC_START_SECONDS:
         raise ValueError(f"{v}: Fails UTCSeconds format! Must be after Jan 1 2000")
-    if v > end_timestamp:
+    if v > UTC_END_SECONDS:
         raise ValueError(f"{v}: Fails UTCSeconds format! Must be before Jan 1 3000")
     return v
 
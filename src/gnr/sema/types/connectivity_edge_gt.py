@@ -6,6 +6,7 @@ from pydantic import model_validator
 from gnr.sema.base import SemaType
 from gnr.sema.enums import GNodeStatus
 from gnr.sema.property_format import UUID4Str, LeftRightDot
+from gnr.tracing import traced
 
 
 class ConnectivityEdgeGt(SemaType):
@@ -22,6 +23,7 @@ class ConnectivityEdgeGt(SemaType):
 
 
     @model_validator(mode="after")
+    @traced
     def check_axiom_1(self) -> Self:
         """
         Axiom 1: A ConnectivityEdge cannot connect a GNode to itself.
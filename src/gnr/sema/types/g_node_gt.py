@@ -9,6 +9,7 @@ from gnr.sema.property_format import (
     LeftRightDot,
     UUID4Str,
 )
+from gnr.tracing import traced
 
 
 class GNodeGt(SemaType):
@@ -26,6 +27,7 @@ class GNodeGt(SemaType):
     version: Literal["004"] = "004"
 
     @model_validator(mode="after")
+    @traced
     def check_axiom_1(self) -> Self:
         """
         Axiom 1: PhysicalClassAlignment.
@@ -43,6 +45,7 @@ class GNodeGt(SemaType):
         return self
 
     @model_validator(mode="after")
+    @traced
     def check_axiom_2(self) -> Self:
         """
         Axiom 2: PhysicalGNodeLocations.
@@ -57,6 +60,7 @@ class GNodeGt(SemaType):
         return self
 
     @model_validator(mode="after")
+    @traced
     def check_axiom_3(self) -> Self:
         """
         Axiom 3: AliasTransitionConsistency.
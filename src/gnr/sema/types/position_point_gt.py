@@ -5,6 +5,7 @@ from pydantic import StrictInt, model_validator
 from typing_extensions import Self
 
 from gnr.sema.property_format import UUID4Str
+from gnr.tracing import traced
 
 
 class PositionPointGt(SemaType):
@@ -19,6 +20,7 @@ class PositionPointGt(SemaType):
     version: Literal["000"] = "000"
 
     @model_validator(mode="after") 
+    @traced
     def check_axiom_1(self) -> Self: 
         """
         Axiom 1: Coordinates must be valid Earth locations.
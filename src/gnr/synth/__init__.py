@@ -0,0 +1,10 @@
+"""
+Synthetic registries and load generation, for capacity planning.
+"""
+
+from gnr.synth.generator import RegistryGenerator, RegistryShape
+
+__all__ = [
+    "RegistryGenerator",
+    "RegistryShape",
+]
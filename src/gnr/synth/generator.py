@@ -0,0 +1,193 @@
+"""
+Seeded generator of realistic synthetic registries.
+
+The shape follows a real GridWorks deployment:
+
+    m0                          MarketMaker
+    m0.c3                       ConnectivityNode (nested --depth levels)
+    m0.c3.c1.l7                 LeafTransactiveNode
+    m0.c3.c1.l7.ta              TerminalAsset
+    m0.c3.c1.l7.scada           Scada (Logical)
+
+Every physical GNode gets a PositionPoint clustered around its parent's,
+and a ConnectivityEdge from its parent. Messages are built through the
+Sema constructors, so every axiom is checked as they are generated.
+
+Generation streams: GTs are yielded in dependency order (a GNode's
+PositionPoint before the GNode, both endpoints before an edge) and
+nothing is kept beyond the current path, so 10M-node registries can be
+written without holding them in memory.
+"""
+
+import math
+import random
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from gnr.sema.base import SemaType
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+from gnr.sema.types import ConnectivityEdgeGt, GNodeGt, PositionPointGt
+
+MAX_LATITUDE_MICRO_DEG = 90_000_000
+MAX_LONGITUDE_MICRO_DEG = 180_000_000
+
+# Spread of children around their parent, in micro-degrees, by depth
+_CLUSTER_SPREAD = (2_000_000, 400_000, 80_000, 15_000, 3_000, 500)
+
+
+@dataclass(frozen=True)
+class RegistryShape:
+    """Fan-out ranges (inclusive) at each level of the alias tree."""
+
+    connectivity_depth: int = 3
+    connectivity_fanout: tuple[int, int] = (3, 8)
+    leaves_per_connectivity_node: tuple[int, int] = (5, 40)
+    # Share of LeafTransactiveNodes that also have a Scada node
+    scada_share: float = 0.8
+
+
+@dataclass(frozen=True)
+class _Parent:
+    g_node_id: str
+    alias: str
+    latitude: int
+    longitude: int
+    depth: int
+
+
+class RegistryGenerator:
+    def __init__(
+        self,
+        nodes: int,
+        seed: int = 0,
+        shape: RegistryShape | None = None,
+    ) -> None:
+        self.nodes = nodes
+        self.seed = seed
+        self.shape = shape or RegistryShape()
+
+    def __iter__(self) -> Iterator[SemaType]:
+        """PositionPointGt, GNodeGt and ConnectivityEdgeGt, in dependency order."""
+        rng = random.Random(self.seed)
+        budget = [self.nodes]
+        market_maker = 0
+        while budget[0] > 0:
+            # Market makers spread over the populated latitudes
+            latitude = rng.randint(-50_000_000, 60_000_000)
+            longitude = rng.randint(-170_000_000, 170_000_000)
+            yield from self._node(
+                rng, budget, None, f"m{market_maker}", BaseGNodeClass.MarketMaker,
+                latitude, longitude,
+            )
+            market_maker += 1
+
+    def g_node_aliases(self) -> Iterator[str]:
+        """Just the aliases, in generation order (e.g. to drive reads)."""
+        for gt in self:
+            if isinstance(gt, GNodeGt):
+                yield gt.alias
+
+    # -------------------
+    #  Tree
+    # -------------------
+
+    def _node(
+        self,
+        rng: random.Random,
+        budget: list[int],
+        parent: _Parent | None,
+        alias: str,
+        base_class: BaseGNodeClass,
+        latitude: int,
+        longitude: int,
+    ) -> Iterator[SemaType]:
+        if budget[0] <= 0:
+            return
+        budget[0] -= 1
+        depth = parent.depth + 1 if parent else 0
+        point = PositionPointGt(
+            id=_uuid4(rng),
+            latitude_micro_deg=latitude,
+            longitude_micro_deg=longitude,
+        )
+        node = GNodeGt(
+            g_node_id=_uuid4(rng),
+            alias=alias,
+            base_class=base_class,
+            g_node_class=base_class.value,
+            status=GNodeStatus.Active,
+            position_point_id=point.id,
+            display_name=None,
+        )
+        yield point
+        yield node
+        if parent is not None:
+            yield ConnectivityEdgeGt(
+                id=_uuid4(rng),
+                from_g_node_id=parent.g_node_id,
+                to_g_node_id=node.g_node_id,
+                from_g_node_alias=parent.alias,
+                to_g_node_alias=alias,
+                status=GNodeStatus.Active,
+            )
+        me = _Parent(node.g_node_id, alias, latitude, longitude, depth)
+        yield from self._children(rng, budget, me, base_class)
+
+    def _children(
+        self,
+        rng: random.Random,
+        budget: list[int],
+        parent: _Parent,
+        base_class: BaseGNodeClass,
+    ) -> Iterator[SemaType]:
+        shape = self.shape
+        if base_class is BaseGNodeClass.LeafTransactiveNode:
+            yield from self._node(
+                rng, budget, parent, f"{parent.alias}.ta", BaseGNodeClass.TerminalAsset,
+                *self._near(rng, parent),
+            )
+            if budget[0] > 0 and rng.random() < shape.scada_share:
+                budget[0] -= 1
+                yield GNodeGt(
+                    g_node_id=_uuid4(rng),
+                    alias=f"{parent.alias}.scada",
+                    base_class=BaseGNodeClass.Logical,
+                    g_node_class="Scada",
+                    status=GNodeStatus.Active,
+                )
+            return
+        if base_class is BaseGNodeClass.TerminalAsset:
+            return
+        # MarketMaker or ConnectivityNode
+        if parent.depth < shape.connectivity_depth:
+            child_class, prefix, fanout = (
+                BaseGNodeClass.ConnectivityNode, "c", shape.connectivity_fanout
+            )
+        else:
+            child_class, prefix, fanout = (
+                BaseGNodeClass.LeafTransactiveNode, "l", shape.leaves_per_connectivity_node
+            )
+        for i in range(rng.randint(*fanout)):
+            if budget[0] <= 0:
+                return
+            yield from self._node(
+                rng, budget, parent, f"{parent.alias}.{prefix}{i}", child_class,
+                *self._near(rng, parent),
+            )
+
+    @staticmethod
+    def _near(rng: random.Random, parent: _Parent) -> tuple[int, int]:
+        spread = _CLUSTER_SPREAD[min(parent.depth, len(_CLUSTER_SPREAD) - 1)]
+        latitude = round(rng.gauss(parent.latitude, spread))
+        # Keep east-west spread in km roughly constant away from the equator
+        cos_lat = max(math.cos(math.radians(parent.latitude / 1e6)), 0.1)
+        longitude = round(rng.gauss(parent.longitude, spread / cos_lat))
+        return (
+            max(-MAX_LATITUDE_MICRO_DEG, min(MAX_LATITUDE_MICRO_DEG, latitude)),
+            max(-MAX_LONGITUDE_MICRO_DEG, min(MAX_LONGITUDE_MICRO_DEG, longitude)),
+        )
+
+
+def _uuid4(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
@@ -0,0 +1,199 @@
+"""
+Load driver: replays mixed traffic against a running API.
+
+Worker threads pick operations by weight until the duration is up:
+
+  - read:   GET /g-nodes/{alias}, for aliases of a generated registry
+  - write:  POST /g-nodes, a new Logical (Scada) GNode
+  - export: GET /export/{collection}, read to the end
+
+and the report gives throughput and latency percentiles per operation,
+with non-2xx responses (e.g. 429 from admission control) counted by
+status. Only the standard library is used, so it runs anywhere the API
+is reachable.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import islice
+from os import PathLike
+
+DEFAULT_MIX = {"read": 90.0, "write": 9.0, "export": 1.0}
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass
+class OpStats:
+    latencies_s: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+    def add(self, latency_s: float, status: int | str) -> None:
+        self.latencies_s.append(latency_s)
+        self.statuses[status] += 1
+
+
+@dataclass
+class LoadReport:
+    duration_s: float
+    ops: dict[str, OpStats]
+
+    def format(self) -> str:
+        header = f"{'op':<8} {'count':>8} {'ops/s':>9} " + " ".join(
+            f"{'p' + format(q * 100, 'g'):>8}" for q in PERCENTILES
+        ) + f" {'max':>8}  statuses"
+        rows = [header]
+        for name, stats in sorted(self.ops.items()):
+            ds = sorted(stats.latencies_s)
+            if not ds:
+                continue
+            cells = " ".join(f"{_percentile(ds, q) * 1e3:>8.1f}" for q in PERCENTILES)
+            statuses = ", ".join(f"{k}: {v}" for k, v in sorted(stats.statuses.items(), key=str))
+            rows.append(
+                f"{name:<8} {len(ds):>8} {len(ds) / self.duration_s:>9.1f} "
+                f"{cells} {ds[-1] * 1e3:>8.1f}  {statuses}"
+            )
+        total = sum(len(s.latencies_s) for s in self.ops.values())
+        rows.append(
+            f"{total} requests in {self.duration_s:.1f}s "
+            f"({total / self.duration_s:.1f}/s); latencies in ms"
+        )
+        return "\n".join(rows)
+
+
+class LoadDriver:
+    def __init__(
+        self,
+        base_url: str,
+        aliases: list[str],
+        mix: dict[str, float] | None = None,
+        threads: int = 8,
+        duration_s: float = 30.0,
+        export_collection: str = "position-points",
+        seed: int = 0,
+        timeout_s: float = 30.0,
+    ) -> None:
+        if not aliases:
+            raise ValueError("LoadDriver needs at least one alias to read")
+        self.base_url = base_url.rstrip("/")
+        self.aliases = aliases
+        self.mix = mix or DEFAULT_MIX
+        self.threads = threads
+        self.duration_s = duration_s
+        self.export_collection = export_collection
+        self.seed = seed
+        self.timeout_s = timeout_s
+        # New aliases are unique per run: load<run>.t<thread>.n<i>
+        self._run_id = f"load{uuid.uuid4().hex[:8]}"
+
+    def run(self) -> LoadReport:
+        results: list[dict[str, OpStats]] = [defaultdict(OpStats) for _ in range(self.threads)]
+        deadline = time.monotonic() + self.duration_s
+        workers = [
+            threading.Thread(target=self._worker, args=(i, deadline, results[i]), daemon=True)
+            for i in range(self.threads)
+        ]
+        start = time.monotonic()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.monotonic() - start
+
+        merged: dict[str, OpStats] = defaultdict(OpStats)
+        for per_thread in results:
+            for name, stats in per_thread.items():
+                merged[name].latencies_s.extend(stats.latencies_s)
+                merged[name].statuses.update(stats.statuses)
+        return LoadReport(elapsed, dict(merged))
+
+    def _worker(self, index: int, deadline: float, stats: dict[str, OpStats]) -> None:
+        rng = random.Random(self.seed * 1_000 + index)
+        ops = list(self.mix)
+        weights = [self.mix[op] for op in ops]
+        written = 0
+        while time.monotonic() < deadline:
+            op = rng.choices(ops, weights)[0]
+            if op == "read":
+                request = urllib.request.Request(
+                    f"{self.base_url}/g-nodes/{rng.choice(self.aliases)}"
+                )
+            elif op == "write":
+                written += 1
+                request = urllib.request.Request(
+                    f"{self.base_url}/g-nodes",
+                    data=json.dumps(self._new_g_node(index, written)).encode(),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+            elif op == "export":
+                request = urllib.request.Request(
+                    f"{self.base_url}/export/{self.export_collection}"
+                )
+            else:
+                raise ValueError(f"Unknown operation {op} in mix")
+            started = time.perf_counter()
+            status = self._send(request)
+            stats[op].add(time.perf_counter() - started, status)
+
+    def _send(self, request: urllib.request.Request) -> int | str:
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_s) as response:  # noqa: S310
+                while response.read(1 << 16):
+                    pass
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            reason = getattr(e, "reason", e)
+            return type(reason if isinstance(reason, BaseException) else e).__name__
+
+    def _new_g_node(self, thread: int, i: int) -> dict:
+        # Fresh ids, not seeded ones: a rerun with the same seed must not
+        # collide with GNodes an earlier run wrote
+        return {
+            "GNodeId": str(uuid.uuid4()),
+            "Alias": f"{self._run_id}.t{thread}.n{i}",
+            "BaseClass": "Logical",
+            "GNodeClass": "Scada",
+            "Status": "Active",
+            "TypeName": "g.node.gt",
+            "Version": "004",
+        }
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """'read=80,write=15,export=5' -> weights."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation {name!r}; expected one of {list(DEFAULT_MIX)}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def aliases_from_jsonl(path: str | PathLike, limit: int = 100_000) -> list[str]:
+    """GNode aliases from a Sema JSONL file (the first `limit`)."""
+    with open(path, "rb") as f:
+        return list(islice(_g_node_aliases(f), limit))
+
+
+def _g_node_aliases(lines: Iterable[bytes]) -> Iterable[str]:
+    for line in lines:
+        if b'"g.node.gt"' not in line:
+            continue
+        yield json.loads(line)["Alias"]
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
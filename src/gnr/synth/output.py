@@ -0,0 +1,71 @@
+"""
+Sinks for generated registries: Sema JSONL files, or the database.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from os import PathLike
+
+from sqlalchemy import inspect, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from gnr.db.models import ConnectivityEdgeSql, GNodeSql, PositionPointSql, sql_class_for
+from gnr.sema.base import SemaType
+
+# Insert order within a chunk, so foreign keys always point backwards
+_TABLE_ORDER = (PositionPointSql, GNodeSql, ConnectivityEdgeSql)
+
+
+def write_jsonl(gts: Iterable[SemaType], path: str | PathLike) -> int:
+    """One Sema JSON message per line; returns the number written."""
+    count = 0
+    with open(path, "wb") as f:
+        for gt in gts:
+            f.write(gt.to_bytes() + b"\n")
+            count += 1
+    return count
+
+
+def write_db(
+    gts: Iterable[SemaType],
+    sessionmaker: sessionmaker[Session],
+    chunk_size: int = 10_000,
+) -> int:
+    """
+    Insert into an existing schema (`alembic upgrade head`), one
+    multi-row INSERT per table per chunk and one commit per chunk.
+    Returns the number of rows written.
+    """
+    count = 0
+    chunk: dict[type, list[dict]] = defaultdict(list)
+    pending = 0
+    with sessionmaker() as session:
+        for gt in gts:
+            sql_class = sql_class_for(gt)
+            chunk[sql_class].append(_row(sql_class.from_gt(gt)))
+            pending += 1
+            if pending >= chunk_size:
+                _flush_chunk(session, chunk)
+                count += pending
+                pending = 0
+        if pending:
+            _flush_chunk(session, chunk)
+            count += pending
+    return count
+
+
+def _row(obj: object) -> dict:
+    """Column values, leaving out unset columns that have a default."""
+    return {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(type(obj)).column_attrs
+        if getattr(obj, attr.key) is not None or not attr.columns[0].default
+    }
+
+
+def _flush_chunk(session: Session, chunk: dict[type, list[dict]]) -> None:
+    for sql_class in _TABLE_ORDER:
+        rows = chunk.pop(sql_class, None)
+        if rows:
+            session.execute(insert(sql_class), rows)
+    session.commit()
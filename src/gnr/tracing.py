@@ -0,0 +1,274 @@
+"""
+Opt-in, lightweight tracing.
+
+Spans are named, timed sections of work that nest through a context
+variable:
+
+    with span("sema.from_dict", type="GNodeGt"):
+        ...
+
+Tracing is off by default. While off, `span()` returns a shared no-op
+context manager and nothing is recorded. When on, a sampling decision is
+made once per root span and inherited by its children; each finished
+trace goes to the configured exporter. The file and console exporters
+write OTLP/JSON lines (the OpenTelemetry file exporter format), so traces
+load into any OpenTelemetry-compatible tool.
+"""
+
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, TextIO, TypeVar
+
+if TYPE_CHECKING:
+    from gnr.config import Settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+# ============================================================================
+# SPANS
+# ============================================================================
+
+class Span:
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "attributes",
+        "start_ns", "end_ns", "error", "root", "finished", "_token",
+    )
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: str | None = None
+        self.root: Span = parent.root if parent else self
+        # On the root: finished descendants, exported with it
+        self.finished: list[Span] = []
+        self._token = None
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        if self.root is self:
+            _tracer.exporter.export([*self.finished, self])
+            self.finished = []
+        else:
+            self.root.finished.append(self)
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Returned while tracing is off, and inside unsampled traces."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        return None
+
+
+class _UnsampledRoot:
+    """Marks a trace as unsampled so its children are no-ops."""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self) -> "_UnsampledRoot":
+        self._token = _current.set(_UNSAMPLED)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        _current.reset(self._token)
+
+
+_NOOP = _NoopSpan()
+_UNSAMPLED = object()
+_current: ContextVar[Any] = ContextVar("gnr_span", default=None)
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan | _UnsampledRoot:
+    """A span named `name`, child of the current span if there is one."""
+    if not _tracer.enabled:
+        return _NOOP
+    parent = _current.get()
+    if parent is _UNSAMPLED:
+        return _NOOP
+    if parent is None and random.random() >= _tracer.sample_rate:
+        return _UnsampledRoot()
+    return Span(name, parent, attributes)
+
+
+def traced(func: F) -> F:
+    """Run `func` inside a span named by its qualified name."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not _tracer.enabled:
+            return func(*args, **kwargs)
+        with span(name):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+# ============================================================================
+# EXPORTERS
+# ============================================================================
+
+class Exporter:
+    def export(self, spans: list[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class OtlpJsonExporter(Exporter):
+    """One OTLP/JSON `ExportTraceServiceRequest` per line, per trace."""
+
+    def __init__(self, stream: TextIO, service_name: str = "gnr") -> None:
+        self.stream = stream
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{
+                    "key": "service.name",
+                    "value": {"stringValue": self.service_name},
+                }]},
+                "scopeSpans": [{
+                    "scope": {"name": "gnr"},
+                    "spans": [s.to_otlp() for s in spans],
+                }],
+            }]
+        }
+        line = json.dumps(request, separators=(",", ":"))
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def shutdown(self) -> None:
+        if self.stream not in (sys.stdout, sys.stderr):
+            self.stream.close()
+
+
+class SummaryExporter(Exporter):
+    """
+    Collects span durations by name, for `gnr profile`. Optionally
+    forwards every trace to another exporter as well.
+    """
+
+    def __init__(self, forward: Exporter | None = None) -> None:
+        self.forward = forward
+        self.durations: dict[str, list[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            for s in spans:
+                self.durations[s.name].append(s.duration_s)
+        if self.forward is not None:
+            self.forward.export(spans)
+
+    def shutdown(self) -> None:
+        if self.forward is not None:
+            self.forward.shutdown()
+
+    def report(self) -> str:
+        rows = [f"{'span':<40} {'count':>8} {'total ms':>10} {'mean us':>10} {'p99 us':>10}"]
+        by_total = sorted(self.durations.items(), key=lambda kv: -sum(kv[1]))
+        for name, ds in by_total:
+            ds = sorted(ds)
+            p99 = ds[min(len(ds) - 1, int(len(ds) * 0.99))]
+            rows.append(
+                f"{name:<40} {len(ds):>8} {sum(ds) * 1e3:>10.1f} "
+                f"{sum(ds) / len(ds) * 1e6:>10.1f} {p99 * 1e6:>10.1f}"
+            )
+        return "\n".join(rows)
+
+
+class _Tracer:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.exporter: Exporter = Exporter()
+
+
+_tracer = _Tracer()
+
+
+def configure_tracing(
+    enabled: bool,
+    exporter: Exporter | None = None,
+    sample_rate: float = 1.0,
+) -> None:
+    """Turn tracing on (with an exporter) or off."""
+    _tracer.exporter.shutdown()
+    _tracer.exporter = exporter or Exporter()
+    _tracer.sample_rate = sample_rate
+    _tracer.enabled = enabled and exporter is not None
+
+
+def configure_tracing_from_settings(settings: "Settings") -> None:
+    if not settings.trace_enabled:
+        configure_tracing(False)
+        return
+    if settings.trace_file:
+        path = os.path.expanduser(settings.trace_file)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        exporter = OtlpJsonExporter(open(path, "a", encoding="utf-8"))  # noqa: SIM115
+    else:
+        exporter = OtlpJsonExporter(sys.stderr)
+    configure_tracing(True, exporter, settings.trace_sample_rate)
+
+
+def _otlp_value(v: Any) -> dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
@@ -0,0 +1,54 @@
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from gnr.config import Settings
+from gnr.db.models import Base
+from gnr.db.session import make_engine, make_sessionmaker
+from gnr.tracing import Exporter, Span, configure_tracing
+
+
+class ListExporter(Exporter):
+    """Keeps every exported trace, in order."""
+
+    def __init__(self) -> None:
+        self.traces: list[list[Span]] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.traces.append(spans)
+
+    @property
+    def spans(self) -> list[Span]:
+        return [s for trace in self.traces for s in trace]
+
+
+@pytest.fixture
+def exporter() -> Iterator[ListExporter]:
+    """Tracing on, every trace sampled, for the duration of a test."""
+    exporter = ListExporter()
+    configure_tracing(True, exporter)
+    yield exporter
+    configure_tracing(False)
+
+
+@pytest.fixture(params=["tracing off", "tracing on"])
+def tracing(request: pytest.FixtureRequest) -> Iterator[ListExporter | None]:
+    """Runs a test with tracing off (the default) and on."""
+    if request.param == "tracing off":
+        configure_tracing(False)
+        yield None
+        return
+    exporter = ListExporter()
+    configure_tracing(True, exporter)
+    yield exporter
+    configure_tracing(False)
+
+
+@pytest.fixture
+def db_factory(tmp_path) -> Iterator[sessionmaker[Session]]:
+    """An instrumented sessionmaker on a fresh SQLite database."""
+    engine = make_engine(Settings(db_url=f"sqlite:///{tmp_path}/gnr.db"))
+    Base.metadata.create_all(engine)
+    yield make_sessionmaker(engine)
+    engine.dispose()
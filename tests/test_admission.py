@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from gnr.api.admission import AdmissionController, AdmissionMiddleware
+from gnr.config import Settings
+
+
+async def request(app, path: str) -> tuple[int, dict[str, str], bytes]:
+    """Drive one GET through the ASGI app: (status, headers, body)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    sent: list[dict] = []
+    requested = False
+
+    async def receive() -> dict:
+        nonlocal requested
+        if requested:
+            # The client stays connected until the response is done
+            await asyncio.Future()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = sent[0]
+    headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return start["status"], headers, body
+
+
+def blocking_app(capacity: int, release: asyncio.Event) -> FastAPI:
+    """A lookup and a streamed export, both blocked until `release` is set."""
+    app = FastAPI()
+
+    @app.get("/g-nodes/{alias}")
+    async def lookup(alias: str) -> dict:
+        await release.wait()
+        return {"Alias": alias}
+
+    @app.get("/export/{collection}")
+    async def export(collection: str) -> StreamingResponse:
+        async def body():
+            yield f"{collection}\n".encode()
+            # The handler has returned; only the body is still running
+            await release.wait()
+            yield b"done\n"
+
+        return StreamingResponse(body())
+
+    @app.get("/metrics")
+    async def metrics() -> dict:
+        return {}
+
+    controller = AdmissionController(capacity, bulk_share=0.5, wait_budget_ms=50)
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    return app
+
+
+async def _settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def test_saturated_lane_sheds_with_retry_after() -> None:
+    async def scenario() -> None:
+        release = asyncio.Event()
+        app = blocking_app(capacity=2, release=release)
+        held = asyncio.create_task(request(app, "/g-nodes/d1.a"))
+        await _settle()
+        status, headers, _ = await request(app, "/g-nodes/d1.b")
+        assert status == 429
+        assert headers["retry-after"] == "1"
+        release.set()
+        assert (await held)[0] == 200
+        # The slot is free again
+        assert (await request(app, "/g-nodes/d1.c"))[0] == 200
+
+    asyncio.run(scenario())
+
+
+def test_streamed_export_holds_bulk_slot_not_interactive() -> None:
+    async def scenario() -> None:
+        release = asyncio.Event()
+        app = blocking_app(capacity=2, release=release)
+        export = asyncio.create_task(request(app, "/export/g-nodes"))
+        await _settle()
+        # The bulk slot is held for the whole body...
+        assert (await request(app, "/bulk/g-nodes"))[0] == 429
+        # ...while lookups and exempt paths still get through
+        lookup = asyncio.create_task(request(app, "/g-nodes/d1.a"))
+        assert (await request(app, "/metrics"))[0] == 200
+        release.set()
+        assert (await lookup)[0] == 200
+        status, _, body = await export
+        assert (status, body) == (200, b"g-nodes\ndone\n")
+
+    asyncio.run(scenario())
+
+
+def test_lanes_share_what_background_workers_leave() -> None:
+    settings = Settings(db_pool_size=5, db_max_overflow=3, admission_bulk_share=0.25)
+    controller = AdmissionController.from_settings(settings, background_connections=1)
+    assert (controller.bulk.slots, controller.interactive.slots) == (1, 6)
+
+    controller = AdmissionController(capacity=4, bulk_share=1.0, wait_budget_ms=10)
+    assert (controller.bulk.slots, controller.interactive.slots) == (3, 1)
+
+    with pytest.raises(ValueError, match="at least 2"):
+        AdmissionController.from_settings(
+            Settings(db_pool_size=1, db_max_overflow=0), background_connections=1
+        )
@@ -0,0 +1,108 @@
+import time
+import uuid
+from collections.abc import Iterator
+
+import pytest
+
+from gnr.db.batcher import BatcherStopped, WriteBatcher
+from gnr.db.models import GNodeSql
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+from gnr.sema.types import ConnectivityEdgeGt, GNodeGt, PositionPointGt
+
+
+def g_node(alias: str, **fields) -> GNodeGt:
+    return GNodeGt(
+        g_node_id=str(uuid.uuid4()),
+        alias=alias,
+        base_class=BaseGNodeClass.Logical,
+        g_node_class="Scada",
+        status=GNodeStatus.Active,
+        **fields,
+    )
+
+
+def outcomes(futures, timeout: float = 5.0) -> list[str]:
+    results = []
+    for future in futures:
+        error = future.exception(timeout)
+        results.append("ok" if error is None else type(error).__name__)
+    return results
+
+
+@pytest.fixture
+def batcher(db_factory) -> Iterator[WriteBatcher]:
+    # Long enough that everything submitted together shares one batch
+    batcher = WriteBatcher(db_factory, max_latency_ms=100)
+    batcher.start()
+    yield batcher
+    batcher.stop()
+
+
+def test_bad_row_fails_only_its_own_caller(batcher, db_factory, tracing) -> None:
+    first, duplicate, last = g_node("d1.a"), g_node("d1.a"), g_node("d1.b")
+    futures = [batcher.submit(gt) for gt in (first, duplicate, last)]
+    assert outcomes(futures) == ["ok", "IntegrityError", "ok"]
+    assert futures[0].result() is first
+    with db_factory() as session:
+        assert {row.alias for row in session.query(GNodeSql)} == {"d1.a", "d1.b"}
+    if tracing is not None:
+        batches = [s for s in tracing.spans if s.name == "db.write_batch"]
+        assert [s.attributes["rows"] for s in batches] == [3]
+
+
+def test_rows_see_earlier_rows_of_their_batch(batcher) -> None:
+    point = PositionPointGt(
+        id=str(uuid.uuid4()), latitude_micro_deg=1, longitude_micro_deg=2
+    )
+    parent = g_node("d1.parent", position_point_id=point.id)
+    child = g_node("d1.parent.child")
+    edge = ConnectivityEdgeGt(
+        id=str(uuid.uuid4()),
+        from_g_node_id=parent.g_node_id,
+        to_g_node_id=child.g_node_id,
+        from_g_node_alias=parent.alias,
+        to_g_node_alias="d1.wrong",
+        status=GNodeStatus.Active,
+    )
+    missing_point = g_node("d1.other", position_point_id=str(uuid.uuid4()))
+    futures = [batcher.submit(gt) for gt in (point, parent, child, edge, missing_point)]
+    assert outcomes(futures) == ["ok", "ok", "ok", "WriteRejected", "WriteRejected"]
+    assert "alias d1.wrong does not match" in str(futures[3].exception())
+
+
+def test_max_latency_bounds_a_lone_write(db_factory) -> None:
+    batcher = WriteBatcher(db_factory, max_latency_ms=50)
+    batcher.start()
+    try:
+        start = time.perf_counter()
+        batcher.submit(g_node("d1.a")).result(5)
+        # Waited for company no longer than the latency budget (plus the write)
+        assert time.perf_counter() - start < 1.0
+    finally:
+        batcher.stop()
+
+
+def test_full_batch_does_not_wait_for_latency(db_factory, exporter) -> None:
+    batcher = WriteBatcher(db_factory, max_batch_size=2, max_latency_ms=10_000)
+    batcher.start()
+    try:
+        futures = [batcher.submit(g_node(f"d1.n{i}")) for i in range(4)]
+        assert outcomes(futures, timeout=5.0) == ["ok"] * 4
+    finally:
+        batcher.stop()
+    batches = [s for s in exporter.spans if s.name == "db.write_batch"]
+    assert [s.attributes["rows"] for s in batches] == [2, 2]
+
+
+def test_submit_after_stop_is_refused(db_factory) -> None:
+    batcher = WriteBatcher(db_factory)
+    with pytest.raises(BatcherStopped):
+        batcher.submit(g_node("d1.a"))
+    batcher.start()
+    future = batcher.submit(g_node("d1.a"))
+    batcher.stop()
+    # Submitted before stop: written, not dropped
+    assert future.result(5).alias == "d1.a"
+    with pytest.raises(BatcherStopped):
+        batcher.submit(g_node("d1.b"))
+
@@ -0,0 +1,48 @@
+import uuid
+
+import pytest
+
+from gnr.ingest import bulk_format
+from gnr.sema import property_format
+
+UUID = str(uuid.uuid4())
+NUL = "\x00"
+
+
+def _scalar_invalid(check, values) -> list[int]:
+    invalid = []
+    for i, value in enumerate(values):
+        try:
+            check(value)
+        except (TypeError, ValueError):
+            invalid.append(i)
+    return invalid
+
+
+@pytest.mark.parametrize(
+    "bulk, scalar, values",
+    [
+        (
+            bulk_format.invalid_left_right_dot,
+            property_format.is_left_right_dot,
+            ["abc", "abc" + NUL, "a.b" + NUL, "a" + NUL + "b", "a.b", None],
+        ),
+        (
+            bulk_format.invalid_handle_name,
+            property_format.is_handle_name,
+            ["abc", "abc" + NUL, "a-b" + NUL],
+        ),
+        (
+            bulk_format.invalid_spaceheat_name,
+            property_format.is_spaceheat_name,
+            ["abc", "abc" + NUL, "a.b-c" + NUL],
+        ),
+        (
+            bulk_format.invalid_uuid4_str,
+            property_format.is_uuid4_str,
+            [UUID, UUID + NUL, NUL + UUID, UUID.upper(), 7],
+        ),
+    ],
+)
+def test_bulk_matches_scalar_on_trailing_nuls(bulk, scalar, values) -> None:
+    assert list(bulk(values)) == _scalar_invalid(scalar, values)
@@ -0,0 +1,177 @@
+"""
+Round-trip properties of the msgpack wire format: every message decodes
+back to the value it was encoded from, and to the same value the JSON
+path gives.
+"""
+
+import uuid
+from typing import Literal
+
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from gnr.sema.base import SemaError, SemaType
+from gnr.sema.codec import SemaCodec, WireFormat
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+from gnr.sema.property_format import UUID4Str
+from gnr.sema.types import ConnectivityEdgeGt, GNodeGt, PositionPointGt
+
+msgpack = pytest.importorskip("msgpack")
+
+codec = SemaCodec()
+
+uuid4s = st.uuids(version=4).map(str)
+aliases = st.from_regex(r"[a-z][a-z0-9]{0,8}(\.[a-z0-9]{1,8}){0,5}", fullmatch=True)
+statuses = st.sampled_from(GNodeStatus)
+
+
+
+@st.composite
+def position_points(draw: st.DrawFn) -> PositionPointGt:
+    return PositionPointGt(
+        id=draw(uuid4s),
+        latitude_micro_deg=draw(st.integers(-90_000_000, 90_000_000)),
+        longitude_micro_deg=draw(st.integers(-180_000_000, 180_000_000)),
+    )
+
+
+@st.composite
+def g_nodes(draw: st.DrawFn) -> GNodeGt:
+    base_class = draw(st.sampled_from(BaseGNodeClass))
+    physical = base_class is not BaseGNodeClass.Logical
+    alias = draw(aliases)
+    return GNodeGt(
+        g_node_id=draw(uuid4s),
+        alias=alias,
+        base_class=base_class,
+        g_node_class=base_class.value if physical else draw(st.text(min_size=1)),
+        status=draw(statuses),
+        prev_alias=draw(st.none() | aliases.filter(lambda a: a != alias)),
+        position_point_id=draw(uuid4s if physical else st.none() | uuid4s),
+        display_name=draw(st.none() | st.text()),
+    )
+
+
+@st.composite
+def connectivity_edges(draw: st.DrawFn) -> ConnectivityEdgeGt:
+    from_id, to_id = draw(st.lists(uuid4s, min_size=2, max_size=2, unique=True))
+    return ConnectivityEdgeGt(
+        id=draw(uuid4s),
+        from_g_node_id=from_id,
+        to_g_node_id=to_id,
+        from_g_node_alias=draw(aliases),
+        to_g_node_alias=draw(aliases),
+        status=draw(statuses),
+    )
+
+
+messages = position_points() | g_nodes() | connectivity_edges()
+
+# The first st.text() draw in a fresh checkout builds Hypothesis's
+# unicode cache, which alone can exceed the too_slow budget
+unicode_cache_warmup = settings(suppress_health_check=[HealthCheck.too_slow])
+
+
+@unicode_cache_warmup
+@given(messages)
+def test_msgpack_round_trip(msg) -> None:  # noqa: ANN001
+    packed = codec.to_bytes(msg, WireFormat.MsgPack)
+    assert codec.from_bytes(packed, WireFormat.MsgPack) == msg
+
+
+@unicode_cache_warmup
+@given(messages)
+def test_msgpack_matches_json(msg) -> None:  # noqa: ANN001
+    from_json = codec.from_bytes(codec.to_bytes(msg))
+    from_msgpack = codec.from_bytes(codec.to_bytes(msg, WireFormat.MsgPack), WireFormat.MsgPack)
+    assert from_msgpack == from_json
+    assert from_msgpack.to_bytes() == from_json.to_bytes()
+
+
+@unicode_cache_warmup
+@given(st.lists(messages, max_size=20), st.sampled_from(WireFormat))
+def test_stream_round_trip(msgs, wire_format) -> None:  # noqa: ANN001
+    body = b"".join(codec.frame(msg, wire_format) for msg in msgs)
+    decoded = [
+        codec.from_frame(frame, wire_format)
+        for _, frame in codec.iter_frames(body, wire_format)
+    ]
+    assert decoded == msgs
+
+
+def test_msgpack_is_smaller() -> None:
+    edge = ConnectivityEdgeGt(
+        id="1027c4d1-c386-4bc4-8d61-3e30d8f16adf",
+        from_g_node_id="c2ce6f44-7ed4-457b-9e2f-eb89414c343c",
+        to_g_node_id="3e8f5b0a-6a36-4b0e-9a6e-8c2b1f0d7e55",
+        from_g_node_alias="m0.c3.c1.l7",
+        to_g_node_alias="m0.c3.c1.l7.ta",
+        status=GNodeStatus.Active,
+    )
+    assert len(codec.to_bytes(edge, WireFormat.MsgPack)) < len(codec.to_bytes(edge)) * 0.5
+
+
+class PositionPointV0(SemaType):
+    """A pre-versioning position point in whole degrees."""
+
+    id: UUID4Str
+    latitude_deg: float
+    longitude_deg: float
+    type_name: Literal["position.point.gt"] = "position.point.gt"
+    version: None = None
+
+    def to_latest(self) -> PositionPointGt:
+        return PositionPointGt(
+            id=self.id,
+            latitude_micro_deg=round(self.latitude_deg * 1_000_000),
+            longitude_micro_deg=round(self.longitude_deg * 1_000_000),
+        )
+
+
+def test_old_version_msgpack_frame_is_translated() -> None:
+    old_codec = SemaCodec()
+    old_codec.__dict__["old_versions"] = {"position.point.gt": {None: PositionPointV0}}
+    point_id = "8f8a5d4e-6c1b-4b7e-9a3f-2d1c0b9e8a7f"
+    frame = msgpack.packb(
+        ["position.point.gt", None, uuid.UUID(point_id).bytes, 45.5, -68.25],
+        use_bin_type=True,
+    )
+    assert old_codec.from_bytes(frame, WireFormat.MsgPack) == PositionPointGt(
+        id=point_id, latitude_micro_deg=45_500_000, longitude_micro_deg=-68_250_000
+    )
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"\x91\x01",  # [1]
+        b"\x92\xa3abc\x01",  # ["abc", 1]
+        b"\x93\xb4connectivity.edge.gt\xa3000\xa4uuid",  # UUID not 16 bytes
+        b"\xc1",  # never used
+    ],
+)
+def test_malformed_msgpack_is_rejected(payload: bytes) -> None:
+    with pytest.raises((SemaError, ValueError)):
+        codec.from_bytes(payload, WireFormat.MsgPack)
+
+
+@pytest.mark.parametrize("data", [[1], "g.node.gt", 3, None])
+def test_non_object_is_rejected(data) -> None:  # noqa: ANN001
+    with pytest.raises(ValueError, match="must be an object"):
+        codec.decode(data)
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, WireFormat.Json),
+        ("*/*", WireFormat.Json),
+        (WireFormat.MsgPack.value, WireFormat.MsgPack),
+        (f"application/json;q=0.5, {WireFormat.MsgPack.value}", WireFormat.MsgPack),
+        (f"application/json, {WireFormat.MsgPack.value};q=0.9", WireFormat.Json),
+        (f"{WireFormat.MsgPack.value};q=0", WireFormat.Json),
+    ],
+)
+def test_negotiate(accept: str | None, expected: WireFormat) -> None:
+    assert WireFormat.negotiate(accept) is expected
@@ -0,0 +1,230 @@
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import Engine, func, select
+
+from gnr.config import Settings
+from gnr.db.models import Base, GNodeSql, PositionPointSql
+from gnr.db.session import make_engine
+from gnr.ingest.dedup import (
+    DedupPolicy,
+    PointDeduplicator,
+    SpatialIndex,
+    compact_position_points,
+)
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+from gnr.sema.types import GNodeGt, PositionPointGt
+
+TOLERANCE = 10
+
+
+def _id() -> str:
+    return str(uuid.uuid4())
+
+
+def _point(lat: int, lon: int) -> PositionPointGt:
+    return PositionPointGt(id=_id(), latitude_micro_deg=lat, longitude_micro_deg=lon)
+
+
+def _g_node(alias: str, point: PositionPointGt) -> GNodeGt:
+    return GNodeGt(
+        g_node_id=_id(),
+        alias=alias,
+        base_class=BaseGNodeClass.TerminalAsset,
+        g_node_class="TerminalAsset",
+        status=GNodeStatus.Active,
+        position_point_id=point.id,
+    )
+
+
+# ============================================================================
+# SpatialIndex
+# ============================================================================
+
+@pytest.mark.parametrize(
+    ("lat", "lon"),
+    [
+        (45_000_000, -68_000_000),
+        # Either side of zero, where the grid cells change sign
+        (-5, 5),
+        (0, -1),
+        (-90_000_000, 180_000_000),
+    ],
+)
+def test_match_at_tolerance_but_not_past_it(lat: int, lon: int) -> None:
+    index = SpatialIndex(TOLERANCE)
+    index.add("p", lat, lon)
+    for d_lat, d_lon in [(0, 0), (TOLERANCE, 0), (-TOLERANCE, TOLERANCE), (0, -TOLERANCE)]:
+        assert index.nearest(lat + d_lat, lon + d_lon) == "p"
+    for d_lat, d_lon in [(TOLERANCE + 1, 0), (0, -TOLERANCE - 1), (-TOLERANCE - 1, TOLERANCE)]:
+        assert index.nearest(lat + d_lat, lon + d_lon) is None
+
+
+def test_match_across_a_negative_cell_boundary() -> None:
+    index = SpatialIndex(TOLERANCE)
+    # -11 // 10 == -2 and -1 // 10 == -1: neighbouring cells
+    index.add("p", -11, -11)
+    assert index.nearest(-1, -1) == "p"
+    assert index.nearest(-1, -22) is None
+
+
+def test_nearest_prefers_the_closest_point() -> None:
+    index = SpatialIndex(TOLERANCE)
+    index.add("far", 0, 9)
+    index.add("near", 0, 2)
+    assert index.nearest(0, 0) == "near"
+
+
+def test_zero_tolerance_matches_only_exact_points() -> None:
+    index = SpatialIndex(0)
+    index.add("p", 5, 5)
+    assert index.nearest(5, 5) == "p"
+    assert index.nearest(5, 6) is None
+
+
+# ============================================================================
+# PointDeduplicator
+# ============================================================================
+
+def _stream() -> tuple[list, PositionPointGt, PositionPointGt]:
+    first = _point(45_000_000, -68_000_000)
+    dup = _point(45_000_000 + TOLERANCE, -68_000_000 - TOLERANCE)
+    other = _point(45_000_000 + TOLERANCE + 1, -68_000_000)
+    stream = [first, dup, other, _g_node("a.first", first), _g_node("a.dup", dup)]
+    return stream, first, dup
+
+
+def test_reuse_drops_duplicates_and_repoints_g_nodes() -> None:
+    stream, first, dup = _stream()
+    deduper = PointDeduplicator(TOLERANCE, DedupPolicy.Reuse)
+    out = list(deduper.filter(stream))
+    assert dup not in out
+    assert len(out) == 4
+    assert [g.position_point_id for g in out if g.type_name == "g.node.gt"] == [first.id] * 2
+    stats = deduper.stats
+    assert (stats.points, stats.reused, stats.flagged, stats.rewritten_g_nodes) == (3, 1, 0, 1)
+    assert stats.duplicates == [(dup.id, first.id)]
+
+
+def test_flag_keeps_everything() -> None:
+    stream, first, dup = _stream()
+    deduper = PointDeduplicator(TOLERANCE, DedupPolicy.Flag)
+    assert list(deduper.filter(stream)) == stream
+    stats = deduper.stats
+    assert (stats.points, stats.reused, stats.flagged, stats.rewritten_g_nodes) == (3, 0, 1, 0)
+    assert stats.duplicates == [(dup.id, first.id)]
+
+
+def test_stored_points_are_matched(db_factory) -> None:  # noqa: ANN001
+    stored = _point(1_000, 1_000)
+    with db_factory() as session:
+        session.add(PositionPointSql.from_gt(stored))
+        session.commit()
+        deduper = PointDeduplicator(TOLERANCE)
+        deduper.load(session)
+    new = _point(1_000 - TOLERANCE, 1_000)
+    g_node = _g_node("s.node", new)
+    assert list(deduper.filter([new, g_node])) == [
+        g_node.model_copy(update={"position_point_id": stored.id})
+    ]
+
+
+# ============================================================================
+# compact_position_points
+# ============================================================================
+
+@pytest.fixture
+def engine(tmp_path) -> Iterator[Engine]:  # noqa: ANN001
+    engine = make_engine(Settings(db_url=f"sqlite:///{tmp_path}/gnr.db"))
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _store(engine: Engine, *points: PositionPointGt, g_nodes: tuple = ()) -> None:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    with engine.begin() as conn:
+        for age, point in enumerate(points):
+            row = PositionPointSql.from_gt(point)
+            conn.execute(PositionPointSql.__table__.insert().values(
+                id=row.id,
+                latitude_micro_deg=row.latitude_micro_deg,
+                longitude_micro_deg=row.longitude_micro_deg,
+                created_at=start + timedelta(minutes=age),
+            ))
+        for g_node in g_nodes:
+            row = GNodeSql.from_gt(g_node)
+            conn.execute(GNodeSql.__table__.insert().values(
+                id=row.id,
+                alias=row.alias,
+                base_class=row.base_class,
+                g_node_class=row.g_node_class,
+                status=row.status,
+                position_point_id=row.position_point_id,
+                created_at=start,
+            ))
+
+
+def _cluster() -> tuple[PositionPointGt, list[PositionPointGt], PositionPointGt]:
+    oldest = _point(-1, -1)
+    # Every point is within tolerance of the oldest, some across the zero cell line
+    dups = [_point(-1 + TOLERANCE, -1), _point(-1, 5), _point(3, -1 - TOLERANCE)]
+    distinct = _point(-1, -1 + 2 * TOLERANCE)
+    return oldest, dups, distinct
+
+
+def test_compaction_keeps_the_oldest_and_repoints_g_nodes(engine: Engine) -> None:
+    oldest, dups, distinct = _cluster()
+    g_nodes = tuple(_g_node(f"c.n{i}", p) for i, p in enumerate([oldest, *dups, distinct]))
+    _store(engine, oldest, *dups, distinct, g_nodes=g_nodes)
+
+    stats = compact_position_points(engine, TOLERANCE, batch_size=2)
+    assert (stats.points, stats.merged, stats.rewritten_g_nodes) == (5, 3, 3)
+    with engine.connect() as conn:
+        ids = set(conn.execute(select(PositionPointSql.id)).scalars())
+        assert ids == {oldest.id, distinct.id}
+        pointed = conn.execute(
+            select(GNodeSql.alias, GNodeSql.position_point_id).order_by(GNodeSql.alias)
+        ).all()
+        assert pointed == [
+            ("c.n0", oldest.id), ("c.n1", oldest.id), ("c.n2", oldest.id),
+            ("c.n3", oldest.id), ("c.n4", distinct.id),
+        ]
+        dangling = conn.execute(
+            select(func.count()).select_from(GNodeSql)
+            .where(GNodeSql.position_point_id.not_in(select(PositionPointSql.id)))
+        ).scalar()
+        assert dangling == 0
+        # The temporary merge table is gone with its batches
+        assert conn.dialect.has_table(conn, "gnr_position_point_merges") is False
+
+    again = compact_position_points(engine, TOLERANCE)
+    assert (again.points, again.merged, again.rewritten_g_nodes) == (2, 0, 0)
+
+
+def test_compaction_keeps_the_oldest_not_the_first_stored(engine: Engine) -> None:
+    # Pairwise within tolerance, across the zero cell lines
+    points = [_point(0, 0), _point(-3, 4), _point(5, -5), _point(2, 2)]
+    _store(engine, *points)
+    with engine.begin() as conn:
+        conn.execute(
+            PositionPointSql.__table__.update()
+            .where(PositionPointSql.id == points[-1].id)
+            .values(created_at=datetime(2025, 1, 1, tzinfo=UTC))
+        )
+    assert compact_position_points(engine, TOLERANCE).merged == 3
+    with engine.connect() as conn:
+        assert list(conn.execute(select(PositionPointSql.id)).scalars()) == [points[-1].id]
+
+
+def test_dry_run_writes_nothing(engine: Engine) -> None:
+    oldest, dups, distinct = _cluster()
+    g_nodes = (_g_node("d.n", dups[0]),)
+    _store(engine, oldest, *dups, distinct, g_nodes=g_nodes)
+    stats = compact_position_points(engine, TOLERANCE, dry_run=True)
+    assert (stats.points, stats.merged, stats.rewritten_g_nodes) == (5, 3, 0)
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(PositionPointSql)).scalar() == 5
+        assert conn.execute(select(GNodeSql.position_point_id)).scalar() == dups[0].id
@@ -0,0 +1,70 @@
+import pytest
+
+from gnr.sema.base import SemaError
+from gnr.sema.codec import DecodePath, SemaCodec
+from gnr.sema.descriptor import FieldKind, TypeDescriptor
+from gnr.sema.enums import GNodeStatus
+from gnr.sema.types import ConnectivityEdgeGt, GNodeGt
+
+EDGE = ConnectivityEdgeGt(
+    id="1027c4d1-c386-4bc4-8d61-3e30d8f16adf",
+    from_g_node_id="c2ce6f44-7ed4-457b-9e2f-eb89414c343c",
+    to_g_node_id="3e8f5b0a-6a36-4b0e-9a6e-8c2b1f0d7e55",
+    from_g_node_alias="m0.c3",
+    to_g_node_alias="m0.c3.ta",
+    status=GNodeStatus.Active,
+)
+
+
+def test_key_memo_is_bounded_by_known_fields() -> None:
+    desc = TypeDescriptor.of(GNodeGt)
+    for i in range(1_000):
+        assert not desc.accepts(f"Unknown{i}")
+    assert desc.accepts("GNodeId")
+    assert desc.accepts("gNodeId")
+    assert desc._key_memo == {"gNodeId"}
+
+
+def test_required_and_optional_uuid_fields_are_described_as_uuids() -> None:
+    kinds = {f.name: f.kind for f in TypeDescriptor.of(GNodeGt).fields}
+    assert kinds["g_node_id"] is FieldKind.Uuid
+    assert kinds["position_point_id"] is FieldKind.Uuid
+    assert kinds["alias"] is FieldKind.Plain
+    assert kinds["status"] is FieldKind.Enum
+
+
+def test_unknown_version_decodes_leniently() -> None:
+    future = {**EDGE.to_dict(), "Version": "999", "AddedLater": 1, "AlsoNew": "x"}
+    result = SemaCodec().decode(future)
+    assert result.path is DecodePath.Lenient
+    assert result.value == EDGE
+    assert result.dropped_fields == ("AddedLater", "AlsoNew")
+
+
+def test_lenient_decode_without_unknown_keys_drops_nothing() -> None:
+    result = SemaCodec().decode({**EDGE.to_dict(), "Version": "999"})
+    assert result.path is DecodePath.Lenient
+    assert result.dropped_fields == ()
+
+
+def test_current_version_is_not_lenient() -> None:
+    codec = SemaCodec()
+    result = codec.decode(EDGE.to_dict())
+    assert (result.path, result.dropped_fields) == (DecodePath.Current, ())
+    with pytest.raises(SemaError):
+        codec.decode({**EDGE.to_dict(), "AddedLater": 1})
+
+
+def test_lenient_decode_still_needs_required_fields() -> None:
+    future = {**EDGE.to_dict(), "Version": "999"}
+    del future["ToGNodeAlias"]
+    with pytest.raises(SemaError, match="missing ToGNodeAlias"):
+        SemaCodec().decode(future)
+
+
+def test_lenient_decodes_do_not_grow_the_key_memo() -> None:
+    codec = SemaCodec()
+    for i in range(100):
+        codec.decode({**EDGE.to_dict(), "Version": "999", f"New{i}": i})
+    desc = codec.descriptors[("connectivity.edge.gt", "000")]
+    assert desc._key_memo == set()
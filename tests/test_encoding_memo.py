@@ -0,0 +1,77 @@
+"""
+The memoized canonical encoding: per instance on SemaType, and shared
+between equal instances through the codec's EncodingCache.
+"""
+
+from gnr.sema.base import _CONTENT_HASH_KEY, _ENCODED_BYTES_KEY
+from gnr.sema.codec import EncodingCache, SemaCodec
+from gnr.sema.types import PositionPointGt
+
+ID = "8f8a5d4e-6c1b-4b7e-9a3f-2d1c0b9e8a7f"
+
+
+def _point(latitude: int = 45_000_000) -> PositionPointGt:
+    return PositionPointGt(id=ID, latitude_micro_deg=latitude, longitude_micro_deg=-68_000_000)
+
+
+def test_memo_is_reused_and_not_dumped() -> None:
+    point = _point()
+    digest = point.content_hash()
+    assert point.__dict__[_CONTENT_HASH_KEY] == digest
+    encoded = point.__dict__[_ENCODED_BYTES_KEY]
+    assert point.to_bytes() is encoded
+    assert point.content_hash() is digest
+    assert set(point.model_dump()) == set(PositionPointGt.model_fields)
+    assert _CONTENT_HASH_KEY.encode() not in point.model_dump_json().encode()
+
+
+def test_memo_does_not_affect_equality() -> None:
+    hashed, fresh = _point(), _point()
+    hashed.content_hash()
+    assert hashed == fresh
+    assert hash(hashed) == hash(fresh)
+
+
+def test_copy_with_update_drops_stale_memo() -> None:
+    point = _point()
+    point.content_hash()
+    moved = point.model_copy(update={"latitude_micro_deg": 46_000_000})
+    assert _CONTENT_HASH_KEY not in moved.__dict__
+    assert moved.content_hash() == _point(46_000_000).content_hash()
+    assert moved.content_hash() != point.content_hash()
+    # A plain copy has the same value, so the memo may stay
+    assert point.model_copy().__dict__[_CONTENT_HASH_KEY] == point.content_hash()
+
+
+def test_equal_instances_share_one_content_hash() -> None:
+    assert _point().content_hash() == _point().content_hash()
+    assert _point().content_hash() != _point(0).content_hash()
+
+
+def test_codec_shares_encodings_between_equal_instances() -> None:
+    codec = SemaCodec()
+    first, second = _point(), _point()
+    encoded = codec.to_bytes(first)
+    assert len(codec.encode_cache) == 1
+    assert _ENCODED_BYTES_KEY not in second.__dict__
+    assert codec.to_bytes(second) is encoded
+    assert second.__dict__[_ENCODED_BYTES_KEY] is encoded
+
+
+def test_encoding_cache_evicts_least_recently_used() -> None:
+    cache = EncodingCache(maxsize=2)
+    a, b, c = _point(1), _point(2), _point(3)
+    cache.put(a, b"a")
+    cache.put(b, b"b")
+    assert cache.get(a) == b"a"  # b is now the oldest
+    cache.put(c, b"c")
+    assert len(cache) == 2
+    assert cache.get(b) is None
+    assert cache.get(a) == b"a"
+    assert cache.get(c) == b"c"
+
+
+def test_zero_size_cache_is_bypassed() -> None:
+    codec = SemaCodec(encode_cache_size=0)
+    codec.to_bytes(_point())
+    assert len(codec.encode_cache) == 0
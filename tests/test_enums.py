@@ -0,0 +1,120 @@
+"""
+Symbol tables of the SymbolizedEnums and their smallint storage through
+the SymbolEnum column type.
+"""
+
+from enum import auto
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from gnr.db.models import Base, GNodeSql
+from gnr.db.types import SymbolEnum
+from gnr.sema.enums import BaseGNodeClass, GNodeClass, GNodeStatus
+from gnr.sema.enums.gw_str_enum import SymbolizedEnum
+
+ENUMS = (BaseGNodeClass, GNodeClass, GNodeStatus)
+DIALECT = sqlite.dialect()
+
+
+class Color(SymbolizedEnum):
+    """No default member."""
+
+    Red = auto()
+    Green = auto()
+
+    @classmethod
+    def symbol_map(cls) -> dict[str, str]:
+        return {"Red": "0", "Green": "1"}
+
+
+@pytest.mark.parametrize("enum_cls", ENUMS)
+def test_symbol_map_covers_every_member_once(enum_cls) -> None:  # noqa: ANN001
+    symbols = enum_cls.symbol_map()
+    assert set(symbols) == set(enum_cls.values())
+    assert len(set(symbols.values())) == len(symbols)
+    assert all(s.isdecimal() for s in symbols.values())
+    for member in enum_cls:
+        assert enum_cls.from_symbol(member.symbol) is member
+        assert enum_cls.symbol_to_value(member.symbol) == member.value
+        assert enum_cls.value_to_symbol(member.value) == member.symbol
+
+
+def test_unknown_symbol_gives_default_unless_strict() -> None:
+    assert GNodeStatus.from_symbol("99") is GNodeStatus.Pending
+    with pytest.raises(ValueError, match="not a valid GNodeStatus symbol"):
+        GNodeStatus.from_symbol("99", strict=True)
+    with pytest.raises(ValueError, match="not a valid Color symbol"):
+        Color.from_symbol("99")
+
+
+def test_missing_value_falls_back_to_default() -> None:
+    assert GNodeClass("AtnCloud") is GNodeClass.Unknown
+    assert BaseGNodeClass("Nope") is BaseGNodeClass.Logical
+    assert GNodeStatus.value_to_symbol("Nope") == GNodeStatus.Pending.symbol
+    with pytest.raises(ValueError, match="not valid Color"):
+        Color("Blue")
+    with pytest.raises(ValueError, match="not valid Color"):
+        Color.value_to_symbol("Blue")
+
+
+def test_symbols_are_not_values() -> None:
+    # JSON at the Sema boundary carries values, never symbols
+    assert GNodeStatus("1") is GNodeStatus.Pending
+
+
+def test_incomplete_symbol_map_is_rejected() -> None:
+    class Partial(SymbolizedEnum):
+        One = auto()
+        Two = auto()
+
+        @classmethod
+        def symbol_map(cls) -> dict[str, str]:
+            return {"One": "0"}
+
+    with pytest.raises(ValueError, match="must cover exactly"):
+        Partial.One.symbol  # noqa: B018
+
+
+def test_symbol_enum_binds_and_loads_strictly() -> None:
+    column = SymbolEnum(GNodeStatus)
+    assert column.process_bind_param(GNodeStatus.Active, DIALECT) == 1
+    assert column.process_bind_param("Suspended", DIALECT) == 2
+    assert column.process_bind_param(None, DIALECT) is None
+    # No fallback to the default: that would rewrite the value
+    with pytest.raises(ValueError, match="not a valid GNodeStatus"):
+        column.process_bind_param("Nope", DIALECT)
+
+    assert column.process_result_value(3, DIALECT) is GNodeStatus.PermanentlyDeactivated
+    assert column.process_result_value(None, DIALECT) is None
+    with pytest.raises(ValueError, match="Stored code 9"):
+        column.process_result_value(9, DIALECT)
+
+
+def test_symbol_enum_stores_smallints(tmp_path) -> None:  # noqa: ANN001
+    engine = create_engine(f"sqlite:///{tmp_path}/gnr.db")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(GNodeSql(
+            id="8f8a5d4e-6c1b-4b7e-9a3f-2d1c0b9e8a7f",
+            alias="e1",
+            base_class=BaseGNodeClass.Logical,
+            g_node_class="AtnCloud",
+            status=GNodeStatus.Active,
+        ))
+        session.commit()
+        row = session.execute(
+            text("SELECT base_class, g_node_class, status FROM g_nodes")
+        ).one()
+        assert tuple(row) == (4, "AtnCloud", 1)
+        g_node = session.get(GNodeSql, "8f8a5d4e-6c1b-4b7e-9a3f-2d1c0b9e8a7f")
+        assert g_node.status is GNodeStatus.Active
+        assert g_node.base_class is BaseGNodeClass.Logical
+
+        session.execute(text("UPDATE g_nodes SET status = 9"))
+        session.expire_all()
+        with pytest.raises(ValueError, match="Stored code 9"):
+            session.get(GNodeSql, "8f8a5d4e-6c1b-4b7e-9a3f-2d1c0b9e8a7f")
+    engine.dispose()
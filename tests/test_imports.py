@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROBE = """
+import json, sys
+import {module}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+# What each entry module must not pull in at import time
+HEAVY = {
+    "gnr.cli": {"pydantic", "numpy", "sqlalchemy", "fastapi", "gnr.sema.types"},
+    "gnr.db.models": {"pydantic", "numpy", "fastapi", "gnr.sema.types"},
+}
+
+
+@pytest.mark.parametrize("module", sorted(HEAVY))
+def test_import_stays_light(module: str) -> None:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    ).stdout
+    modules = json.loads(out)
+    loaded = {name.partition(".")[0] for name in modules} | set(modules)
+    assert not HEAVY[module] & loaded
@@ -0,0 +1,21 @@
+import logging
+import time
+
+import pytest
+
+from gnr.log import ThrottledLogger
+
+
+def test_burst_is_summarized_when_window_closes(caplog: pytest.LogCaptureFixture) -> None:
+    throttled = ThrottledLogger(logging.getLogger("gnr.test"), window_s=0.1)
+    with caplog.at_level(logging.WARNING, logger="gnr.test"):
+        for i in range(50):
+            throttled.warning("key", "Translating %s", i)
+        # The burst just stops: no later record for the key arrives
+        deadline = time.monotonic() + 5
+        while len(caplog.records) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[0] == "Translating 0"
+    assert messages[1].startswith("Translating 49 (x49 more over ")
+    assert len(messages) == 2
@@ -0,0 +1,173 @@
+import json
+from typing import Literal
+
+import pytest
+
+from gnr.migrator import ArchiveMigrator
+from gnr.sema.base import SemaError, SemaType
+from gnr.sema.codec import SemaCodec
+from gnr.sema.migration import compile_plan
+
+
+class WidgetGt(SemaType):
+    name: str
+    size_mm: int
+    type_name: Literal["widget.gt"] = "widget.gt"
+    version: Literal["002"] = "002"
+
+
+class Widget001(SemaType):
+    name: str
+    size_cm: int
+    type_name: Literal["widget.gt"] = "widget.gt"
+    version: Literal["001"] = "001"
+
+    def to_next(self) -> WidgetGt:
+        return WidgetGt(name=self.name, size_mm=self.size_cm * 10)
+
+
+class Widget000(SemaType):
+    label: str
+    size_cm: int
+    type_name: Literal["widget.gt"] = "widget.gt"
+    version: Literal["000"] = "000"
+
+    def to_next(self) -> Widget001:
+        return Widget001(name=self.label, size_cm=self.size_cm)
+
+
+class SkippingWidget000(Widget000):
+    """Annotated to jump straight past v001."""
+
+    def to_next(self) -> WidgetGt:
+        return WidgetGt(name=self.label, size_mm=self.size_cm * 10)
+
+
+class UnannotatedSkippingWidget000(Widget000):
+    def to_next(self):  # noqa: ANN201
+        return WidgetGt(name=self.label, size_mm=self.size_cm * 10)
+
+
+class LatestWidget000(Widget000):
+    def to_latest(self) -> WidgetGt:
+        return WidgetGt(name=self.label, size_mm=self.size_cm * 10)
+
+
+OLD = {"000": Widget000, "001": Widget001}
+
+
+def test_plan_chains_each_hop_in_version_order() -> None:
+    plan = compile_plan(WidgetGt, OLD, "000")
+    assert len(plan) == 2
+    assert plan.targets == ("001", "002")
+    migrated = plan.apply(Widget000(label="w", size_cm=3))
+    assert migrated == WidgetGt(name="w", size_mm=30)
+    assert len(compile_plan(WidgetGt, OLD, "001")) == 1
+
+
+def test_to_latest_ends_the_chain() -> None:
+    plan = compile_plan(WidgetGt, {**OLD, "000": LatestWidget000}, "000")
+    assert plan.targets == ("002",)
+    assert plan.apply(LatestWidget000(label="w", size_cm=1)).size_mm == 10
+
+
+def test_annotated_hop_that_skips_a_version_fails_to_compile() -> None:
+    with pytest.raises(SemaError, match="next version of widget.gt is v001"):
+        compile_plan(WidgetGt, {**OLD, "000": SkippingWidget000}, "000")
+
+
+def test_unannotated_hop_that_skips_a_version_fails_on_apply() -> None:
+    plan = compile_plan(WidgetGt, {**OLD, "000": UnannotatedSkippingWidget000}, "000")
+    with pytest.raises(SemaError, match="expected widget.gt v001"):
+        plan.apply(UnannotatedSkippingWidget000(label="w", size_cm=1))
+
+
+def test_class_registered_under_another_version_fails_to_compile() -> None:
+    with pytest.raises(SemaError, match="declares v001"):
+        compile_plan(WidgetGt, {"000": Widget001, "001": Widget001}, "000")
+
+
+# ============================================================================
+# ArchiveMigrator
+# ============================================================================
+
+@pytest.fixture
+def codec() -> SemaCodec:
+    codec = SemaCodec()
+    codec.__dict__["registry"] = {"widget.gt": WidgetGt}
+    codec.__dict__["old_versions"] = {"widget.gt": OLD}
+    return codec
+
+
+def _line(**fields) -> bytes:
+    return json.dumps(fields).encode() + b"\n"
+
+
+OLD_LINE = _line(TypeName="widget.gt", Version="000", Label="a", SizeCm=2)
+CURRENT_LINE = _line(TypeName="widget.gt", Version="002", Name="b", SizeMm=5)
+MISSING_FIELD_LINE = _line(TypeName="widget.gt", Version="001", Name="c")
+ARCHIVE = [OLD_LINE, CURRENT_LINE, b"not json\n", MISSING_FIELD_LINE, b"\n", OLD_LINE]
+
+
+def _expected(codec: SemaCodec) -> bytes:
+    upgraded = codec.to_bytes(WidgetGt(name="a", size_mm=20)) + b"\n"
+    return b"".join(upgraded if line == OLD_LINE else line for line in ARCHIVE)
+
+
+def test_archive_is_rewritten_in_place(codec, tmp_path) -> None:
+    path = tmp_path / "archive.jsonl"
+    path.write_bytes(b"".join(ARCHIVE))
+    cp = ArchiveMigrator(codec, path, batch_size=2).run()
+    assert (cp.rows, cp.upgraded, cp.failed) == (6, 2, 2)
+    assert path.read_bytes() == _expected(codec)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+class _StopAfterBatches(ArchiveMigrator):
+    def __init__(self, *args, batches: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.batches = batches
+
+    def _save_checkpoint(self, cp) -> None:  # noqa: ANN001
+        super()._save_checkpoint(cp)
+        self.batches -= 1
+        if self.batches == 0:
+            self._stop.set()
+
+
+def test_interrupted_run_resumes_from_checkpoint(codec, tmp_path) -> None:
+    path = tmp_path / "archive.jsonl"
+    path.write_bytes(b"".join(ARCHIVE))
+    first = _StopAfterBatches(codec, path, batch_size=2, batches=2).run()
+    assert (first.rows, first.upgraded, first.failed) == (4, 1, 2)
+    # Nothing replaced yet; progress is on disk
+    assert path.read_bytes() == b"".join(ARCHIVE)
+    assert json.loads((tmp_path / "archive.jsonl.checkpoint").read_text())["rows"] == 4
+
+    resumed = ArchiveMigrator(codec, path, batch_size=2).run()
+    assert (resumed.rows, resumed.upgraded, resumed.failed) == (6, 2, 2)
+    assert path.read_bytes() == _expected(codec)
+    assert not (tmp_path / "archive.jsonl.checkpoint").exists()
+
+
+def test_background_failure_is_raised_from_join(codec, tmp_path) -> None:
+    path = tmp_path / "archive.jsonl"
+    path.write_bytes(OLD_LINE)
+
+    def broken(data, check_keys=True):  # noqa: ANN001, ANN202, ARG001
+        raise RuntimeError("codec exploded")
+
+    codec.decode = broken
+    migrator = ArchiveMigrator(codec, path)
+    migrator.start()
+    with pytest.raises(RuntimeError, match="codec exploded"):
+        migrator.join(5)
+    assert path.read_bytes() == OLD_LINE
+
+
+def test_background_run_returns_its_checkpoint(codec, tmp_path) -> None:
+    path = tmp_path / "archive.jsonl"
+    path.write_bytes(b"".join(ARCHIVE))
+    migrator = ArchiveMigrator(codec, path)
+    migrator.start()
+    assert migrator.join(5).upgraded == 2
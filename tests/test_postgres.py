@@ -0,0 +1,318 @@
+"""
+Schema behaviour that only Postgres enforces: the deferred composite
+foreign keys between ConnectivityEdges and GNodes, and the online
+migrations. Skipped unless GNR_TEST_PG_URL names a server, e.g.
+
+    GNR_TEST_PG_URL=postgresql+psycopg://postgres@localhost:5432/postgres
+
+Each test module run works in a scratch database it creates and drops.
+"""
+
+import os
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from gnr.db.batcher import WriteBatcher
+from gnr.db.models import ConnectivityEdgeSql, GNodeSql
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+
+PG_URL = os.environ.get("GNR_TEST_PG_URL")
+ROOT = Path(__file__).resolve().parents[1]
+
+pytestmark = pytest.mark.skipif(not PG_URL, reason="GNR_TEST_PG_URL is not set")
+
+# Native enum types, as the models first declared them
+INITIAL_SCHEMA = "3f1c9a2e7b10"
+# Last revision with varchar ids
+BEFORE_UUID_IDS = "2c6a9e1f4b87"
+# Last revision before edge aliases were enforced
+BEFORE_EDGE_KEYS = "8b2d4e6f0a31"
+
+
+@pytest.fixture(scope="module")
+def pg_url() -> Iterator[str]:
+    server = create_engine(PG_URL, isolation_level="AUTOCOMMIT")
+    name = f"gnr_test_{uuid.uuid4().hex[:8]}"
+    with server.connect() as conn:
+        conn.execute(text(f"CREATE DATABASE {name} TEMPLATE template0 ENCODING 'UTF8'"))
+    try:
+        yield make_url(PG_URL).set(database=name).render_as_string(hide_password=False)
+    finally:
+        with server.connect() as conn:
+            conn.execute(text(f"DROP DATABASE {name} WITH (FORCE)"))
+        server.dispose()
+
+
+@pytest.fixture(scope="module")
+def alembic_config(pg_url: str) -> Iterator[Config]:
+    # alembic/env.py reads the URL from Settings
+    os.environ["GNR_DB_URL"], saved = pg_url, os.environ.get("GNR_DB_URL")
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    config.set_main_option("version_locations", str(ROOT / "alembic" / "versions"))
+    try:
+        yield config
+    finally:
+        if saved is None:
+            del os.environ["GNR_DB_URL"]
+        else:
+            os.environ["GNR_DB_URL"] = saved
+
+
+@pytest.fixture(scope="module")
+def engine(pg_url: str, alembic_config: Config) -> Iterator[Engine]:
+    command.upgrade(alembic_config, "head")
+    engine = create_engine(pg_url)
+    yield engine
+    engine.dispose()
+
+
+def _g_node(alias: str, g_node_class: str = "Scada") -> GNodeSql:
+    return GNodeSql(
+        id=str(uuid.uuid4()),
+        alias=alias,
+        base_class=BaseGNodeClass.Logical,
+        g_node_class=g_node_class,
+        status=GNodeStatus.Active,
+    )
+
+
+def _edge(parent: GNodeSql, child: GNodeSql, **aliases: str) -> ConnectivityEdgeSql:
+    return ConnectivityEdgeSql(
+        id=str(uuid.uuid4()),
+        from_g_node_id=parent.id,
+        to_g_node_id=child.id,
+        from_g_node_alias=aliases.get("from_alias", parent.alias),
+        to_g_node_alias=aliases.get("to_alias", child.alias),
+        status=GNodeStatus.Active,
+    )
+
+
+def test_mismatched_edge_alias_fails_at_commit(engine: Engine) -> None:
+    factory = sessionmaker(engine)
+    with factory() as session:
+        parent, child = _g_node("m1.parent"), _g_node("m1.parent.child")
+        # Edge first: the keys are checked at commit, not per statement
+        session.add(_edge(parent, child))
+        session.flush()
+        session.add_all([parent, child])
+        session.commit()
+
+        session.add(_edge(child, parent, to_alias="m1.wrong"))
+        session.flush()
+        with pytest.raises(IntegrityError):
+            session.commit()
+
+
+def test_rename_cascades_to_edges(engine: Engine) -> None:
+    factory = sessionmaker(engine)
+    with factory() as session:
+        parent = _g_node("r1.parent", g_node_class="AtnCloud")
+        child = _g_node("r1.parent.child")
+        session.add_all([parent, child])
+        session.flush()
+        edge = _edge(parent, child)
+        session.add(edge)
+        session.commit()
+
+        parent.prev_alias, parent.alias = parent.alias, "r1.renamed"
+        session.commit()
+        session.expire_all()
+        edge = session.get(ConnectivityEdgeSql, edge.id)
+        assert edge.from_g_node_alias == "r1.renamed"
+        assert session.get(GNodeSql, parent.id).g_node_class == "AtnCloud"
+
+
+def test_batch_retries_rows_when_a_deferred_key_fails(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    factory = sessionmaker(engine, expire_on_commit=False)
+    parent, child = _g_node("b1.parent"), _g_node("b1.parent.child")
+    with factory() as session:
+        session.add_all([parent, child])
+        session.commit()
+    # Let a stale alias through to the database, as a concurrent rename would
+    monkeypatch.setattr(WriteBatcher, "_check", staticmethod(lambda *args: None))
+    batcher = WriteBatcher(factory, max_latency_ms=100)
+    batcher.start()
+    try:
+        good = _edge(parent, child).to_gt()
+        stale = _edge(child, parent, from_alias="b1.stale").to_gt()
+        futures = [batcher.submit(good), batcher.submit(stale)]
+        assert futures[0].result(5) is good
+        assert isinstance(futures[1].exception(5), IntegrityError)
+    finally:
+        batcher.stop()
+    with factory() as session:
+        assert session.get(ConnectivityEdgeSql, good.id) is not None
+        assert session.get(ConnectivityEdgeSql, stale.id) is None
+
+
+def test_uuid_migration_converts_ids_with_data(
+    alembic_config: Config, engine: Engine
+) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE position_points, g_nodes, connectivity_edges"))
+    command.downgrade(alembic_config, BEFORE_UUID_IDS)
+    point, parent, child, edge = (str(uuid.uuid4()) for _ in range(4))
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO position_points (id, latitude_micro_deg, longitude_micro_deg, "
+                "created_at) VALUES (:id, 1, 2, now())"
+            ),
+            {"id": point},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO g_nodes (id, alias, base_class, g_node_class, status, "
+                "position_point_id, created_at) "
+                "VALUES (:id, :alias, 0, 'TerminalAsset', 1, :point, now())"
+            ),
+            [
+                {"id": parent, "alias": "v1.parent", "point": point},
+                {"id": child, "alias": "v1.parent.child", "point": None},
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO connectivity_edges (id, from_g_node_id, to_g_node_id, "
+                "from_g_node_alias, to_g_node_alias, status, created_at) "
+                "VALUES (:id, :parent, :child, 'v1.parent', 'v1.parent.child', 1, now())"
+            ),
+            {"id": edge, "parent": parent, "child": child},
+        )
+
+    command.upgrade(alembic_config, BEFORE_EDGE_KEYS)
+    with engine.connect() as conn:
+        types = dict(conn.execute(text(
+            "SELECT table_name || '.' || column_name, data_type "
+            "FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND column_name LIKE '%id%'"
+        )).all())
+        assert types == {
+            "position_points.id": "uuid",
+            "g_nodes.id": "uuid",
+            "g_nodes.position_point_id": "uuid",
+            "connectivity_edges.id": "uuid",
+            "connectivity_edges.from_g_node_id": "uuid",
+            "connectivity_edges.to_g_node_id": "uuid",
+        }
+        assert conn.execute(text(
+            "SELECT g.position_point_id::text, e.id::text "
+            "FROM connectivity_edges e JOIN g_nodes g ON g.id = e.from_g_node_id"
+        )).one() == (point, edge)
+        assert conn.execute(text(
+            "SELECT is_nullable FROM information_schema.columns "
+            "WHERE table_name = 'connectivity_edges' AND column_name = 'to_g_node_id'"
+        )).scalar() == "NO"
+        # Keys and indexes were swapped in under their old names, all valid
+        constraints = dict(conn.execute(text(
+            "SELECT conname, convalidated FROM pg_constraint "
+            "WHERE conrelid::regclass::text IN "
+            "('position_points', 'g_nodes', 'connectivity_edges') AND contype <> 'c'"
+        )).all())
+        assert constraints == dict.fromkeys([
+            "position_points_pkey", "g_nodes_pkey", "connectivity_edges_pkey",
+            "uq_connectivity_edges_from_to", "g_nodes_position_point_id_fkey",
+            "connectivity_edges_from_g_node_id_fkey",
+            "connectivity_edges_to_g_node_id_fkey",
+        ], True)
+        indexes = set(conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'connectivity_edges'"
+        )).scalars())
+        assert {"ix_connectivity_edges_from_g_node_id", "ix_connectivity_edges_to_g_node_id"} <= indexes
+        assert not conn.execute(text(
+            "SELECT count(*) FROM pg_index WHERE NOT indisvalid"
+        )).scalar()
+        # Shadow columns, check constraints and sync triggers are gone
+        assert not conn.execute(text(
+            "SELECT count(*) FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND column_name LIKE '%\\_uuid'"
+        )).scalar()
+        assert not conn.execute(text(
+            "SELECT count(*) FROM pg_constraint WHERE conname LIKE '%\\_uuid\\_nn'"
+        )).scalar()
+        assert not conn.execute(text(
+            "SELECT count(*) FROM pg_trigger WHERE tgname LIKE 'gnr\\_%\\_uuid\\_sync'"
+        )).scalar()
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(
+            text("UPDATE g_nodes SET position_point_id = :id WHERE alias = 'v1.parent'"),
+            {"id": str(uuid.uuid4())},
+        )
+
+    # And back: text ids, same values
+    command.downgrade(alembic_config, BEFORE_UUID_IDS)
+    with engine.connect() as conn:
+        assert conn.execute(
+            text("SELECT position_point_id FROM g_nodes WHERE alias = 'v1.parent'")
+        ).scalar() == point
+    command.upgrade(alembic_config, "head")
+
+
+def test_migrations_round_trip_with_data(
+    pg_url: str, alembic_config: Config, engine: Engine
+) -> None:
+    with sessionmaker(engine)() as session:
+        session.add(_g_node("u1.cloud", g_node_class="AtnCloud"))
+        session.commit()
+    # Back to the native enum types, and forward to symbols again
+    command.downgrade(alembic_config, INITIAL_SCHEMA)
+    with engine.connect() as conn:
+        row = conn.execute(
+            text(
+                "SELECT base_class::text, g_node_class, status::text FROM g_nodes "
+                "WHERE alias = 'u1.cloud'"
+            )
+        ).one()
+        assert tuple(row) == ("Logical", "AtnCloud", "Active")
+    command.upgrade(alembic_config, "head")
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT base_class, g_node_class, status FROM g_nodes WHERE alias = 'u1.cloud'")
+        ).one()
+        assert tuple(row) == (4, "AtnCloud", 1)
+
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE g_nodes, connectivity_edges"))
+    command.downgrade(alembic_config, "base")
+    command.upgrade(alembic_config, BEFORE_EDGE_KEYS)
+    parent, child = str(uuid.uuid4()), str(uuid.uuid4())
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO g_nodes (id, alias, base_class, g_node_class, status, created_at) "
+                "VALUES (:id, :alias, 4, 'Scada', 1, now())"
+            ),
+            [{"id": parent, "alias": "u1.parent"}, {"id": child, "alias": "u1.parent.child"}],
+        )
+        # An edge whose alias went stale before the database enforced it
+        conn.execute(
+            text(
+                "INSERT INTO connectivity_edges (id, from_g_node_id, to_g_node_id, "
+                "from_g_node_alias, to_g_node_alias, status, created_at) "
+                "VALUES (:id, :parent, :child, 'u1.old', 'u1.parent.child', 1, now())"
+            ),
+            {"id": str(uuid.uuid4()), "parent": parent, "child": child},
+        )
+
+    command.upgrade(alembic_config, "head")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT from_g_node_alias FROM connectivity_edges")).scalar() == (
+            "u1.parent"
+        )
+
+    command.downgrade(alembic_config, BEFORE_EDGE_KEYS)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT DISTINCT base_class FROM g_nodes")).scalar() == 4
+    command.upgrade(alembic_config, "head")
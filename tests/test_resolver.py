@@ -0,0 +1,72 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from gnr.db.models import Base, GNodeSql
+from gnr.db.resolver import AliasResolver
+from gnr.sema.enums import BaseGNodeClass, GNodeStatus
+
+
+@pytest.fixture
+def factory(tmp_path) -> sessionmaker[Session]:
+    engine = create_engine(f"sqlite:///{tmp_path}/gnr.db")
+    Base.metadata.create_all(engine)
+    return sessionmaker(engine, expire_on_commit=False)
+
+
+def _add_g_node(factory: sessionmaker[Session], alias: str) -> GNodeSql:
+    row = GNodeSql(
+        id=str(uuid.uuid4()),
+        alias=alias,
+        base_class=BaseGNodeClass.Logical,
+        g_node_class="AtnCloud",
+        status=GNodeStatus.Active,
+        display_name="Cloud",
+    )
+    with factory() as session:
+        session.add(row)
+        session.commit()
+    return row
+
+
+def test_cached_g_node_needs_no_query(factory) -> None:
+    row = _add_g_node(factory, "d1.cloud")
+    resolver = AliasResolver(factory)
+    assert resolver.by_alias("d1.cloud").to_gt() == row.to_gt()
+
+    statements = []
+    event.listen(factory.kw["bind"], "before_cursor_execute", lambda *a: statements.append(a))
+    assert resolver.by_alias("d1.cloud").to_gt() == row.to_gt()
+    assert statements == []
+
+
+def test_load_racing_invalidation_is_not_cached(factory) -> None:
+    row = _add_g_node(factory, "d1.cloud")
+    resolver = AliasResolver(factory)
+
+    # The writer commits (and invalidates) after this lookup read the row
+    def invalidate_mid_load(state) -> None:  # noqa: ANN001, ARG001
+        resolver.invalidate(row.id, [row.alias])
+
+    event.listen(factory, "do_orm_execute", invalidate_mid_load)
+    assert resolver.by_alias("d1.cloud") is not None
+    event.remove(factory, "do_orm_execute", invalidate_mid_load)
+
+    assert resolver._get(("alias", "d1.cloud")) is None
+    assert resolver._get(("id", row.id)) is None
+    resolver.by_alias("d1.cloud")
+    assert resolver._get(("alias", "d1.cloud")) is not None
+
+
+def test_watched_change_invalidates(factory) -> None:
+    row = _add_g_node(factory, "d1.cloud")
+    resolver = AliasResolver(factory)
+    resolver.watch(factory)
+    resolver.by_alias("d1.cloud")
+
+    with factory() as session:
+        session.get(GNodeSql, row.id).display_name = "Renamed cloud"
+        session.commit()
+    assert resolver.by_alias("d1.cloud").display_name == "Renamed cloud"
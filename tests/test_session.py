@@ -0,0 +1,37 @@
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from gnr.db.models import PositionPointSql
+
+
+def _point(point_id: str) -> PositionPointSql:
+    return PositionPointSql(id=point_id, latitude_micro_deg=1, longitude_micro_deg=2)
+
+
+def test_failed_commit_raises_the_database_error(db_factory, tracing) -> None:
+    point_id = str(uuid.uuid4())
+    with db_factory() as session:
+        session.add(_point(point_id))
+        session.commit()
+        session.add(_point(point_id))
+        with pytest.raises(IntegrityError):
+            session.commit()
+        session.rollback()
+        # The session stays usable after the failure
+        session.add(_point(str(uuid.uuid4())))
+        session.commit()
+
+    if tracing is not None:
+        failed = [s for s in tracing.spans if s.error]
+        assert [s.name for s in failed] == ["db.flush", "db.commit"]
+        assert all(s.error == "rolled back" for s in failed)
+
+
+def test_savepoints_open_no_commit_span(db_factory, exporter) -> None:
+    with db_factory() as session:
+        with session.begin_nested():
+            session.add(_point(str(uuid.uuid4())))
+        session.commit()
+    assert [s.name for s in exporter.spans].count("db.commit") == 1
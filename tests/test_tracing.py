@@ -0,0 +1,129 @@
+import io
+import json
+import uuid
+
+import pytest
+
+from gnr.sema.types import GNodeGt
+from gnr.tracing import (
+    OtlpJsonExporter,
+    SummaryExporter,
+    configure_tracing,
+    span,
+    traced,
+)
+
+G_NODE = {
+    "GNodeId": str(uuid.uuid4()),
+    "Alias": "d1.isone.ver.keene",
+    "BaseClass": "Logical",
+    "GNodeClass": "Scada",
+    "Status": "Active",
+    "TypeName": "g.node.gt",
+    "Version": "004",
+}
+
+
+@pytest.fixture(autouse=True)
+def _tracing_off_afterwards():
+    yield
+    configure_tracing(False)
+
+
+def test_spans_nest_into_one_trace(exporter) -> None:
+    with span("outer", kind="test") as outer:
+        with span("inner") as inner:
+            pass
+    assert len(exporter.traces) == 1
+    # Children finish first and are exported with their root
+    assert exporter.traces[0] == [inner, outer]
+    assert inner.trace_id == outer.trace_id
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id is None
+    assert outer.attributes == {"kind": "test"}
+
+
+def test_axiom_checks_nest_under_from_dict(exporter) -> None:
+    GNodeGt.from_dict(G_NODE)
+    (trace,) = exporter.traces
+    root = trace[-1]
+    assert root.name == "sema.from_dict"
+    assert root.attributes == {"type": "GNodeGt"}
+    axioms = [s for s in trace if s.name.startswith("GNodeGt.check_axiom_")]
+    assert axioms
+    assert all(s.parent_id == root.span_id for s in axioms)
+
+
+def test_exception_marks_span_as_error(exporter) -> None:
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError("boom")
+    assert exporter.spans[0].error == "ValueError: boom"
+
+
+def test_sampled_out_traces_export_nothing(exporter) -> None:
+    configure_tracing(True, exporter, sample_rate=0.0)
+    with span("root"):
+        with span("child"):
+            GNodeGt.from_dict(G_NODE)
+    assert exporter.traces == []
+
+
+def test_tracing_off_records_nothing(exporter) -> None:
+    configure_tracing(False)
+
+    @traced
+    def work() -> int:
+        return 7
+
+    with span("root"):
+        assert work() == 7
+    assert exporter.traces == []
+
+
+def test_otlp_json_exporter_writes_one_line_per_trace() -> None:
+    stream = io.StringIO()
+    configure_tracing(True, OtlpJsonExporter(stream, service_name="gnr-test"))
+    with span("outer", rows=3, ratio=0.5, ok=True, who="me"):
+        with pytest.raises(KeyError), span("inner"):
+            raise KeyError("x")
+    with span("second"):
+        pass
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    request = json.loads(lines[0])
+    (resource,) = request["resourceSpans"]
+    assert resource["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "gnr-test"}}
+    ]
+    inner, outer = resource["scopeSpans"][0]["spans"]
+    assert inner["parentSpanId"] == outer["spanId"]
+    assert inner["traceId"] == outer["traceId"]
+    assert inner["status"] == {"code": 2, "message": "KeyError: 'x'"}
+    assert outer["status"] == {"code": 1}
+    assert "parentSpanId" not in outer
+    assert outer["attributes"] == [
+        {"key": "rows", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "ok", "value": {"boolValue": True}},
+        {"key": "who", "value": {"stringValue": "me"}},
+    ]
+    assert int(outer["endTimeUnixNano"]) >= int(outer["startTimeUnixNano"])
+
+
+def test_summary_exporter_counts_and_forwards(exporter) -> None:
+    summary = SummaryExporter(forward=exporter)
+    configure_tracing(True, summary)
+    for _ in range(3):
+        with span("outer"), span("inner"):
+            pass
+    assert {name: len(ds) for name, ds in summary.durations.items()} == {
+        "outer": 3,
+        "inner": 3,
+    }
+    assert len(exporter.traces) == 3
+    header, *rows = summary.report().splitlines()
+    assert header.split()[:2] == ["span", "count"]
+    # Sorted by total time: the outer span contains the inner one
+    assert [row.split()[0] for row in rows] == ["outer", "inner"]